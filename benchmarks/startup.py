@@ -0,0 +1,86 @@
+"""
+Startup-time benchmark based on `python -X importtime`.
+
+Run: python -m benchmarks.startup --budget_ms 250
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must never be imported just to start the CLI.
+HEAVY_MODULES = ("pandas", "numpy", "plotly", "yfinance", "matplotlib", "flask")
+
+STARTUP_BUDGET_MS = 250.0
+
+
+def measure_imports(module: str = "main", python: str = sys.executable) -> Dict:
+    """
+    Import `module` in a fresh interpreter and parse the -X importtime trace.
+    Returns {"total_us": cumulative time of `module`, "modules": {name: cumulative_us}}.
+    """
+    proc = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed: {proc.stderr[-500:]}")
+
+    modules = {}
+    for line in proc.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        try:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            modules[name.strip()] = int(cumulative)
+        except ValueError:
+            continue
+
+    return {"total_us": modules.get(module, 0), "modules": modules}
+
+
+def heavy_imports(result: Dict):
+    return sorted(
+        m for m in result["modules"]
+        if m.split(".")[0] in HEAVY_MODULES
+    )
+
+
+def best_of(module: str = "main", repeat: int = 3) -> Dict:
+    # First run warms the bytecode cache; keep the fastest of the rest.
+    runs = [measure_imports(module) for _ in range(repeat)]
+    return min(runs, key=lambda r: r["total_us"])
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--module", default="main")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--budget_ms", type=float, default=STARTUP_BUDGET_MS)
+    ap.add_argument("--top", type=int, default=10)
+    args = ap.parse_args()
+
+    res = best_of(args.module, args.repeat)
+    total_ms = res["total_us"] / 1000.0
+
+    print(f"import {args.module}: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    slowest = sorted(res["modules"].items(), key=lambda kv: -kv[1])
+    for name, us in slowest[: args.top]:
+        print(f"  {us / 1000.0:>8.1f} ms  {name}")
+
+    heavy = heavy_imports(res)
+    if heavy:
+        print(f"heavy modules imported at startup: {', '.join(heavy)}")
+
+    if heavy or total_ms > args.budget_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
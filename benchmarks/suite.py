@@ -0,0 +1,230 @@
+"""
+Benchmark suite: ingestion, strategies, engine, universe loop and reporting
+on deterministic synthetic data.
+
+Run:  python -m benchmarks.suite --size small
+      python -m benchmarks.suite --size small --update_baseline
+Exits non-zero when a case is slower than its baseline by more than --threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List
+
+from core.engine import Engine
+from core.panel import evaluate, load_panel
+from core.scanner import ScanConfig, scan_universe, symbol_of
+from core.types import RunMode
+from data.cache import cache_path
+from data.ingestion import load_csv
+from strategies import available, create_strategy
+from benchmarks.synthetic import SIZES, generate_universe, write_csv
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+DEFAULT_THRESHOLD = 0.25  # 25% slower than baseline is a regression
+
+
+def _write_dataset(size: str, seed: int, cache_dir: str) -> List[str]:
+    n_symbols, days = SIZES[size]
+    tickers = []
+    for bars in generate_universe(n_symbols, days, seed):
+        ticker = f"{bars[0].symbol}.NS"
+        write_csv(bars, cache_path(cache_dir, ticker, "5m"))
+        tickers.append(ticker)
+    return tickers
+
+
+def _run_once(tickers: List[str], cache_dir: str) -> Dict:
+    timings: Dict[str, float] = {}
+    bars_seen: Dict[str, int] = {}
+    all_trades = []
+    curve = []
+
+    def add(case, t0, n):
+        timings[case] = timings.get(case, 0.0) + (time.perf_counter() - t0)
+        bars_seen[case] = bars_seen.get(case, 0) + n
+
+    # Per-symbol cases; bars are dropped after each symbol so memory stays
+    # flat even for the "full" size.
+    for ticker in tickers:
+        sym = symbol_of(ticker)
+        path = cache_path(cache_dir, ticker, "5m")
+
+        t0 = time.perf_counter()
+        bars = load_csv(path, sym)
+        add("load_csv", t0, len(bars))
+
+        for name in available():
+            strat = create_strategy(name, sym)
+            on_bar = strat.on_bar
+            t0 = time.perf_counter()
+            for b in bars:
+                on_bar(b)
+            add(f"on_bar.{name}", t0, len(bars))
+
+            for mode in (RunMode.SIGNAL, RunMode.BACKTEST):
+                eng = Engine(create_strategy(name, sym), mode)
+                t0 = time.perf_counter()
+                eng.run(bars)
+                add(f"engine.{mode.value.lower()}.{name}", t0, len(bars))
+
+                if mode == RunMode.BACKTEST:
+                    all_trades.extend(eng.trades)
+                    if not curve:
+                        curve = eng.equity_curve
+
+    cfg = ScanConfig(cache_dir=cache_dir, strategies=tuple(available()), fetch_missing=False)
+    t0 = time.perf_counter()
+    n = 0
+    for scan in scan_universe(tickers, RunMode.SIGNAL, cfg):
+        n += sum(r["num_signals"] for r in scan.results.values())
+    add("universe_loop", t0, bars_seen["load_csv"])
+
+    t0 = time.perf_counter()
+    panel = load_panel(tickers, cache_dir)
+    add("panel.load", t0, bars_seen["load_csv"])
+    t0 = time.perf_counter()
+    evaluate(panel, available(), latest_only=True)
+    add("panel.latest", t0, panel.shape[1])
+    t0 = time.perf_counter()
+    evaluate(panel, available())
+    add("panel.all_rows", t0, bars_seen["load_csv"])
+
+    try:
+        from reporting.performance import generate_html_report
+    except ImportError:
+        generate_html_report = None
+
+    if generate_html_report is not None:
+        stats = {"final_equity": 0.0, "realized_pnl": 0.0, "num_trades": len(all_trades), "win_rate": 0.0}
+        with tempfile.TemporaryDirectory() as tmp:
+            t0 = time.perf_counter()
+            generate_html_report(stats, curve, all_trades, os.path.join(tmp, "report.html"))
+            add("generate_html_report", t0, len(curve))
+
+    return {"timings": timings, "bars": bars_seen}
+
+
+def run_suite(size: str = "small", repeat: int = 3, seed: int = 0) -> Dict:
+    if size not in SIZES:
+        raise ValueError(f"Unknown size: {size} (choose from {', '.join(SIZES)})")
+
+    best: Dict[str, float] = {}
+    bars: Dict[str, int] = {}
+    with tempfile.TemporaryDirectory() as cache_dir:
+        tickers = _write_dataset(size, seed, cache_dir)
+        for _ in range(repeat):
+            run = _run_once(tickers, cache_dir)
+            bars = run["bars"]
+            for case, secs in run["timings"].items():
+                best[case] = min(best.get(case, float("inf")), secs)
+
+    n_symbols, days = SIZES[size]
+    return {
+        "meta": {
+            "size": size,
+            "symbols": n_symbols,
+            "days": days,
+            "seed": seed,
+            "repeat": repeat,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "created": datetime.now().isoformat(timespec="seconds"),
+        },
+        "results": {
+            case: {
+                "seconds": secs,
+                "bars": bars.get(case, 0),
+                "bars_per_sec": bars.get(case, 0) / secs if secs > 0 else 0.0,
+            }
+            for case, secs in sorted(best.items())
+        },
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float = DEFAULT_THRESHOLD) -> List[Dict]:
+    """Cases whose time grew by more than `threshold` (fractional) over the baseline."""
+    if current["meta"]["size"] != baseline["meta"]["size"]:
+        raise ValueError(
+            f"size mismatch: current={current['meta']['size']} baseline={baseline['meta']['size']}"
+        )
+
+    regressions = []
+    for case, cur in current["results"].items():
+        base = baseline["results"].get(case)
+        if not base or base["seconds"] <= 0:
+            continue
+        ratio = cur["seconds"] / base["seconds"]
+        if ratio > 1.0 + threshold:
+            regressions.append({
+                "case": case,
+                "baseline": base["seconds"],
+                "current": cur["seconds"],
+                "ratio": ratio,
+            })
+    return regressions
+
+
+def baseline_path(size: str) -> str:
+    return os.path.join(BENCH_DIR, f"baseline_{size}.json")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--size", choices=list(SIZES), default="small")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", type=str, default=None, help="results JSON (default benchmarks/results/)")
+    ap.add_argument("--baseline", type=str, default=None, help="baseline JSON (default benchmarks/baseline_<size>.json)")
+    ap.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    ap.add_argument("--update_baseline", action="store_true")
+    args = ap.parse_args()
+
+    res = run_suite(args.size, args.repeat, args.seed)
+
+    print(f"{'CASE':<28} {'SECONDS':>10} {'BARS/S':>12}")
+    for case, r in res["results"].items():
+        print(f"{case:<28} {r['seconds']:>10.4f} {r['bars_per_sec']:>12.0f}")
+
+    out = args.out
+    if out is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        ts = datetime.now().strftime("%Y-%m-%d_%H%M%S")
+        out = os.path.join(RESULTS_DIR, f"bench_{args.size}_{ts}.json")
+    with open(out, "w") as f:
+        json.dump(res, f, indent=2)
+    print(f"\nSaved results: {out}")
+
+    base_path = args.baseline or baseline_path(args.size)
+    if args.update_baseline:
+        with open(base_path, "w") as f:
+            json.dump(res, f, indent=2)
+        print(f"Updated baseline: {base_path}")
+        return
+
+    if not os.path.exists(base_path):
+        print(f"No baseline at {base_path}; run with --update_baseline to create one.")
+        return
+
+    with open(base_path) as f:
+        baseline = json.load(f)
+
+    regressions = compare(res, baseline, args.threshold)
+    if not regressions:
+        print(f"No regressions vs {base_path} (threshold {args.threshold*100:.0f}%)")
+        return
+
+    print(f"REGRESSIONS vs {base_path} (threshold {args.threshold*100:.0f}%):")
+    for r in regressions:
+        print(f"  {r['case']:<28} {r['baseline']:.4f}s -> {r['current']:.4f}s  (x{r['ratio']:.2f})")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
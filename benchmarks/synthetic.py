@@ -0,0 +1,112 @@
+"""
+Deterministic synthetic 5m bars on the NSE session grid.
+"""
+import csv
+import heapq
+import random
+import zlib
+from datetime import date, datetime, timedelta
+from typing import Iterator, List, Tuple
+
+from core.types import MarketBar
+from data.calendar_nse import MARKET_CLOSE, MARKET_OPEN, is_trading_day
+
+# name -> (symbols, trading days)
+SIZES = {
+    "tiny": (1, 1),
+    "small": (10, 5),
+    "medium": (50, 20),
+    "large": (200, 60),
+    "full": (500, 250),
+}
+
+START_DATE = date(2026, 1, 5)
+
+
+def session_days(n: int, start: date = START_DATE) -> List[date]:
+    out = []
+    d = start
+    while len(out) < n:
+        if is_trading_day(d):
+            out.append(d)
+        d += timedelta(days=1)
+    return out
+
+
+def session_times(day: date, interval_minutes: int = 5) -> List[datetime]:
+    t = datetime.combine(day, MARKET_OPEN)
+    end = datetime.combine(day, MARKET_CLOSE)
+    step = timedelta(minutes=interval_minutes)
+    out = []
+    while t < end:
+        out.append(t)
+        t += step
+    return out
+
+
+def symbol_name(i: int) -> str:
+    return f"SYN{i:03d}"
+
+
+def generate_bars(symbol: str, days: int, seed: int = 0, interval_minutes: int = 5,
+                  start: date = START_DATE) -> List[MarketBar]:
+    """Random-walk OHLCV; same (symbol, days, seed) always gives the same bars."""
+    rng = random.Random(zlib.crc32(symbol.encode()) ^ seed)
+    px = rng.uniform(100.0, 3000.0)
+    base_vol = rng.uniform(2e4, 5e5)
+
+    bars = []
+    for day in session_days(days, start):
+        times = session_times(day, interval_minutes)
+        n = len(times)
+        for i, ts in enumerate(times):
+            o = px
+            c = max(o * (1.0 + rng.gauss(0.0, 0.002)), 0.01)
+            h = max(o, c) * (1.0 + abs(rng.gauss(0.0, 0.001)))
+            l = min(o, c) * (1.0 - abs(rng.gauss(0.0, 0.001)))
+            # U-shaped intraday volume: heavy at open and close.
+            shape = 1.0 + 2.0 * (abs(i - n / 2) / (n / 2)) ** 2
+            v = float(int(base_vol * shape * rng.uniform(0.5, 1.5)))
+            bars.append(MarketBar(symbol, ts, o, h, l, c, v))
+            px = c
+    return bars
+
+
+def generate_universe(n_symbols: int, days: int, seed: int = 0) -> Iterator[List[MarketBar]]:
+    for i in range(n_symbols):
+        yield generate_bars(symbol_name(i), days, seed)
+
+
+def bar_ticks(bar: MarketBar, per_bar: int = 20, rng: random.Random = None,
+              interval_minutes: int = 5) -> List[Tuple[str, datetime, float, float]]:
+    """Trades that aggregate back to exactly `bar`: open first, close last, high and low in between."""
+    rng = rng or random.Random(0)
+    n = max(per_bar, 4)
+    mids = [rng.uniform(bar.low, bar.high) for _ in range(n - 4)]
+    extremes = [bar.high, bar.low]
+    rng.shuffle(extremes)
+    prices = [bar.open] + extremes + mids + [bar.close]
+    q = bar.volume // n
+    sizes = [q] * (n - 1) + [bar.volume - q * (n - 1)]
+    step = timedelta(seconds=interval_minutes * 60 / n)
+    return [(bar.symbol, bar.timestamp + i * step, p, v) for i, (p, v) in enumerate(zip(prices, sizes))]
+
+
+def generate_ticks(n_symbols: int, days: int, per_bar: int = 20,
+                   seed: int = 0) -> Iterator[Tuple[str, datetime, float, float]]:
+    """Time-ordered trade ticks for a synthetic universe (bars from generate_universe)."""
+    rng = random.Random(seed)
+    streams = [
+        [t for b in bars for t in bar_ticks(b, per_bar, rng)]
+        for bars in generate_universe(n_symbols, days, seed)
+    ]
+    return heapq.merge(*streams, key=lambda t: t[1])
+
+
+def write_csv(bars: List[MarketBar], path: str) -> str:
+    with open(path, "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["timestamp", "open", "high", "low", "close", "volume"])
+        for b in bars:
+            w.writerow([b.timestamp.isoformat(), b.open, b.high, b.low, b.close, b.volume])
+    return path
@@ -0,0 +1,92 @@
+"""
+Tick replay benchmark: recorded trades -> TickAggregator -> per-symbol engines.
+
+Run:  python -m benchmarks.ticks --symbols 50 --days 1 --per_bar 20
+      python -m benchmarks.ticks --record datasets/ticks_sample.csv   # save the synthetic feed
+      python -m benchmarks.ticks --file datasets/ticks_sample.csv     # replay a recorded file
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import Dict, List, Sequence, Tuple
+
+from core.engine import Engine
+from core.types import RunMode
+from data.ticks import TickAggregator, read_ticks, write_ticks
+from strategies import available, create_strategy
+from benchmarks.synthetic import generate_ticks
+
+
+def replay(ticks: List[Tuple], interval: str = "5m", strategies: Sequence[str] = (),
+           params: Dict = None) -> Dict:
+    """Feed `ticks` through an aggregator (and SIGNAL engines when `strategies` is set)."""
+    params = params or {}
+    engines: Dict[str, List[Engine]] = {}
+    signals = 0
+
+    def on_bar(bar):
+        nonlocal signals
+        engs = engines.get(bar.symbol)
+        if engs is None:
+            engs = engines[bar.symbol] = [
+                Engine(create_strategy(name, bar.symbol, **params), RunMode.SIGNAL)
+                for name in strategies
+            ]
+        for eng in engs:
+            if eng.step(bar):
+                signals += 1
+
+    agg = TickAggregator(interval, on_bar=on_bar if strategies else None)
+    on_tick = agg.on_tick
+    t0 = time.perf_counter()
+    for symbol, ts, price, size in ticks:
+        on_tick(symbol, ts, price, size)
+    agg.flush()
+    secs = time.perf_counter() - t0
+
+    return {
+        "ticks": agg.ticks,
+        "bars": agg.bars,
+        "signals": signals,
+        "seconds": secs,
+        "ticks_per_sec": agg.ticks / secs if secs > 0 else 0.0,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--file", type=str, default=None, help="recorded tick CSV to replay (default: synthetic)")
+    ap.add_argument("--record", type=str, default=None, help="write the synthetic ticks here")
+    ap.add_argument("--symbols", type=int, default=50)
+    ap.add_argument("--days", type=int, default=1)
+    ap.add_argument("--per_bar", type=int, default=20)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--interval", type=str, default="5m")
+    ap.add_argument("--strategy", type=str, choices=available() + ["all"], default="all")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.file
+        if path is None:
+            path = args.record or os.path.join(tmp, "ticks.csv")
+            write_ticks(generate_ticks(args.symbols, args.days, args.per_bar, args.seed), path)
+            print(f"Recorded ticks: {path}")
+
+        t0 = time.perf_counter()
+        ticks = list(read_ticks(path))
+        read_secs = time.perf_counter() - t0
+
+    strategies = available() if args.strategy == "all" else [args.strategy]
+    agg_only = replay(ticks, args.interval)
+    full = replay(ticks, args.interval, strategies)
+
+    print(f"{'CASE':<28} {'SECONDS':>10} {'TICKS/S':>12}")
+    print(f"{'read_ticks':<28} {read_secs:>10.4f} {len(ticks) / read_secs if read_secs else 0:>12.0f}")
+    print(f"{'aggregate':<28} {agg_only['seconds']:>10.4f} {agg_only['ticks_per_sec']:>12.0f}")
+    print(f"{'aggregate+engine':<28} {full['seconds']:>10.4f} {full['ticks_per_sec']:>12.0f}")
+    print(f"\nticks={full['ticks']} bars={full['bars']} signals={full['signals']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Engine/strategy checkpoints for incremental signal runs.
+
+A signal run saves, per (ticker, interval, strategy), the strategy's running
+state plus a fingerprint of the bars it depends on. The next run over a
+refreshed cache restores that state and only feeds the bars after the last
+processed one. A checkpoint is ignored (full replay) when:
+
+  - the format version, strategy name or params differ, or
+  - the last processed bar is no longer in the data, or
+  - any bar in the fingerprinted span (the last session plus the history
+    window) changed, e.g. a re-fetch corrected a bar.
+
+File layout (compact JSON):
+    {"version": 2, "key": <sha1 of strategy+params>, "last_ts": iso,
+     "span": n, "fp": <sha1 of the last n bars>, "state": Engine.get_state()}
+"""
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+from core.types import MarketBar
+
+CHECKPOINT_VERSION = 2
+
+
+def bars_to_rows(bars: List[MarketBar]) -> List[list]:
+    return [[b.timestamp.isoformat(), b.open, b.high, b.low, b.close, b.volume] for b in bars]
+
+
+def rows_to_bars(symbol: str, rows: List[list]) -> List[MarketBar]:
+    return [MarketBar(symbol, datetime.fromisoformat(r[0]), *r[1:]) for r in rows]
+
+
+def checkpoint_path(checkpoint_dir: str, ticker: str, interval: str, strategy: str) -> str:
+    # INFY.NS, 5m, mr -> <dir>/INFY.NS_5m_mr.ckpt.json
+    Path(checkpoint_dir).mkdir(parents=True, exist_ok=True)
+    return str(Path(checkpoint_dir) / f"{ticker}_{interval}_{strategy}.ckpt.json")
+
+
+def params_key(strategy) -> str:
+    blob = json.dumps(
+        {"version": CHECKPOINT_VERSION, "strategy": strategy.name, "params": strategy.params()},
+        sort_keys=True,
+    )
+    return hashlib.sha1(blob.encode()).hexdigest()
+
+
+def fingerprint(bars: List[MarketBar]) -> str:
+    h = hashlib.sha1()
+    for row in bars_to_rows(bars):
+        h.update(repr(row).encode())
+    return h.hexdigest()
+
+
+def _span(bars: List[MarketBar], history: int) -> int:
+    """Bars the saved state depends on: the last session and the history window."""
+    n = len(bars)
+    day = bars[-1].day
+    i = n - 1
+    while i > 0 and bars[i - 1].day == day:
+        i -= 1
+    return max(n - i, min(history, n))
+
+
+def save_checkpoint(path: str, engine, bars: List[MarketBar]):
+    """Persist `engine` after it has processed exactly `bars` (a prefix of the data is fine)."""
+    if not bars:
+        return
+    span = _span(bars, engine.strategy.history_needed())
+    doc = {
+        "version": CHECKPOINT_VERSION,
+        "key": params_key(engine.strategy),
+        "last_ts": bars[-1].timestamp.isoformat(),
+        "span": span,
+        "fp": fingerprint(bars[-span:]),
+        "state": engine.get_state(),
+    }
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(doc, f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def load_checkpoint(path: str, engine, bars: List[MarketBar]) -> int:
+    """
+    Restore `engine` from `path` if the checkpoint still matches `bars`.
+    Returns the index of the first bar still to process (0 means a full run;
+    the engine is left untouched in that case).
+    """
+    doc = _read(path)
+    if doc is None or doc.get("version") != CHECKPOINT_VERSION:
+        return 0
+    if doc.get("key") != params_key(engine.strategy):
+        return 0
+
+    idx = _find(bars, datetime.fromisoformat(doc["last_ts"]))
+    span = doc["span"]
+    if idx is None or idx + 1 < span:
+        return 0
+    if fingerprint(bars[idx + 1 - span: idx + 1]) != doc["fp"]:
+        return 0
+
+    engine.set_state(doc["state"])
+    return idx + 1
+
+
+def _read(path: str) -> Optional[dict]:
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _find(bars: List[MarketBar], ts: datetime) -> Optional[int]:
+    # New data is appended, so the last processed bar is near the end.
+    for i in range(len(bars) - 1, -1, -1):
+        t = bars[i].timestamp
+        if t == ts:
+            return i
+        if t < ts:
+            return None
+    return None
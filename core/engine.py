@@ -1,37 +1,132 @@
+import heapq
 from dataclasses import asdict
 from typing import List, Optional
-from core.types import RunMode, Side, Order, Signal, MarketBar
+from core.types import RunMode, Side, Order, Signal, MarketBar, rank_key
 from execution.sim import SimulatedExecution
 from portfolio.portfolio import Portfolio
 from risk.governor import RiskGovernor
-from data.calendar_nse import FORCE_SQUAREOFF
+from data.calendar_nse import FORCE_SQUAREOFF_SLOT
+from data.resample import BarAggregator
 
 
 class Engine:
-    def __init__(self, strategy, mode: RunMode, initial_capital: float = 100000.0):
+    def __init__(self, strategy, mode: RunMode, initial_capital: float = 100000.0, profiler=None,
+                 prefilter=None, drilldown=None, journal=None, gate=None, risk=None, target_exits=False,
+                 max_drafts=0, report_filter=None):
         self.strategy = strategy
         self.mode = mode
+        # (strategy, bar) -> bool, checked between strategy.update and
+        # strategy.evaluate (see core/filters.py). SIGNAL runs only: in a
+        # backtest every signal may open a trade.
+        self.prefilter = prefilter if mode == RunMode.SIGNAL else None
+        # signal -> bool (core.filters.compile_filter): the same filters for
+        # the other modes, applied to what is reported, ahead of the gate, so
+        # the gate sees the same signals as in a prefiltered SIGNAL run.
+        self.report_filter = report_filter
+        # core.gating.SignalGate: drops repeated signals before they are
+        # recorded; trading (BACKTEST) still acts on the raw signals.
+        self.gate = gate
 
         self.portfolio = Portfolio(initial_capital)
         self.exec = SimulatedExecution()
-        self.risk = RiskGovernor()
+        self.risk = risk if risk is not None else RiskGovernor()
 
-        self.active: Optional[dict] = None  # {symbol, side, qty, entry, stop}
+        self.active: Optional[dict] = None  # {symbol, side, qty, entry, stop, target}
+        # BACKTEST positions exit at the stop and the 15:20 square-off; with
+        # target_exits also at the signal's first target.
+        self.target_exits = target_exits
+        # execution.drilldown.DrillDown: decides bars that touch both stop and
+        # target from finer bars; without one the stop is assumed first.
+        self.drilldown = drilldown
+        # core.journal.Journal: durable order/fill/state log for PAPER/LIVE
+        # runs; core.journal.restore() rebuilds the engine from it.
+        self.journal = journal if mode != RunMode.SIGNAL else None
+        self._filled = False  # a fill happened in this step (commit it with the step)
         self.trades: List[dict] = []
-        self.signals: List[Signal] = []
+        # Signals as the strategy returned them (SignalDraft or Signal);
+        # `signals` materializes them. With max_drafts only the best that
+        # many under rank_key are kept (trimmed whenever the list doubles),
+        # so a top-K scan holds O(K) drafts per engine; num_drafts counts all.
+        self.drafts: List = []
+        self.max_drafts = max_drafts
+        self.num_drafts = 0
         self.equity_curve: List[dict] = []
 
-    def _enter(self, sig: Signal, ts):
-        if not self.risk.allow_entry_time(ts):
+        # Hot-path calls go through these references so a profiler can swap
+        # in timed wrappers without a per-call "is profiling on?" check.
+        self._on_bar = self._strategy_step
+        self._size_position = self.risk.size_position
+        self._execute = self.exec.execute
+        self._update_fill = self.portfolio.update_fill
+        self._record_equity = self._append_equity
+
+        # Multi-timeframe strategies get session-aligned higher-timeframe bars
+        # folded from the base bars, updated before each on_bar.
+        self._aggs = [BarAggregator(strategy.symbol, tf) for tf in strategy.timeframes]
+        for agg in self._aggs:
+            strategy.htf[agg.timeframe] = agg.bars
+
+        self.profiler = profiler
+        if profiler is not None:
+            self._instrument(profiler)
+
+    def _instrument(self, profiler):
+        strat = getattr(self.strategy, "name", "") or type(self.strategy).__name__
+        sym = self.strategy.symbol
+        self._on_bar = profiler.wrap("on_bar", self._on_bar, strat, sym)
+        self._size_position = profiler.wrap("size_position", self._size_position, strat, sym)
+        self._execute = profiler.wrap("execute", self._execute, strat, sym)
+        self._update_fill = profiler.wrap("update_fill", self._update_fill, strat, sym)
+        self._record_equity = profiler.wrap("equity_curve", self._record_equity, strat, sym)
+
+    @property
+    def signals(self) -> List[Signal]:
+        return [d.materialize() for d in self.drafts]
+
+    def _strategy_step(self, bar: MarketBar):
+        strat = self.strategy
+        strat.update(bar)
+        if self.prefilter is not None and not self.prefilter(strat, bar):
+            return None
+        return strat.evaluate()
+
+    def _append_equity(self, bar: MarketBar):
+        self.equity_curve.append({
+            "timestamp": bar.timestamp,
+            "equity": self.portfolio.equity()
+        })
+
+    def get_state(self) -> dict:
+        """Strategy and higher-timeframe state after a SIGNAL run (see core/checkpoint.py)."""
+        keep = self.strategy.history_needed()
+        state = {
+            "strategy": self.strategy.get_state(),
+            "htf": {agg.timeframe: agg.get_state(keep) for agg in self._aggs},
+        }
+        if self.gate is not None:
+            state["gate"] = self.gate.get_state()
+        return state
+
+    def set_state(self, state: dict):
+        self.strategy.set_state(state["strategy"])
+        for agg in self._aggs:
+            agg.set_state(state["htf"][agg.timeframe])
+        if self.gate is not None and state.get("gate"):
+            self.gate.set_state(state["gate"])
+
+    def _enter(self, sig: Signal, bar: MarketBar):
+        if not self.risk.allow_entry(bar):
             return
 
-        qty = self.risk.size_position(self.portfolio, sig)
+        qty = self._size_position(self.portfolio, sig)
         if qty <= 0:
             return
 
         o = Order(symbol=sig.symbol, side=sig.side, quantity=qty, price=sig.entry, tag="entry")
-        f = self.exec.execute(o)
-        self.portfolio.update_fill(f)
+        f = self._execute(o)
+        self._update_fill(f)
+        if self.journal is not None:
+            self._journal_fill(o, f)
 
         self.active = {
             "symbol": sig.symbol,
@@ -39,8 +134,11 @@ class Engine:
             "qty": qty,
             "entry": f.price,
             "stop": sig.stop,
+            "target": sig.targets[0] if self.target_exits and sig.targets else None,
             "reason": sig.reasoning,
         }
+        if self.journal is not None:
+            self.journal.append("active", self.active)
 
     def _exit(self, price: float, tag: str):
         if not self.active:
@@ -51,12 +149,15 @@ class Engine:
         sym = self.active["symbol"]
 
         o = Order(symbol=sym, side=side, quantity=qty, price=price, tag=tag)
-        f = self.exec.execute(o)
-        self.portfolio.update_fill(f)
+        f = self._execute(o)
+        self._update_fill(f)
+        if self.journal is not None:
+            self._journal_fill(o, f)
 
         self.trades.append(
             {
                 "symbol": sym,
+                "strategy": self.strategy.name,
                 "entry": self.active["entry"],
                 "exit": f.price,
                 "qty": qty,
@@ -68,38 +169,120 @@ class Engine:
             }
         )
         self.active = None
+        if self.journal is not None:
+            self.journal.append("trade", self.trades[-1])
+            self.journal.append("active", None)
+
+    def _journal_fill(self, order: Order, fill):
+        self.journal.append("order", order)
+        self.journal.append("fill", fill)
+        self._filled = True
+
+    def _journal_step(self, bar: MarketBar):
+        j = self.journal
+        if j.needs_compaction():
+            j.compact(self.snapshot(bar))
+        else:
+            j.append("state", {"ts": bar.timestamp, "engine": self.get_state()})
+            if self._filled:
+                j.commit()  # a fill is never left in the buffer
+            else:
+                j.maybe_commit()
+        self._filled = False
+
+    def snapshot(self, bar: Optional[MarketBar] = None) -> dict:
+        """Portfolio, open position, trades and strategy state (journal compaction)."""
+        return {
+            "ts": bar.timestamp if bar is not None else None,
+            "portfolio": self.portfolio.get_state(),
+            "active": self.active,
+            "trades": self.trades,
+            "engine": self.get_state() if bar is not None else None,
+        }
+
+    def step(self, bar: MarketBar) -> Optional[Signal]:
+        """Process one bar; streaming feeds (data/ticks.py) call this as bars close."""
+        # Update equity curve first
+        self._record_equity(bar)
+
+        if self._aggs:
+            for agg in self._aggs:
+                agg.update(bar)
+
+        sig = self._on_bar(bar)
+        report = sig
+        if report is not None and self.report_filter is not None and not self.report_filter(report):
+            report = None
+        if self.gate is not None:
+            report = self.gate(report, bar)
+        if report:
+            # Recorded in every mode so one backtest pass can also feed the watchlist.
+            self.drafts.append(report)
+            self.num_drafts += 1
+            if self.max_drafts and len(self.drafts) >= 2 * self.max_drafts:
+                self._trim_drafts()
+
+        if self.mode == RunMode.SIGNAL:
+            return report
+
+        # BACKTEST mode below
+        if self.portfolio.roll_day(bar.day) and self.journal is not None:
+            self.journal.append("day", bar.day)
+        entered = False
+        if sig and self.active is None:
+            self._enter(sig, bar)
+            entered = self.active is not None
+
+        # Stop/target check. An entry fills at the signal bar's close, so
+        # that bar's range mostly happened before the fill: only its stop is
+        # checked (as it always was), never its target, so the entry bar is
+        # never ambiguous and is treated the same with or without drill-down.
+        if self.active:
+            self._check_exits(bar, entered)
+
+        # EOD squareoff safety
+        if self.active and bar.slot >= FORCE_SQUAREOFF_SLOT:
+            self._exit(bar.close, "eod_squareoff")
+
+        if self.journal is not None:
+            self._journal_step(bar)
+        return report
+
+    def _check_exits(self, bar: MarketBar, entry_bar: bool):
+        a = self.active
+        stop = float(a["stop"])
+        target = a["target"]
+        if a["side"] == Side.BUY:
+            hit_stop = bar.low <= stop
+            hit_target = target is not None and bar.high >= target
+        else:
+            hit_stop = bar.high >= stop
+            hit_target = target is not None and bar.low <= target
+        if entry_bar:
+            hit_target = False
+
+        if hit_stop and hit_target:
+            tag = "stop"
+            if self.drilldown is not None:
+                tag = self.drilldown.resolve(bar, a["side"], stop, float(target))
+        elif hit_stop:
+            tag = "stop"
+        elif hit_target:
+            tag = "target"
+        else:
+            return
+        self._exit(stop if tag == "stop" else float(target), tag)
+
+    def _trim_drafts(self):
+        # nsmallest is stable, so ties keep arrival order as in WatchlistBuilder.
+        self.drafts = heapq.nsmallest(self.max_drafts, self.drafts, key=rank_key)
 
     def run(self, bars: List[MarketBar]):
+        step = self.step
         for bar in bars:
-            # Update equity curve first
-            self.equity_curve.append({
-                "timestamp": bar.timestamp,
-                "equity": self.portfolio.equity()
-            })
-
-            sig = self.strategy.on_bar(bar)
-
-            if self.mode == RunMode.SIGNAL:
-                if sig:
-                    self.signals.append(sig)
-                continue
-
-            # BACKTEST mode below
-            if sig and self.active is None:
-                self._enter(sig, bar.timestamp)
-
-            # Stop-loss check
-            if self.active:
-                stop = float(self.active["stop"])
-                if self.active["side"] == Side.BUY and bar.low <= stop:
-                    self._exit(stop, "stop")
-                elif self.active["side"] == Side.SELL and bar.high >= stop:
-                    self._exit(stop, "stop")
-
-            # EOD squareoff safety
-            if self.active and bar.timestamp.time() >= FORCE_SQUAREOFF:
-                self._exit(bar.close, "eod_squareoff")
-
+            step(bar)
+        if self.max_drafts and len(self.drafts) > self.max_drafts:
+            self._trim_drafts()
         return self.summary()
 
     def summary(self):
@@ -113,7 +296,8 @@ class Engine:
             "num_trades": len(self.trades),
             "win_rate": win_rate,
             "trades": self.trades,
-            "num_signals": len(self.signals),
+            "num_signals": self.num_drafts,
+            "num_suppressed": self.gate.suppressed if self.gate is not None else 0,
             "equity_curve": self.equity_curve,
         }
 
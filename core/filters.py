@@ -0,0 +1,93 @@
+"""
+Watchlist filters (--min_avg_volume, --min_avg_value, --min_atr,
+--time_start/--time_end), in two forms:
+
+compile_bar_filter: per-bar pre-checks a SIGNAL Engine runs before strategy
+evaluation, so bars that could never produce a reported signal skip
+evaluate() and build nothing.
+
+compile_filter: the same filters on a signal's meta and timestamp. BACKTEST
+engines, which must evaluate every bar to trade, apply it to what they
+report; the watchlist applies it to signals from elsewhere (panel mode).
+
+A bar passes when a signal on it would pass compile_filter: a signal's
+avg_volume/atr are the strategy's values on that bar, its avg_value is
+avg_volume * close and its timestamp is the bar's.
+"""
+from datetime import time
+from typing import Callable, Optional
+
+
+def compile_bar_filter(min_avg_volume: float = 0.0, min_avg_value: float = 0.0, min_atr: float = 0.0,
+                       time_start: Optional[time] = None,
+                       time_end: Optional[time] = None) -> Optional[Callable]:
+    """(strategy, bar) -> bool built from the active thresholds only; None when nothing is active."""
+    checks = []
+
+    if time_start is not None:
+        lo = (time_start.hour * 60 + time_start.minute, time_start.second)
+
+        def after_start(strat, bar):
+            ts = bar.timestamp
+            return (ts.hour * 60 + ts.minute, ts.second) >= lo
+        checks.append(after_start)
+
+    if time_end is not None:
+        hi = (time_end.hour * 60 + time_end.minute, time_end.second)
+
+        def before_end(strat, bar):
+            ts = bar.timestamp
+            key = (ts.hour * 60 + ts.minute, ts.second)
+            return key < hi or (key == hi and ts.microsecond <= time_end.microsecond)
+        checks.append(before_end)
+
+    if min_avg_volume or min_avg_value:
+        def liquid(strat, bar):
+            vol = strat._avg_volume()
+            return vol >= min_avg_volume and vol * bar.close >= min_avg_value
+        checks.append(liquid)
+
+    if min_atr:
+        checks.append(lambda strat, bar: strat._atr() >= min_atr)
+
+    if not checks:
+        return None
+    if len(checks) == 1:
+        return checks[0]
+
+    def keep(strat, bar):
+        for check in checks:
+            if not check(strat, bar):
+                return False
+        return True
+
+    return keep
+
+
+def compile_filter(min_avg_volume: float = 0.0, min_avg_value: float = 0.0, min_atr: float = 0.0,
+                   time_start: Optional[time] = None, time_end: Optional[time] = None) -> Callable:
+    """
+    Signal predicate built from only the active thresholds, so the common
+    "no filters" case is a constant and each active check is one comparison.
+    """
+    meta_checks = [
+        (k, v) for k, v in (("avg_volume", min_avg_volume), ("avg_value", min_avg_value), ("atr", min_atr)) if v
+    ]
+    if not meta_checks and time_start is None and time_end is None:
+        return lambda sig: True
+
+    def keep(sig) -> bool:
+        if meta_checks:
+            meta = sig.meta or {}
+            for k, v in meta_checks:
+                if meta.get(k, 0) < v:
+                    return False
+        if time_start is not None or time_end is not None:
+            t = sig.timestamp.time()
+            if time_start is not None and t < time_start:
+                return False
+            if time_end is not None and t > time_end:
+                return False
+        return True
+
+    return keep
@@ -0,0 +1,99 @@
+"""
+Signal gating (--signal_cooldown, --signal_on_change, --signal_min_move):
+drops repeats of a signal the Engine already reported, before it reaches
+Engine.drafts, ranking and JSON.
+
+The gate only sees signals that pass the watchlist filters, in every mode:
+SIGNAL engines skip failing bars via the per-bar pre-checks, the others drop
+failing signals with the same filters just ahead of the gate (core/filters.py).
+So a signal outside --time_start, say, never counts as the one a later
+signal repeats, and daily and signal scans report the same watchlist.
+
+Strategies re-fire while their condition holds (MR on every bar past the
+threshold, VWAP on each cross while price chops around it), so on a trending
+day one setup can become dozens of near-identical signals. A gate keeps:
+
+    on_change      only the first signal of a run of same-side signals on
+                   consecutive evaluated bars
+    cooldown_bars  nothing within N bars of the last reported signal
+    min_move       a same-side signal only once its entry has moved this
+                   fraction away from the last reported one
+
+An Engine runs one symbol, so a gate is per-symbol state: the previous bar's
+side and the last reported signal, reset at each new session. It sees every
+bar, so a BACKTEST gates only what is reported; entries still trade on the
+strategy's raw signals.
+"""
+from typing import Optional
+
+from core.types import MarketBar, Side
+
+
+class SignalGate:
+    __slots__ = ("cooldown_bars", "on_change", "min_move", "bar", "day", "prev_side",
+                 "last_bar", "last_side", "last_entry", "suppressed")
+
+    def __init__(self, cooldown_bars: int = 0, on_change: bool = False, min_move: float = 0.0):
+        self.cooldown_bars = cooldown_bars
+        self.on_change = on_change
+        self.min_move = min_move
+        self.bar = 0              # bars seen
+        self.day = None           # session (date ordinal) of the latest bar
+        self.prev_side = None     # side signalled on the previous bar (None: no signal)
+        self.last_bar = None      # bar index, side and entry of the last reported signal
+        self.last_side = None
+        self.last_entry = 0.0
+        self.suppressed = 0
+
+    def __call__(self, sig, bar: MarketBar):
+        """`sig` (SignalDraft/Signal/None) if it should be reported, else None."""
+        self.bar += 1
+        if bar.day != self.day:
+            self.day = bar.day
+            self.prev_side = None
+            self.last_bar = None
+        if sig is None:
+            self.prev_side = None
+            return None
+
+        side, prev = sig.side, self.prev_side
+        self.prev_side = side
+        if self.on_change and side == prev:
+            return self._drop()
+        if self.last_bar is not None:
+            if self.bar - self.last_bar <= self.cooldown_bars:
+                return self._drop()
+            if (self.min_move and side == self.last_side
+                    and abs(sig.entry - self.last_entry) < self.min_move * self.last_entry):
+                return self._drop()
+        self.last_bar, self.last_side, self.last_entry = self.bar, side, sig.entry
+        return sig
+
+    def _drop(self):
+        self.suppressed += 1
+        return None
+
+    def get_state(self) -> dict:
+        return {
+            "bar": self.bar,
+            "day": self.day,
+            "prev_side": self.prev_side.value if self.prev_side is not None else None,
+            "last_bar": self.last_bar,
+            "last_side": self.last_side.value if self.last_side is not None else None,
+            "last_entry": self.last_entry,
+        }
+
+    def set_state(self, state: dict):
+        self.bar = state["bar"]
+        self.day = state["day"]
+        self.prev_side = Side(state["prev_side"]) if state["prev_side"] else None
+        self.last_bar = state["last_bar"]
+        self.last_side = Side(state["last_side"]) if state["last_side"] else None
+        self.last_entry = state["last_entry"]
+
+
+def make_gate(cooldown_bars: int = 0, on_change: bool = False, min_move: float = 0.0) -> Optional[SignalGate]:
+    """A fresh gate for one Engine; None when no rule is active."""
+    if not (cooldown_bars or on_change or min_move):
+        return None
+    return SignalGate(cooldown_bars, on_change, min_move)
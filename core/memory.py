@@ -0,0 +1,212 @@
+"""
+Memory accounting for pipeline stages and symbols.
+
+MemoryTracker records, per (stage, symbol), the tracemalloc peak above the
+stage's starting point and the bytes still retained when it ends. Stages may
+nest (e.g. "scan" around each symbol's "load" and strategy runs); peaks are
+carried up to the enclosing stages. Every `sample_every` symbols it also
+diffs a tracemalloc snapshot against the previous one and keeps the top
+growing allocation sites, so a run that creeps toward OOM shows which lines
+are holding on to memory. Like Profiler, results are plain dicts on the wire
+so worker processes can ship them back.
+
+MemoryBudget projects a universe run's final usage from the growth per
+symbol seen so far and raises MemoryBudgetExceeded as soon as the projection
+(or the current usage) passes the budget, instead of letting the VM kill the
+run near the end. Usage is the RSS of the whole process tree, so with
+--workers the pool processes doing the loads and strategy runs are counted.
+"""
+import json
+import os
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+MB = 1024 * 1024
+
+# [start, peak] of the stages in progress, shared by all trackers in the
+# process since tracemalloc has a single peak counter.
+_open: List[List[int]] = []
+
+
+class MemoryBudgetExceeded(RuntimeError):
+    pass
+
+
+def _rss(pid) -> int:
+    with open(f"/proc/{pid}/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def _descendants(root: int) -> List[int]:
+    """Pids of all live descendants of `root`, from each process's parent in /proc/<pid>/stat."""
+    children: Dict[int, List[int]] = {}
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue  # exited meanwhile
+        children.setdefault(ppid, []).append(int(name))
+    out, todo = [], [root]
+    while todo:
+        kids = children.get(todo.pop(), [])
+        out.extend(kids)
+        todo.extend(kids)
+    return out
+
+
+def current_bytes() -> int:
+    """
+    RSS of this process plus its descendants (e.g. the --workers pool): what
+    the OOM killer sees. Pages shared between them count once per process,
+    so this errs high. Peak RSS where /proc is unavailable.
+    """
+    try:
+        total = _rss("self")
+    except (OSError, ValueError, IndexError):
+        import resource
+        return sum(resource.getrusage(who).ru_maxrss * 1024
+                   for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN))
+    for pid in _descendants(os.getpid()):
+        try:
+            total += _rss(pid)
+        except (OSError, ValueError, IndexError):
+            pass
+    return total
+
+
+class MemoryTracker:
+    def __init__(self, sample_every: int = 10, top: int = 5):
+        self.sample_every = sample_every
+        self.top = top
+        self.stats: Dict[Tuple[str, str], List[int]] = {}  # (stage, symbol) -> [peak, retained]
+        self.sites: List[Dict] = []  # sampled top growing allocation sites
+        self._symbols = 0
+        self._snapshot = None
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        return self
+
+    def _fold_peak(self):
+        # Before the peak counter is reset for a nested stage, credit the
+        # peak so far to every stage in progress.
+        peak = tracemalloc.get_traced_memory()[1]
+        for frame in _open:
+            frame[1] = max(frame[1], peak)
+
+    @contextmanager
+    def track(self, stage: str, symbol: str = ""):
+        self._fold_peak()
+        tracemalloc.reset_peak()
+        start = tracemalloc.get_traced_memory()[0]
+        frame = [start, start]
+        _open.append(frame)
+        try:
+            yield
+        finally:
+            self._fold_peak()
+            _open.pop()
+            rec = self.stats.setdefault((stage, symbol), [0, 0])
+            rec[0] = max(rec[0], frame[1] - start)
+            rec[1] += tracemalloc.get_traced_memory()[0] - start
+
+    def symbol_done(self, symbol: str):
+        """Count a finished symbol; every `sample_every` of them, diff a snapshot."""
+        self._symbols += 1
+        if self.sample_every <= 0 or self._symbols % self.sample_every:
+            return
+        snap = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ])
+        if self._snapshot is not None:
+            for diff in snap.compare_to(self._snapshot, "lineno")[:self.top]:
+                frame = diff.traceback[0]
+                self.sites.append({"after": symbol, "site": f"{frame.filename}:{frame.lineno}",
+                                   "growth": diff.size_diff, "size": diff.size})
+        self._snapshot = snap
+
+    def merge(self, other):
+        d = other if isinstance(other, dict) else other.to_dict()
+        for r in d["stages"]:
+            rec = self.stats.setdefault((r["stage"], r["symbol"]), [0, 0])
+            rec[0] = max(rec[0], r["peak"])
+            rec[1] += r["retained"]
+        self.sites.extend(d.get("sites", []))
+        return self
+
+    def to_dict(self) -> Dict:
+        return {
+            "stages": [{"stage": k[0], "symbol": k[1], "peak": v[0], "retained": v[1]}
+                       for k, v in sorted(self.stats.items())],
+            "sites": self.sites,
+        }
+
+    def table(self, top_symbols: int = 10) -> str:
+        by_stage: Dict[str, List[int]] = {}
+        by_symbol: Dict[str, List[int]] = {}
+        for (stage, symbol), (peak, kept) in self.stats.items():
+            rec = by_stage.setdefault(stage, [0, 0])
+            rec[0] = max(rec[0], peak)
+            rec[1] += kept
+            if symbol:  # pipeline-level stages have no symbol
+                rec = by_symbol.setdefault(symbol, [0, 0])
+                rec[0] = max(rec[0], peak)
+                rec[1] += kept
+
+        lines = [f"{'STAGE':<14} {'PEAK MB':>10} {'RETAINED MB':>12}", "-" * 38]
+        for stage, (peak, kept) in sorted(by_stage.items(), key=lambda kv: -kv[1][0]):
+            lines.append(f"{stage:<14} {peak / MB:>10.1f} {kept / MB:>12.1f}")
+        if by_symbol:
+            lines.append("")
+            lines.append(f"Top {min(top_symbols, len(by_symbol))} symbols by peak:")
+            for sym, (peak, kept) in sorted(by_symbol.items(), key=lambda kv: -kv[1][0])[:top_symbols]:
+                lines.append(f"  {sym:<12} peak {peak / MB:>8.1f} MB  retained {kept / MB:>8.1f} MB")
+        if self.sites:
+            lines.append("")
+            lines.append("Largest sampled growth:")
+            for s in sorted(self.sites, key=lambda s: -s["growth"])[:self.top]:
+                lines.append(f"  {s['growth'] / MB:>+8.2f} MB  {s['site']}  (after {s['after']})")
+        return "\n".join(lines)
+
+    def save(self, path: str) -> str:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return path
+
+
+class MemoryBudget:
+    def __init__(self, budget_mb: float, total: int, warmup: int = 3):
+        self.budget = int(budget_mb * MB)
+        self.total = total
+        self.warmup = warmup  # symbols seen before projecting
+        self.baseline: Optional[int] = None  # usage after the first symbol
+        self.done = 0
+        self.projected: Optional[int] = None
+
+    def check(self, label: str = ""):
+        """Call after each symbol; raises MemoryBudgetExceeded when over (or headed over) budget."""
+        self.done += 1
+        used = current_bytes()
+        if used > self.budget:
+            raise MemoryBudgetExceeded(
+                f"memory {used / MB:.0f} MB exceeds budget {self.budget / MB:.0f} MB after {label or self.done}")
+        if self.baseline is None:
+            # Measured after the first symbol rather than up front, so worker
+            # processes starting up don't count as growth per symbol.
+            self.baseline = used
+        if self.done < max(self.warmup, 2):
+            return
+        per_symbol = max(0, used - self.baseline) / (self.done - 1)
+        self.projected = int(used + per_symbol * (self.total - self.done))
+        if self.projected > self.budget:
+            raise MemoryBudgetExceeded(
+                f"projected memory {self.projected / MB:.0f} MB for {self.total} symbols exceeds budget "
+                f"{self.budget / MB:.0f} MB ({per_symbol / MB:.2f} MB retained per symbol after {self.done})")
@@ -0,0 +1,333 @@
+"""
+Cross-sectional panel scanner: aligns the universe onto one (time x symbol)
+matrix and evaluates the MR, ORB and VWAP rules as 2-D array operations
+instead of one Engine per symbol.
+
+Signals match the per-symbol strategies on gap-free data; a missing bar
+(NaN cell) invalidates the rolling windows that cover it.
+"""
+import os
+import warnings
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from core.scanner import symbol_of
+from core.types import MarketBar, Side, Signal, rank_key
+from data.cache import cache_path
+from data.calendar_nse import session_slots, slots_for_minutes
+from strategies import load_strategy_class
+
+FIELDS = ("open", "high", "low", "close", "volume")
+
+
+@dataclass
+class Panel:
+    symbols: List[str]
+    ts: np.ndarray      # (T,) datetime64[m]
+    days: np.ndarray    # (T,) date ordinals
+    slots: np.ndarray   # (T,) session slots
+    open: np.ndarray    # (T, N); NaN where a symbol has no bar
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    @property
+    def shape(self):
+        return self.close.shape
+
+    def rows(self, start: int) -> "Panel":
+        """View of rows [start:] (numpy slices, no copies)."""
+        return Panel(
+            self.symbols, self.ts[start:], self.days[start:], self.slots[start:],
+            *(getattr(self, f)[start:] for f in FIELDS),
+        )
+
+
+def build_panel(columns: Dict[str, Dict[str, np.ndarray]]) -> Panel:
+    """columns: symbol -> {"timestamp": datetime64 array, "open": ..., ...}"""
+    symbols = list(columns)
+    stamps = [np.asarray(c["timestamp"], dtype="datetime64[m]") for c in columns.values()]
+    ts = np.unique(np.concatenate(stamps)) if stamps else np.array([], dtype="datetime64[m]")
+
+    mats = {f: np.full((len(ts), len(symbols)), np.nan) for f in FIELDS}
+    for j, (sym, st) in enumerate(zip(symbols, stamps)):
+        rows = np.searchsorted(ts, st)
+        for f in FIELDS:
+            mats[f][rows, j] = np.asarray(columns[sym][f], dtype=np.float64)
+
+    days, slots = session_slots(ts)
+    return Panel(symbols, ts, days, slots, **mats)
+
+
+def panel_from_bars(bars_by_symbol: Dict[str, List[MarketBar]]) -> Panel:
+    cols = {}
+    for sym, bars in bars_by_symbol.items():
+        cols[sym] = {"timestamp": np.array([b.timestamp for b in bars], dtype="datetime64[m]")}
+        for f in FIELDS:
+            cols[sym][f] = np.fromiter((getattr(b, f) for b in bars), dtype=np.float64, count=len(bars))
+    return build_panel(cols)
+
+
+def load_panel(tickers: Iterable[str], cache_dir: str, interval: str = "5m") -> Panel:
+    """Read cached CSVs column-wise (no MarketBar objects) into one panel."""
+    import pandas as pd
+
+    cols = {}
+    for t in tickers:
+        path = cache_path(cache_dir, t, interval)
+        if not os.path.exists(path):
+            print(f"ERROR processing {t}: no cached data: {path}")
+            continue
+        df = pd.read_csv(path)
+        sym = symbol_of(t)
+        cols[sym] = {"timestamp": pd.to_datetime(df["timestamp"]).to_numpy(dtype="datetime64[m]")}
+        for f in FIELDS:
+            cols[sym][f] = df[f].to_numpy(dtype=np.float64)
+    return build_panel(cols)
+
+
+# ---- rolling helpers (axis 0 = time) ----
+
+def _rolling_mean(x: np.ndarray, n: int) -> np.ndarray:
+    """Mean of the last n rows; NaN unless all n cells are present."""
+    valid = ~np.isnan(x)
+    zero = np.zeros((1,) + x.shape[1:])
+    cs = np.concatenate([zero, np.cumsum(np.where(valid, x, 0.0), axis=0)])
+    cn = np.concatenate([zero, np.cumsum(valid, axis=0)])
+    out = np.full(x.shape, np.nan)
+    if len(x) >= n:
+        s = cs[n:] - cs[:-n]
+        c = cn[n:] - cn[:-n]
+        out[n - 1:] = np.where(c == n, s / n, np.nan)
+    return out
+
+
+def _shift(x: np.ndarray, k: int = 1) -> np.ndarray:
+    out = np.full(x.shape, np.nan)
+    if k < len(x):
+        out[k:] = x[:-k]
+    return out
+
+
+def _seen(p: Panel) -> np.ndarray:
+    """Bars seen so far per symbol (len(strategy.history))."""
+    return np.cumsum(~np.isnan(p.close), axis=0)
+
+
+def _day_starts(days: np.ndarray) -> np.ndarray:
+    """Row index of the first row of each row's session."""
+    new = np.ones(len(days), dtype=bool)
+    new[1:] = days[1:] != days[:-1]
+    return np.maximum.accumulate(np.where(new, np.arange(len(days)), 0))
+
+
+def _cumsum_by_day(x: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    cs = np.cumsum(x, axis=0)
+    zero = np.zeros((1,) + x.shape[1:])
+    before = np.concatenate([zero, cs])[starts]
+    return cs - before
+
+
+class Indicators:
+    """Shared per-panel indicators, computed once and reused by every rule."""
+
+    def __init__(self, p: Panel, seen_before=0):
+        self.p = p
+        self.seen = _seen(p) + seen_before
+        prev_close = _shift(p.close)
+        tr = np.fmax(p.high - p.low, np.fmax(np.abs(p.high - prev_close), np.abs(p.low - prev_close)))
+        tr[np.isnan(prev_close)] = np.nan
+        self.atr = np.where(self.seen >= 15, np.nan_to_num(_rolling_mean(tr, 14)), 0.0)
+        self.avg_volume = np.where(self.seen >= 20, np.nan_to_num(_rolling_mean(p.volume, 20)), 0.0)
+        self.avg_value = self.avg_volume * p.close
+        self.day_starts = _day_starts(p.days)
+
+
+# ---- rules: each returns {field: (T, N) array} plus "buy"/"sell" masks ----
+
+def mr_rule(ind: Indicators, lookback: int = 20, threshold: float = 0.02) -> Dict[str, np.ndarray]:
+    p = ind.p
+    sma = _rolling_mean(p.close, lookback)
+    dev = (p.close - sma) / sma
+    ready = (ind.seen >= lookback + 1) & ~np.isnan(dev)
+    dev0 = np.where(ready, dev, 0.0)
+    sell = ready & (dev0 > threshold)
+    buy = ready & (dev0 < -threshold)
+    px = p.close
+    return {
+        "buy": buy, "sell": sell,
+        "stop": np.where(sell, px * 1.01, px * 0.99),
+        "target": sma,
+        "confidence": np.minimum(np.abs(dev0) * 10, 1.0),
+        "sma": sma, "deviation": dev,
+    }
+
+
+def vwap_rule(ind: Indicators, stop_mult: float = 1.0, target_mult: float = 1.5) -> Dict[str, np.ndarray]:
+    p = ind.p
+    typical = (p.high + p.low + p.close) / 3
+    pv = np.nan_to_num(typical * p.volume)
+    vol = np.nan_to_num(p.volume)
+    cpv = _cumsum_by_day(pv, ind.day_starts)
+    cvol = _cumsum_by_day(vol, ind.day_starts)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        vwap = np.where(cvol > 0, cpv / cvol, np.nan)
+
+    same_day = np.zeros(len(p.days), dtype=bool)
+    same_day[1:] = p.days[1:] == p.days[:-1]
+    prev_close = _shift(p.close)
+    prev_vwap = _shift(vwap)
+    ok = same_day[:, None] & ~np.isnan(prev_vwap)
+
+    px = p.close
+    buy = ok & (prev_close < prev_vwap) & (px > vwap)
+    sell = ok & (prev_close > prev_vwap) & (px < vwap)
+    risk = stop_mult * np.where(ind.atr > 0, ind.atr, px * 0.005)
+    return {
+        "buy": buy, "sell": sell,
+        "stop": np.where(buy, px - risk, px + risk),
+        "target": np.where(buy, px + target_mult * risk, px - target_mult * risk),
+        "confidence": np.full(px.shape, 0.6),
+        "vwap": vwap,
+    }
+
+
+def orb_rule(ind: Indicators, orb_minutes: int = 15) -> Dict[str, np.ndarray]:
+    p = ind.p
+    orb_slots = slots_for_minutes(orb_minutes)
+    T, N = p.shape
+    orb_high = np.full((T, N), np.nan)
+    orb_low = np.full((T, N), np.nan)
+    breakout = np.zeros((T, N), dtype=bool)
+
+    # Pre-open bars (negative slots) neither form the range nor break out of it.
+    in_window = (p.slots >= 0) & (p.slots < orb_slots)
+    after = p.slots >= orb_slots
+    starts = np.flatnonzero(np.r_[True, p.days[1:] != p.days[:-1]]) if T else np.array([], dtype=int)
+    ends = np.r_[starts[1:], T]
+    for s, e in zip(starts, ends):
+        win = in_window[s:e]
+        if not win.any():
+            continue
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN columns
+            hi = np.nanmax(np.where(win[:, None], p.high[s:e], np.nan), axis=0)
+            lo = np.nanmin(np.where(win[:, None], p.low[s:e], np.nan), axis=0)
+        orb_high[s:e] = hi
+        orb_low[s:e] = lo
+        px = p.close[s:e]
+        valid = np.isfinite(hi) & np.isfinite(lo)
+        # NaN compares False, so missing bars never break out.
+        hit = after[s:e, None] & valid & ((px > hi) | (px < lo))
+        # One entry per symbol per day: keep only the first breakout.
+        breakout[s:e] = hit & (np.cumsum(hit, axis=0) == 1)
+
+    px = p.close
+    buy = breakout & (px > orb_high)
+    sell = breakout & ~buy
+    risk = np.where(buy, px - orb_low, orb_high - px)
+    return {
+        "buy": buy, "sell": sell,
+        "stop": np.where(buy, orb_low, orb_high),
+        "target": np.where(buy, px + 1.5 * risk, px - 1.5 * risk),
+        "confidence": np.full(px.shape, 0.7),
+        "orb_high": orb_high, "orb_low": orb_low,
+    }
+
+
+def _reason(name: str, side: Side, px: float, f: Dict, t: int, j: int, params: Dict) -> str:
+    # Same wording as the per-symbol strategies: the text comes from their reason().
+    cls = load_strategy_class(name)
+    if name == "mr":
+        template, args = cls.reason(side, px, float(f["deviation"][t, j]), float(f["sma"][t, j]),
+                                    params.get("lookback", 20))
+    elif name == "orb":
+        template, args = cls.reason(side, px, float(f["orb_high"][t, j]), float(f["orb_low"][t, j]))
+    else:
+        template, args = cls.reason(side, px, float(f["vwap"][t, j]))
+    return template.format(*args)
+
+
+_META = {"mr": ("sma", "deviation"), "orb": ("orb_high", "orb_low"), "vwap": ("vwap",)}
+
+
+def evaluate(p: Panel, strategies: Iterable[str], params: Optional[Dict] = None,
+             latest_only: bool = False, ind: Optional[Indicators] = None) -> Dict[str, List[Signal]]:
+    """
+    Evaluate each rule over the whole panel (or only its last row) and build
+    Signals for the hits, keyed by strategy name like SymbolScan.signals.
+    """
+    params = params or {}
+    if latest_only and ind is None and len(p.ts):
+        # Only the last session and the longest rolling window matter for
+        # the latest bar, so evaluate just that tail of the panel.
+        T = len(p.ts)
+        need = max(params.get("lookback", 20), 20, 15) + 1
+        start = min(int(_day_starts(p.days)[-1]), max(T - need, 0))
+        seen_before = np.sum(~np.isnan(p.close[:start]), axis=0)
+        p = p.rows(start)
+        ind = Indicators(p, seen_before)
+    ind = ind or Indicators(p)
+    rows = slice(len(p.ts) - 1, len(p.ts)) if latest_only else slice(None)
+    out: Dict[str, List[Signal]] = {}
+
+    for name in strategies:
+        if name == "mr":
+            f = mr_rule(ind, params.get("lookback", 20), params.get("threshold", 0.02))
+        elif name == "orb":
+            f = orb_rule(ind, params.get("orb_minutes", 15))
+        elif name == "vwap":
+            f = vwap_rule(ind, params.get("vwap_stop_mult", 1.0), params.get("vwap_target_mult", 1.5))
+        else:
+            raise ValueError(f"Unknown strategy: {name}")
+
+        hits = f["buy"] | f["sell"]
+        mask = np.zeros_like(hits)
+        mask[rows] = hits[rows]
+        sigs = []
+        for t, j in zip(*np.nonzero(mask)):
+            side = Side.BUY if f["buy"][t, j] else Side.SELL
+            px = float(p.close[t, j])
+            meta = {k: float(f[k][t, j]) for k in _META[name]}
+            meta.update(
+                atr=float(ind.atr[t, j]),
+                avg_volume=float(ind.avg_volume[t, j]),
+                avg_value=float(ind.avg_value[t, j]),
+            )
+            sigs.append(Signal(
+                symbol=p.symbols[j],
+                timestamp=p.ts[t].astype("datetime64[s]").astype(datetime),
+                side=side,
+                entry=px,
+                stop=float(f["stop"][t, j]),
+                targets=[float(f["target"][t, j])],
+                confidence=float(f["confidence"][t, j]),
+                reasoning=_reason(name, side, px, f, t, j, params),
+                meta=meta,
+            ))
+        out[name] = sigs
+    return out
+
+
+def rank_cross_section(signals: List[Signal]) -> List[Signal]:
+    """
+    Rank candidates against the others firing on the same bar; adds
+    meta["xs_rank"] (1 = best) and meta["xs_count"]. Returns the signals
+    ordered by timestamp, then rank.
+    """
+    by_ts: Dict[datetime, List[Signal]] = {}
+    for s in signals:
+        by_ts.setdefault(s.timestamp, []).append(s)
+
+    out = []
+    for ts in sorted(by_ts):
+        group = sorted(by_ts[ts], key=rank_key)
+        for i, s in enumerate(group, 1):
+            s.meta["xs_rank"] = i
+            s.meta["xs_count"] = len(group)
+            out.append(s)
+    return out
@@ -0,0 +1,95 @@
+import json
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Engine stages that can be instrumented.
+STAGES = ("on_bar", "size_position", "execute", "update_fill", "equity_curve")
+
+
+class Profiler:
+    """
+    Call counts and cumulative wall time per (stage, strategy, symbol).
+
+    The Engine only routes calls through `wrap` when a profiler is given, so a
+    run without one pays nothing. Profiles are plain dicts on the wire
+    (`to_dict`/`merge`) so worker processes can ship them back to the parent.
+    """
+
+    def __init__(self):
+        self.stats: Dict[Tuple[str, str, str], List] = {}  # key -> [calls, seconds]
+
+    def wrap(self, stage: str, fn, strategy: str, symbol: str):
+        rec = self.stats.setdefault((stage, strategy, symbol), [0, 0.0])
+        clock = time.perf_counter
+
+        def timed(*args, **kwargs):
+            t0 = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                rec[0] += 1
+                rec[1] += clock() - t0
+
+        return timed
+
+    def merge(self, other):
+        rows = other["stages"] if isinstance(other, dict) else other.to_dict()["stages"]
+        for r in rows:
+            rec = self.stats.setdefault((r["stage"], r["strategy"], r["symbol"]), [0, 0.0])
+            rec[0] += r["calls"]
+            rec[1] += r["seconds"]
+        return self
+
+    def to_dict(self) -> Dict:
+        return {
+            "stages": [
+                {"stage": k[0], "strategy": k[1], "symbol": k[2], "calls": v[0], "seconds": v[1]}
+                for k, v in sorted(self.stats.items())
+            ]
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict) -> "Profiler":
+        return cls().merge(d)
+
+    def totals(self, *fields: str) -> Dict[Tuple, List]:
+        """Aggregate over the fields not named, e.g. totals("stage", "strategy")."""
+        idx = {"stage": 0, "strategy": 1, "symbol": 2}
+        out: Dict[Tuple, List] = {}
+        for k, (calls, secs) in self.stats.items():
+            key = tuple(k[idx[f]] for f in fields)
+            rec = out.setdefault(key, [0, 0.0])
+            rec[0] += calls
+            rec[1] += secs
+        return out
+
+    def table(self, top_symbols: int = 10) -> str:
+        grand = sum(v[1] for v in self.stats.values()) or 1e-12
+        lines = [
+            f"{'STAGE':<14} {'STRATEGY':<10} {'CALLS':>10} {'TOTAL ms':>10} {'us/call':>9} {'%':>6}",
+            "-" * 64,
+        ]
+        for (stage, strat), (calls, secs) in sorted(
+            self.totals("stage", "strategy").items(), key=lambda kv: -kv[1][1]
+        ):
+            if not calls:
+                continue
+            per = secs / calls * 1e6 if calls else 0.0
+            lines.append(
+                f"{stage:<14} {strat:<10} {calls:>10} {secs*1e3:>10.1f} {per:>9.1f} {secs/grand*100:>6.1f}"
+            )
+
+        by_symbol = sorted(self.totals("symbol").items(), key=lambda kv: -kv[1][1])
+        if by_symbol:
+            lines.append("")
+            lines.append(f"Top {min(top_symbols, len(by_symbol))} symbols by time:")
+            for (sym,), (calls, secs) in by_symbol[:top_symbols]:
+                lines.append(f"  {sym:<12} {secs*1e3:>10.1f} ms  ({calls} calls)")
+        return "\n".join(lines)
+
+    def save(self, path: str) -> str:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return path
@@ -0,0 +1,141 @@
+"""
+Content-addressed cache of per-(symbol, strategy) engine results.
+
+The key hashes everything a run depends on: the bars themselves, strategy
+name and params, mode, capital, signal pre-filters and a hash of the
+project's engine/strategy source. An unchanged symbol is therefore a cache
+hit no matter when or from which command it last ran; any change to its
+data, params or the code is a miss. Entries are pickles under
+<root>/<key[:2]>/<key>.pkl; the directory is kept under `max_bytes` by
+evicting least-recently-used entries (hits refresh the file's mtime).
+"""
+import hashlib
+import json
+import os
+import pickle
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+RESULT_CACHE_VERSION = 1
+DEFAULT_MAX_MB = 256
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+# Packages whose code decides what a run produces.
+CODE_PACKAGES = ("core", "data", "execution", "portfolio", "risk", "strategies")
+
+
+@lru_cache(maxsize=1)
+def code_version() -> str:
+    h = hashlib.sha1()
+    for pkg in CODE_PACKAGES:
+        for path in sorted((PROJECT_DIR / pkg).rglob("*.py")):
+            h.update(str(path.relative_to(PROJECT_DIR)).encode())
+            h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+def result_key(data_fp: str, strategy: str, params: Dict, mode: str, capital: float,
+               filters: Optional[Dict] = None, gating: Optional[Dict] = None,
+               target_exits: bool = False, max_drafts: int = 0) -> str:
+    key = {
+        "v": RESULT_CACHE_VERSION,
+        "code": code_version(),
+        "data": data_fp,
+        "strategy": strategy,
+        "params": params,
+        "mode": mode,
+        "capital": capital,
+        "filters": filters or {},
+    }
+    if gating:
+        key["gating"] = gating
+    if target_exits:
+        key["target_exits"] = True
+    if max_drafts:
+        key["max_drafts"] = max_drafts
+    blob = json.dumps(key, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+class ResultCache:
+    def __init__(self, root: str, max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size: Optional[int] = None  # bytes on disk, computed on first put
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.pkl"
+
+    def get(self, key: str) -> Optional[Any]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        try:
+            os.utime(path)  # LRU: mark as recently used
+        except OSError:
+            pass
+        return value
+
+    def put(self, key: str, value: Any):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".tmp{os.getpid()}")
+        with open(tmp, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+        if self._size is None:
+            self._size = sum(p.stat().st_size for p in self._entries())
+        else:
+            self._size += path.stat().st_size
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def _entries(self):
+        return self.root.glob("*/*.pkl")
+
+    def _evict(self):
+        files = []
+        for p in self._entries():
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, p))
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        # Down to 90% so a full cache doesn't rescan on every put.
+        target = int(self.max_bytes * 0.9)
+        for _, size, p in files:
+            if total <= target:
+                break
+            try:
+                p.unlink()
+                total -= size
+            except OSError:
+                pass
+        self._size = total
+
+    def hit_rate(self) -> float:
+        n = self.hits + self.misses
+        return self.hits / n if n else 0.0
+
+
+_open: Dict[tuple, ResultCache] = {}
+
+
+def open_cache(root: str, max_mb: int = DEFAULT_MAX_MB) -> ResultCache:
+    """One ResultCache per (root, size) per process, so the size tally is computed once."""
+    key = (str(root), max_mb)
+    rc = _open.get(key)
+    if rc is None:
+        rc = _open[key] = ResultCache(root, max_mb * 1024 * 1024)
+    return rc
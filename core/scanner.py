@@ -0,0 +1,225 @@
+import os
+import time
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from core.checkpoint import checkpoint_path, fingerprint, load_checkpoint, save_checkpoint
+from core.engine import Engine
+from core.filters import compile_bar_filter, compile_filter
+from core.gating import make_gate
+from core.memory import MemoryTracker
+from core.profiling import Profiler
+from core.result_cache import DEFAULT_MAX_MB, open_cache, result_key
+from core.types import MarketBar, RunMode
+from data.cache import cache_path
+from data.calendar_nse import parse_interval
+from data.ingestion import clip_range, load_csv
+from data.prefetch import Prefetched, Prefetcher
+from data.resample import BASE_INTERVAL, load_resampled
+from execution.drilldown import DrillDown
+from strategies import create_strategy
+
+
+@dataclass
+class ScanConfig:
+    cache_dir: str = "datasets/cache"
+    period: str = "5d"
+    interval: str = "5m"
+    capital: float = 100000.0
+    strategies: Tuple[str, ...] = ("mr",)
+    params: Dict = field(default_factory=dict)  # lookback, threshold, orb_minutes, vwap_*_mult
+    # Watchlist filters pushed into the engines (core/filters.py): per-bar
+    # pre-checks in SIGNAL mode, a filter on reported signals otherwise.
+    # min_avg_volume, min_avg_value, min_atr, time_start, time_end
+    filters: Dict = field(default_factory=dict)
+    # Repeat-signal gating per engine (core/gating.py): cooldown_bars, on_change, min_move
+    gating: Dict = field(default_factory=dict)
+    # Keep at most this many best-ranked signals per (symbol, strategy) engine,
+    # 0 = all. Only safe when no later filter drops signals (main.py sets it).
+    max_drafts: int = 0
+    fetch_missing: bool = True
+    profile: bool = False
+    workers: int = 1
+    checkpoint_dir: Optional[str] = None  # SIGNAL mode: resume from saved strategy state
+    store_dir: Optional[str] = None  # partitioned history (data/store.py) instead of the CSV cache
+    start: Optional[date] = None     # inclusive date range of bars to run over
+    end: Optional[date] = None
+    target_exits: bool = False       # BACKTEST: also exit at the signal's first target
+    drilldown: Optional[str] = None  # BACKTEST: finer interval (e.g. "1m") for ambiguous exit bars
+    result_cache: Optional[str] = None  # reuse per-(symbol, strategy) results whose inputs are unchanged
+    result_cache_mb: int = DEFAULT_MAX_MB
+    mem_report: bool = False  # tracemalloc peak/retained per (stage, symbol)
+    # Sequential scans: load (and fetch) up to this many upcoming symbols on
+    # background threads while the current one runs (data/prefetch.py); 0 = off.
+    prefetch: int = 0
+    prefetch_threads: int = 2
+
+
+@dataclass
+class SymbolScan:
+    ticker: str
+    symbol: str
+    results: Dict[str, dict] = field(default_factory=dict)          # strategy -> Engine.summary()
+    signals: Dict[str, List] = field(default_factory=dict)  # strategy -> Engine.drafts (SignalDraft/Signal)
+    error: Optional[str] = None
+    profile: Optional[Dict] = None  # Profiler.to_dict() when cfg.profile
+    drilldown: Optional[Dict] = None  # DrillDown.stats() when cfg.drilldown (BACKTEST)
+    cache_hits: int = 0    # strategies served from cfg.result_cache
+    cache_misses: int = 0
+    memory: Optional[Dict] = None  # MemoryTracker.to_dict() when cfg.mem_report
+    load_seconds: float = 0.0  # loading/fetching the bars
+    load_wait: float = 0.0     # of which the scan was blocked on (all of it unless prefetched)
+    prefetch_ready: Optional[int] = None  # prefetched symbols already loaded when this one was taken
+
+
+def symbol_of(ticker: str) -> str:
+    return ticker.replace(".NS", "")
+
+
+def load_symbol(ticker: str, cfg: ScanConfig) -> List[MarketBar]:
+    if cfg.store_dir:
+        # Only the month partitions overlapping [start, end] are read.
+        from data.store import load_range
+        return load_range(cfg.store_dir, ticker, symbol_of(ticker), cfg.interval, cfg.start, cfg.end)
+    return clip_range(_load_cached(ticker, cfg), cfg.start, cfg.end)
+
+
+def _load_cached(ticker: str, cfg: ScanConfig) -> List[MarketBar]:
+    csv_path = cache_path(cfg.cache_dir, ticker, cfg.interval)
+    if not os.path.exists(csv_path) and cfg.interval != BASE_INTERVAL:
+        # Higher timeframes come from the 5m cache rather than another fetch.
+        if os.path.exists(cache_path(cfg.cache_dir, ticker, BASE_INTERVAL)):
+            return load_resampled(cfg.cache_dir, ticker, symbol_of(ticker), cfg.interval)
+    if not os.path.exists(csv_path):
+        if not cfg.fetch_missing:
+            raise FileNotFoundError(f"no cached data: {csv_path}")
+        from scripts.fetch_yahoo_5m import fetch_one
+        fetch_one(ticker, csv_path, cfg.period, cfg.interval)
+    return load_csv(csv_path, symbol_of(ticker))
+
+
+def run_bars(bars: List[MarketBar], symbol: str, strategy_name: str, mode: RunMode,
+             capital: float, params: Dict, profiler: Optional[Profiler] = None,
+             checkpoint: Optional[str] = None, prefilter=None, drilldown=None,
+             gating: Optional[Dict] = None, risk=None, target_exits: bool = False,
+             max_drafts: int = 0, report_filter=None) -> Engine:
+    """
+    Run one strategy over `bars`. With a `checkpoint` path (SIGNAL mode only)
+    the engine resumes after the last bar of the previous run when the
+    checkpoint still matches, so only new bars are processed and only their
+    signals are returned; the checkpoint is then rewritten.
+    """
+    strat = create_strategy(strategy_name, symbol, **params)
+    eng = Engine(strat, mode, initial_capital=capital, profiler=profiler, prefilter=prefilter,
+                 drilldown=drilldown, gate=make_gate(**gating) if gating else None, risk=risk,
+                 target_exits=target_exits, max_drafts=max_drafts, report_filter=report_filter)
+    use_ckpt = checkpoint is not None and mode == RunMode.SIGNAL
+    start = load_checkpoint(checkpoint, eng, bars) if use_ckpt else 0
+    eng.run(bars[start:] if start else bars)
+    if use_ckpt:
+        save_checkpoint(checkpoint, eng, bars)
+    return eng
+
+
+def _result_key(data_fp: str, strategy_name: str, mode: RunMode, cfg: ScanConfig) -> str:
+    # Only the params the strategy actually uses, so e.g. orb_minutes doesn't invalidate mr.
+    params = create_strategy(strategy_name, "_", **cfg.params).params()
+    target_exits = cfg.target_exits and mode == RunMode.BACKTEST
+    return result_key(data_fp, strategy_name, params, mode.value, cfg.capital, cfg.filters, cfg.gating,
+                      target_exits, cfg.max_drafts)
+
+
+def scan_symbol(ticker: str, mode: RunMode, cfg: ScanConfig, loaded: Optional[Prefetched] = None) -> SymbolScan:
+    """
+    Load one symbol's bars once and run every configured strategy over them.
+    In BACKTEST mode the engines also record signals, so a single pass serves
+    both the watchlist and the backtest report. `loaded` carries bars (or the
+    load error) already loaded by a Prefetcher.
+    """
+    out = SymbolScan(ticker=ticker, symbol=symbol_of(ticker))
+    prof = Profiler() if cfg.profile else None
+    pre = post = None
+    if any(cfg.filters.values()):
+        if mode == RunMode.SIGNAL:
+            pre = compile_bar_filter(**cfg.filters)
+        else:
+            post = compile_filter(**cfg.filters)
+    mem = MemoryTracker().start() if cfg.mem_report else None
+    track = mem.track if mem is not None else (lambda stage, symbol: nullcontext())
+    try:
+        if loaded is None:
+            t0 = time.perf_counter()
+            with track("load", out.symbol):
+                bars = load_symbol(ticker, cfg)
+            out.load_seconds = out.load_wait = time.perf_counter() - t0
+        else:
+            out.load_seconds, out.load_wait, out.prefetch_ready = loaded.seconds, loaded.wait, loaded.ready
+            if loaded.error is not None:
+                raise loaded.error
+            bars = loaded.value
+        dd = None
+        if cfg.drilldown and mode == RunMode.BACKTEST:
+            # One per symbol, so strategies share the loaded windows.
+            dd = DrillDown(ticker, out.symbol, cfg.cache_dir, cfg.store_dir, cfg.drilldown,
+                           parse_interval(cfg.interval))
+        # Checkpointed runs return only new signals and drill-down results
+        # depend on finer data outside `bars`, so neither is cached.
+        rc = None
+        if cfg.result_cache and not cfg.checkpoint_dir and dd is None:
+            rc = open_cache(cfg.result_cache, cfg.result_cache_mb)
+            data_fp = f"{ticker}:{cfg.interval}:{fingerprint(bars)}"
+        for strat_name in cfg.strategies:
+            key = None
+            if rc is not None:
+                key = _result_key(data_fp, strat_name, mode, cfg)
+                cached = rc.get(key)
+                if cached is not None:
+                    out.cache_hits += 1
+                    out.results[strat_name] = cached["summary"]
+                    out.signals[strat_name] = cached["signals"]
+                    continue
+                out.cache_misses += 1
+            ckpt = None
+            if cfg.checkpoint_dir:
+                ckpt = checkpoint_path(cfg.checkpoint_dir, ticker, cfg.interval, strat_name)
+            with track(strat_name, out.symbol):
+                eng = run_bars(bars, out.symbol, strat_name, mode, cfg.capital, cfg.params, prof, ckpt, pre, dd,
+                               cfg.gating, target_exits=cfg.target_exits, max_drafts=cfg.max_drafts,
+                               report_filter=post)
+                out.results[strat_name] = eng.summary()
+                out.signals[strat_name] = eng.drafts
+            if key is not None:
+                rc.put(key, {"summary": out.results[strat_name], "signals": out.signals[strat_name]})
+        if dd is not None:
+            out.drilldown = dd.stats()
+    except Exception as e:
+        out.error = str(e)
+    if prof is not None:
+        out.profile = prof.to_dict()
+    if mem is not None:
+        out.memory = mem.to_dict()
+    return out
+
+
+def scan_universe(tickers: Iterable[str], mode: RunMode, cfg: ScanConfig) -> Iterator[SymbolScan]:
+    """
+    Yield one SymbolScan per ticker, in order; cfg.workers > 1 fans out to
+    processes. Sequential scans prefetch upcoming symbols when cfg.prefetch is
+    set, except with cfg.mem_report (background loads would blur its per-stage
+    attribution).
+    """
+    if cfg.workers <= 1 and cfg.prefetch > 0 and not cfg.mem_report:
+        for item in Prefetcher(tickers, lambda t: load_symbol(t, cfg), cfg.prefetch, cfg.prefetch_threads):
+            yield scan_symbol(item.key, mode, cfg, item)
+        return
+    if cfg.workers <= 1:
+        for t in tickers:
+            yield scan_symbol(t, mode, cfg)
+        return
+
+    tickers = list(tickers)
+    with ProcessPoolExecutor(max_workers=cfg.workers) as pool:
+        yield from pool.map(scan_symbol, tickers, [mode] * len(tickers), [cfg] * len(tickers))
@@ -1,7 +1,8 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from enum import Enum
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
+from data.calendar_nse import SLOT_OF_MINUTE
 
 
 class Side(str, Enum):
@@ -25,6 +26,16 @@ class MarketBar:
     low: float
     close: float
     volume: float
+    # Session index, filled in from the timestamp once at construction so
+    # per-bar time-of-day logic is integer comparisons (see data/calendar_nse.py).
+    day: int = field(default=None, compare=False, repr=False)   # date ordinal
+    slot: int = field(default=None, compare=False, repr=False)  # 5m session slot
+
+    def __post_init__(self):
+        if self.slot is None:
+            ts = self.timestamp
+            object.__setattr__(self, "day", ts.toordinal())
+            object.__setattr__(self, "slot", SLOT_OF_MINUTE[ts.hour * 60 + ts.minute])
 
 
 @dataclass(frozen=True)
@@ -39,6 +50,73 @@ class Signal:
     reasoning: str
     meta: Dict[str, Any] | None = None
 
+    def materialize(self, prefix: str = "") -> "Signal":
+        return replace(self, reasoning=prefix + self.reasoning) if prefix else self
+
+
+class SignalDraft:
+    """
+    A fired signal whose `meta` dict and `reasoning` text are built only when
+    asked for (materialize(), or the properties), so signals dropped by the
+    watchlist never pay for them. Carries plain values only, so it pickles
+    back from scan worker processes.
+    """
+    __slots__ = ("symbol", "timestamp", "side", "entry", "stop", "targets", "confidence",
+                 "atr", "avg_volume", "extras", "template", "args")
+
+    def __init__(self, symbol: str, timestamp: datetime, side: Side, entry: float, stop: float,
+                 targets: List[float], confidence: float, atr: float, avg_volume: float,
+                 extras: Tuple = (), template: str = "", args: Tuple = ()):
+        self.symbol = symbol
+        self.timestamp = timestamp
+        self.side = side
+        self.entry = entry
+        self.stop = stop
+        self.targets = targets
+        self.confidence = confidence
+        self.atr = atr
+        self.avg_volume = avg_volume
+        self.extras = extras        # ((key, value), ...) strategy-specific meta, in order
+        self.template = template    # reasoning = template.format(*args)
+        self.args = args
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        meta = dict(self.extras)
+        meta["atr"] = self.atr
+        meta["avg_volume"] = self.avg_volume
+        meta["avg_value"] = self.avg_volume * self.entry
+        return meta
+
+    @property
+    def reasoning(self) -> str:
+        return self.template.format(*self.args)
+
+    def rank_key(self):
+        return (-float(self.confidence), -float(self.avg_volume), -float(self.atr), self.symbol)
+
+    def materialize(self, prefix: str = "") -> Signal:
+        return Signal(
+            symbol=self.symbol,
+            timestamp=self.timestamp,
+            side=self.side,
+            entry=self.entry,
+            stop=self.stop,
+            targets=self.targets,
+            confidence=self.confidence,
+            reasoning=prefix + self.reasoning,
+            meta=self.meta,
+        )
+
+
+def rank_key(s):
+    """Watchlist order: confidence, then liquidity (avg volume), then ATR, then symbol."""
+    fast = getattr(s, "rank_key", None)  # SignalDraft: no meta dict needed
+    if fast is not None:
+        return fast()
+    meta = s.meta or {}
+    return (-float(s.confidence), -float(meta.get("avg_volume", 0)), -float(meta.get("atr", 0)), s.symbol)
+
 
 @dataclass(frozen=True)
 class Order:
@@ -7,16 +7,23 @@ import json
 import os
 import glob
 import subprocess
+import sys
 import threading
 import time
-from flask import Flask, render_template, jsonify
-import pandas as pd
+from datetime import date, datetime, timedelta
+from flask import Flask, Response, render_template, jsonify, request
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+from data import chart
+from data.store import load_columns, series_dir
 
 app = Flask(__name__)
 
-PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 REPORTS_DIR = os.path.join(PROJECT_DIR, "reports")
 CACHE_DIR = os.path.join(PROJECT_DIR, "datasets", "cache")
+STORE_DIR = os.path.join(PROJECT_DIR, "datasets", "store")
 VENV_PYTHON = os.path.join(PROJECT_DIR, ".venv", "bin", "python3")
 UNIVERSE = os.path.join(PROJECT_DIR, "universe", "nifty50.txt")
 
@@ -83,12 +90,21 @@ def load_latest_watchlist():
     return signals, date_str
 
 
-def load_ohlcv(symbol):
+_csv_columns = {}  # path -> (mtime, columns): each cache CSV is parsed once per change
+
+
+def load_ohlcv(symbol, start=None, end=None):
+    """5m columns for `symbol`: from the history store when it has the series, else the CSV cache."""
     for ticker in [f"{symbol}.NS", symbol]:
+        if os.path.isdir(series_dir(STORE_DIR, ticker, "5m")):
+            return load_columns(STORE_DIR, ticker, "5m", start, end)
         path = os.path.join(CACHE_DIR, f"{ticker}_5m.csv")
         if os.path.exists(path):
-            df = pd.read_csv(path, parse_dates=["timestamp"])
-            return df
+            mtime = os.path.getmtime(path)
+            hit = _csv_columns.get(path)
+            if hit is None or hit[0] != mtime:
+                hit = _csv_columns[path] = (mtime, chart.csv_columns(path))
+            return hit[1]
     return None
 
 
@@ -156,17 +172,58 @@ def signals_json():
 
 @app.route("/chart/<symbol>")
 def chart_data(symbol):
-    df = load_ohlcv(symbol)
-    if df is None:
+    """
+    OHLCV for a chart. Query params (all optional):
+      from, to     inclusive YYYY-MM-DD range
+      max_points   aggregate to the finest resolution giving at most this many bars
+      resolution   fixed resolution instead (5m, 15m, 30m, 1h, 2h, 1d, 1w)
+      since        `last` of a previous response: only the bucket containing it and newer ones
+      format       json (default) or f32 (packed float32, see data/chart.py)
+    Without any of them the last 100 bars are returned, as before.
+    """
+    args = request.args
+    try:
+        start = date.fromisoformat(args["from"]) if "from" in args else None
+        end = date.fromisoformat(args["to"]) if "to" in args else None
+        since = chart.to_seconds(datetime.fromisoformat(args["since"])) if "since" in args else None
+        max_points = int(args["max_points"]) if "max_points" in args else None
+    except ValueError as e:
+        return jsonify({"error": f"bad query: {e}"}), 400
+
+    resolution = args.get("resolution")
+    if not (start or end or since is not None or max_points or resolution):
+        resolution, max_points = "5m", 100
+
+    load_from = start
+    if since is not None and start is None:
+        # Only the store months around `since` (a 1w bucket reaches back up to 6 days).
+        load_from = (chart.EPOCH + timedelta(seconds=since)).date() - timedelta(days=7)
+    cols = load_ohlcv(symbol, load_from, end)
+    if cols is None:
         return jsonify({"error": f"No data for {symbol}"}), 404
-    df = df.tail(100)
+    try:
+        out, resolution = chart.query(cols, start, end, since, max_points, resolution)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    last = chart.iso(cols["ts"][-1:])[0] if len(cols["ts"]) else None
+    if args.get("format") == "f32":
+        payload, base = chart.pack_f32(out)
+        return Response(payload, mimetype="application/octet-stream", headers={
+            "X-Chart-Base": str(base),
+            "X-Chart-Count": str(len(out["ts"])),
+            "X-Chart-Resolution": resolution,
+            "X-Chart-Last": last or "",
+        })
     return jsonify({
-        "timestamps": df["timestamp"].dt.strftime("%Y-%m-%dT%H:%M:%S").tolist(),
-        "open": df["open"].tolist(),
-        "high": df["high"].tolist(),
-        "low": df["low"].tolist(),
-        "close": df["close"].tolist(),
-        "volume": df["volume"].tolist(),
+        "resolution": resolution,
+        "last": last,
+        "timestamps": chart.iso(out["ts"]),
+        "open": out["open"].tolist(),
+        "high": out["high"].tolist(),
+        "low": out["low"].tolist(),
+        "close": out["close"].tolist(),
+        "volume": out["volume"].tolist(),
     })
 
 
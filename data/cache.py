@@ -7,3 +7,7 @@ def cache_path(cache_dir: str, ticker: str, interval: str) -> str:
     name = f"{ticker}_{interval}.csv"
     return str(Path(cache_dir) / name)
 
+
+def quality_path(csv_path: str) -> str:
+    # datasets/cache/INFY.NS_5m.csv -> datasets/cache/INFY.NS_5m.quality.json
+    return str(Path(csv_path).with_suffix(".quality.json"))
@@ -1,4 +1,5 @@
-from datetime import time
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, List, Tuple
 
 MARKET_OPEN = time(9, 15)
 MARKET_CLOSE = time(15, 30)
@@ -7,3 +8,142 @@ MARKET_CLOSE = time(15, 30)
 ENTRY_CUTOFF = time(15, 10)
 FORCE_SQUAREOFF = time(15, 20)
 
+# ---- session slots ----
+# A slot is the 5-minute bucket of the session a timestamp falls in:
+# 09:15-09:19 -> 0, 09:20-09:24 -> 1, ... 15:25-15:29 -> 74. Pre-open times
+# get negative slots and post-close times slots >= SLOTS_PER_SESSION, so
+# "in session" is `0 <= slot < SLOTS_PER_SESSION`. Time-of-day rules become
+# integer comparisons on precomputed slots (see MarketBar.slot).
+SLOT_MINUTES = 5
+
+
+def _minute(t: time) -> int:
+    return t.hour * 60 + t.minute
+
+
+OPEN_MINUTE = _minute(MARKET_OPEN)
+CLOSE_MINUTE = _minute(MARKET_CLOSE)
+SLOTS_PER_SESSION = (CLOSE_MINUTE - OPEN_MINUTE) // SLOT_MINUTES
+
+# minute-of-day -> slot, so the per-bar lookup is a list index.
+SLOT_OF_MINUTE = [(m - OPEN_MINUTE) // SLOT_MINUTES for m in range(24 * 60)]
+
+
+def slots_until(t: time) -> int:
+    """First slot at or after `t`; `bar.slot < slots_until(t)` <=> bar starts before t (on-grid t)."""
+    return -(-(_minute(t) - OPEN_MINUTE) // SLOT_MINUTES)
+
+
+def slots_for_minutes(minutes: int) -> int:
+    return -(-minutes // SLOT_MINUTES)
+
+
+def parse_interval(interval: str) -> int:
+    """Bar interval string ("5m", "15m", "1h") -> minutes."""
+    if interval.endswith("m"):
+        return int(interval[:-1])
+    if interval.endswith("h"):
+        return int(interval[:-1]) * 60
+    raise ValueError(f"Unsupported interval: {interval}")
+
+
+ENTRY_CUTOFF_SLOT = slots_until(ENTRY_CUTOFF)
+FORCE_SQUAREOFF_SLOT = slots_until(FORCE_SQUAREOFF)
+
+
+def slot_of(ts: datetime) -> int:
+    return SLOT_OF_MINUTE[ts.hour * 60 + ts.minute]
+
+
+def session_slot(ts: datetime) -> Tuple[int, int]:
+    """(session day as date ordinal, slot) for one timestamp."""
+    return ts.toordinal(), SLOT_OF_MINUTE[ts.hour * 60 + ts.minute]
+
+
+def slot_time(slot: int) -> time:
+    m = OPEN_MINUTE + slot * SLOT_MINUTES
+    return time(m // 60, m % 60)
+
+
+def slot_datetime(day: int, slot: int) -> datetime:
+    return datetime.combine(date.fromordinal(day), MARKET_OPEN) + timedelta(minutes=slot * SLOT_MINUTES)
+
+
+# ---- trading days ----
+# NSE equity trading holidays (weekday closures). Update yearly from the
+# NSE holiday circular, or extend at runtime with add_holidays().
+NSE_HOLIDAYS = {
+    # 2025
+    date(2025, 2, 26), date(2025, 3, 14), date(2025, 3, 31), date(2025, 4, 10),
+    date(2025, 4, 14), date(2025, 4, 18), date(2025, 5, 1), date(2025, 8, 15),
+    date(2025, 8, 27), date(2025, 10, 2), date(2025, 10, 21), date(2025, 10, 22),
+    date(2025, 11, 5), date(2025, 12, 25),
+    # 2026
+    date(2026, 1, 26), date(2026, 3, 3), date(2026, 3, 26), date(2026, 3, 31),
+    date(2026, 4, 3), date(2026, 4, 14), date(2026, 5, 1), date(2026, 5, 28),
+    date(2026, 6, 26), date(2026, 9, 14), date(2026, 10, 2), date(2026, 10, 20),
+    date(2026, 11, 10), date(2026, 11, 24), date(2026, 12, 25),
+}
+
+
+def add_holidays(days: Iterable[date]):
+    NSE_HOLIDAYS.update(days)
+
+
+def is_trading_day(d: date) -> bool:
+    return d.weekday() < 5 and d not in NSE_HOLIDAYS
+
+
+def trading_days(start: date, end: date) -> List[date]:
+    """Trading days in [start, end]."""
+    out = []
+    d = start
+    while d <= end:
+        if is_trading_day(d):
+            out.append(d)
+        d += timedelta(days=1)
+    return out
+
+
+def next_trading_day(d: date) -> date:
+    d += timedelta(days=1)
+    while not is_trading_day(d):
+        d += timedelta(days=1)
+    return d
+
+
+# ---- vectorized ----
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def session_slots(timestamps):
+    """
+    Vectorized session_slot over a whole array of naive timestamps
+    (datetime64, or anything numpy can convert). Returns (days, slots) as
+    int64 arrays, days being date ordinals as in session_slot().
+    """
+    import numpy as np
+
+    ts = np.asarray(timestamps, dtype="datetime64[m]")
+    day = ts.astype("datetime64[D]")
+    minutes = (ts - day).astype(np.int64)
+    days = day.astype(np.int64) + _EPOCH_ORDINAL
+    slots = (minutes - OPEN_MINUTE) // SLOT_MINUTES
+    return days, slots
+
+
+def slot_gaps(days, slots, step: int = 1):
+    """
+    Missing bars before each bar within the same session (0 for the first
+    bar of a day); `step` is the bar interval in slots (3 for 15m bars).
+    With days/slots from session_slots this is one diff.
+    """
+    import numpy as np
+
+    days = np.asarray(days)
+    slots = np.asarray(slots)
+    gaps = np.zeros(len(slots), dtype=np.int64)
+    if len(slots) > 1:
+        same_day = days[1:] == days[:-1]
+        gaps[1:] = np.where(same_day, np.maximum((slots[1:] - slots[:-1]) // step - 1, 0), 0)
+    return gaps
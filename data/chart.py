@@ -0,0 +1,157 @@
+"""
+Range queries and downsampling of OHLCV columns for the dashboard charts.
+
+Bars are held as numpy columns (ts: int64 epoch seconds, exchange time, as in
+data/store.py). A query picks [start, end] with a binary search and, when the
+range holds more bars than `max_points`, aggregates them into time-aligned
+buckets of the smallest resolution in RESOLUTIONS that fits, so a multi-month
+chart costs the same to send as a one-day chart. Buckets are aligned to fixed
+boundaries, so an incremental query (`since`) re-sends only the bucket the
+last bar fell into plus any newer ones.
+
+Packed encoding (pack_f32): six little-endian float32 arrays of `count`
+values back to back: t, open, high, low, close, volume, where t is minutes
+since `base` (epoch seconds, sent alongside).
+"""
+import csv
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from data.store import COLUMNS, EPOCH
+
+# Label -> bucket width in seconds, finest first.
+RESOLUTIONS = {
+    "5m": 300, "15m": 900, "30m": 1800, "1h": 3600, "2h": 7200,
+    "1d": 86400, "1w": 7 * 86400,
+}
+WEEK_OFFSET = 3 * 86400  # 1970-01-01 was a Thursday; weeks start on Monday
+
+Columns = Dict[str, np.ndarray]
+
+
+def empty_columns() -> Columns:
+    return {k: np.empty(0, dtype=np.int64 if k == "ts" else np.float64) for k in ("ts",) + COLUMNS}
+
+
+def csv_columns(path: str) -> Columns:
+    """Columns of a cache CSV (timestamp,open,high,low,close,volume)."""
+    with open(path, "r", newline="") as f:
+        rows = list(csv.reader(f))[1:]
+    if not rows:
+        return empty_columns()
+    fields = list(zip(*rows))
+    cols = {"ts": np.array(fields[0], dtype="datetime64[s]").astype(np.int64)}
+    for i, k in enumerate(COLUMNS, start=1):
+        cols[k] = np.array(fields[i], dtype=np.float64)
+    return cols
+
+
+def to_seconds(t) -> int:
+    if not isinstance(t, datetime):
+        t = datetime.combine(t, datetime.min.time())
+    return int((t - EPOCH).total_seconds())
+
+
+def _offset(width: int) -> int:
+    return WEEK_OFFSET if width == RESOLUTIONS["1w"] else 0
+
+
+def bucket_start(ts, width: int):
+    off = _offset(width)
+    return (ts + off) // width * width - off
+
+
+def select(cols: Columns, start: Optional[date] = None, end: Optional[date] = None,
+           since: Optional[int] = None) -> Columns:
+    """Bars with start <= day <= end (inclusive dates) and ts >= since (epoch seconds)."""
+    ts = cols["ts"]
+    lo = to_seconds(start) if start else None
+    if since is not None:
+        lo = since if lo is None else max(lo, since)
+    i = int(np.searchsorted(ts, lo, "left")) if lo is not None else 0
+    j = int(np.searchsorted(ts, to_seconds(end + timedelta(days=1)), "left")) if end else len(ts)
+    return {k: v[i:j] for k, v in cols.items()}
+
+
+def aggregate(cols: Columns, width: int) -> Columns:
+    """OHLCV per time bucket of `width` seconds; bucket ts is the bucket's start."""
+    ts = cols["ts"]
+    if len(ts) == 0:
+        return cols
+    buckets = bucket_start(ts, width)
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(ts)] - 1
+    return {
+        "ts": buckets[starts],
+        "open": cols["open"][starts],
+        "high": np.maximum.reduceat(cols["high"], starts),
+        "low": np.minimum.reduceat(cols["low"], starts),
+        "close": cols["close"][ends],
+        "volume": np.add.reduceat(cols["volume"], starts),
+    }
+
+
+def pick_resolution(cols: Columns, max_points: int, base: int = 300) -> str:
+    """Smallest resolution (no finer than `base` seconds) giving at most `max_points` buckets."""
+    ts = cols["ts"]
+    labels = [k for k, w in RESOLUTIONS.items() if w >= base]
+    for label in labels:
+        # Distinct buckets, counted without aggregating.
+        b = bucket_start(ts, RESOLUTIONS[label])
+        if len(b) == 0 or 1 + int(np.count_nonzero(b[1:] != b[:-1])) <= max_points:
+            return label
+    return labels[-1]
+
+
+def query(cols: Columns, start: Optional[date] = None, end: Optional[date] = None,
+          since: Optional[int] = None, max_points: Optional[int] = None,
+          resolution: Optional[str] = None, base: int = 300) -> Tuple[Columns, str]:
+    """
+    Chart series for a request. With `since` (the `last` of a previous
+    response) only the bucket containing it and newer ones are returned, at
+    `resolution` (default: the base interval); the client replaces its last
+    bucket with the first one returned and appends the rest. Otherwise the
+    [start, end] range is aggregated to `resolution`, or to the finest one
+    that fits `max_points`. Raises ValueError for an unknown resolution.
+    """
+    base_label = next((k for k, w in RESOLUTIONS.items() if w == base), None)
+    if resolution is not None and resolution not in RESOLUTIONS:
+        raise ValueError(f"unknown resolution {resolution!r} (one of {', '.join(RESOLUTIONS)})")
+
+    if since is not None:
+        label = resolution or base_label
+        width = RESOLUTIONS[label] if label else base
+        out = select(cols, start, end, int(bucket_start(since, width)))
+    else:
+        out = select(cols, start, end)
+        label = resolution or (pick_resolution(out, max_points, base) if max_points else base_label)
+        width = RESOLUTIONS[label] if label else base
+
+    if width > base:
+        out = aggregate(out, width)
+    if max_points and len(out["ts"]) > max_points:
+        out = {k: v[-max_points:] for k, v in out.items()}
+    return out, label or f"{base // 60}m"
+
+
+def iso(ts: np.ndarray):
+    return np.datetime_as_string(ts.astype("datetime64[s]")).tolist()
+
+
+def pack_f32(cols: Columns) -> Tuple[bytes, int]:
+    """(payload, base): see the module docstring for the layout."""
+    ts = cols["ts"]
+    base = int(ts[0]) if len(ts) else 0
+    t = (ts - base) / 60.0
+    arrays = [t] + [cols[k] for k in COLUMNS]
+    return np.stack(arrays).astype("<f4").tobytes(), base
+
+
+def unpack_f32(payload: bytes, base: int) -> Columns:
+    flat = np.frombuffer(payload, dtype="<f4").reshape(1 + len(COLUMNS), -1)
+    cols = {"ts": base + np.rint(flat[0].astype(np.float64) * 60).astype(np.int64)}
+    for i, k in enumerate(COLUMNS, start=1):
+        cols[k] = flat[i].astype(np.float64)
+    return cols
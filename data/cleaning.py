@@ -0,0 +1,151 @@
+"""
+Columnar bar cleaning, run once when data is fetched or cached so strategy
+hot loops can assume clean input.
+
+Clean existing cache files in place:
+    python -m data.cleaning --cache_dir datasets/cache
+    python -m data.cleaning --file datasets/INFY_5m.csv --source_tz UTC
+"""
+import argparse
+import glob
+import json
+import os
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from data.cache import quality_path
+from data.calendar_nse import (
+    NSE_HOLIDAYS, SLOT_MINUTES, SLOTS_PER_SESSION, parse_interval, session_slots, slot_gaps,
+)
+
+EXCHANGE_TZ = "Asia/Kolkata"
+OHLC = ["open", "high", "low", "close"]
+
+
+def _to_exchange_time(ts: pd.Series, source_tz: Optional[str]) -> pd.Series:
+    ts = pd.to_datetime(ts)
+    if ts.dt.tz is None and source_tz:
+        ts = ts.dt.tz_localize(source_tz)
+    if ts.dt.tz is not None:
+        ts = ts.dt.tz_convert(EXCHANGE_TZ).dt.tz_localize(None)
+    return ts
+
+
+def clean_ohlcv(df: pd.DataFrame, interval_minutes: int = 5, source_tz: Optional[str] = None,
+                drop_zero_volume: bool = True) -> Tuple[pd.DataFrame, Dict]:
+    """
+    Dedupe, session-filter, sanity-check and gap-flag a whole OHLCV frame
+    (columns: timestamp, open, high, low, close, volume) at once.
+    Naive timestamps are taken as exchange time unless `source_tz` is given;
+    tz-aware ones are converted to exchange time.
+    Returns (clean frame, quality report).
+    """
+    rep = {"rows_in": int(len(df))}
+
+    out = df.copy()
+    out["timestamp"] = _to_exchange_time(out["timestamp"], source_tz)
+    for c in OHLC + ["volume"]:
+        out[c] = pd.to_numeric(out[c], errors="coerce")
+    out["volume"] = out["volume"].fillna(0)
+
+    nan_mask = out[OHLC].isna().any(axis=1).to_numpy()
+    rep["nan_ohlc"] = int(nan_mask.sum())
+    out = out[~nan_mask]
+
+    # Later rows win: a re-fetch appends the corrected bar.
+    out = out.sort_values("timestamp", kind="stable")
+    dup_mask = out.duplicated("timestamp", keep="last").to_numpy()
+    rep["duplicates"] = int(dup_mask.sum())
+    out = out[~dup_mask]
+
+    days, slots = session_slots(out["timestamp"].to_numpy())
+    weekday = (days - 1) % 7
+    holidays = np.array([d.toordinal() for d in NSE_HOLIDAYS], dtype=np.int64)
+    trading = (weekday < 5) & ~np.isin(days, holidays)
+    in_session = (slots >= 0) & (slots < SLOTS_PER_SESSION)
+    rep["non_trading_day"] = int((~trading).sum())
+    rep["out_of_session"] = int((trading & ~in_session).sum())
+
+    o, h, l, c = (out[k].to_numpy() for k in OHLC)
+    valid = (
+        (h >= l)
+        & (h >= np.maximum(o, c))
+        & (l <= np.minimum(o, c))
+        & (l > 0)
+    )
+    keep = trading & in_session
+    rep["invalid_ohlc"] = int((keep & ~valid).sum())
+    keep &= valid
+
+    zero_vol = out["volume"].to_numpy() <= 0
+    rep["zero_volume"] = int((keep & zero_vol).sum())
+    if drop_zero_volume:
+        keep &= ~zero_vol
+
+    out = out[keep]
+    days, slots = days[keep], slots[keep]
+
+    step = max(interval_minutes // SLOT_MINUTES, 1)
+    gaps = slot_gaps(days, slots, step)
+    gap_idx = np.flatnonzero(gaps)
+    rep["missing_bars"] = int(gaps.sum())
+    rep["gap_count"] = int(len(gap_idx))
+    rep["gaps"] = [
+        {"before": out["timestamp"].iloc[i].isoformat(), "missing": int(gaps[i])}
+        for i in gap_idx[:50]
+    ]
+
+    rep["rows_out"] = int(len(out))
+    rep["sessions"] = int(len(np.unique(days)))
+    rep["first"] = out["timestamp"].iloc[0].isoformat() if len(out) else None
+    rep["last"] = out["timestamp"].iloc[-1].isoformat() if len(out) else None
+
+    out = out.assign(timestamp=out["timestamp"].dt.strftime("%Y-%m-%dT%H:%M:%S"))
+    return out[["timestamp"] + OHLC + ["volume"]].reset_index(drop=True), rep
+
+
+def write_quality_report(report: Dict, csv_path: str, symbol: str) -> str:
+    path = quality_path(csv_path)
+    with open(path, "w") as f:
+        json.dump(dict(report, symbol=symbol), f, indent=2)
+    return path
+
+
+def clean_file(path: str, symbol: Optional[str] = None, interval_minutes: int = 5,
+               source_tz: Optional[str] = None) -> Dict:
+    symbol = symbol or os.path.basename(path).split("_")[0]
+    df = pd.read_csv(path)
+    clean, rep = clean_ohlcv(df, interval_minutes, source_tz)
+    clean.to_csv(path, index=False)
+    write_quality_report(rep, path, symbol)
+    return rep
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cache_dir", default=None, help="clean every <ticker>_<interval>.csv here")
+    ap.add_argument("--file", default=None, help="clean a single CSV")
+    ap.add_argument("--interval", default="5m")
+    ap.add_argument("--source_tz", default=None, help="tz of naive timestamps, e.g. UTC")
+    args = ap.parse_args()
+
+    if not args.cache_dir and not args.file:
+        ap.error("Must provide --cache_dir or --file")
+
+    files = [args.file] if args.file else sorted(
+        glob.glob(os.path.join(args.cache_dir, f"*_{args.interval}.csv"))
+    )
+    minutes = parse_interval(args.interval)
+    for path in files:
+        rep = clean_file(path, interval_minutes=minutes, source_tz=args.source_tz)
+        print(
+            f"cleaned: {path}  rows {rep['rows_in']} -> {rep['rows_out']}  "
+            f"dup={rep['duplicates']} session={rep['out_of_session']} bad={rep['invalid_ohlc']} "
+            f"zero_vol={rep['zero_volume']} missing={rep['missing_bars']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 import csv
-from datetime import datetime
-from typing import List
+from bisect import bisect_left
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional
 from core.types import MarketBar
 
 
@@ -24,3 +25,13 @@ def load_csv(path: str, symbol: str) -> List[MarketBar]:
             )
     return bars
 
+
+def clip_range(bars: List[MarketBar], start: Optional[date] = None,
+               end: Optional[date] = None) -> List[MarketBar]:
+    """Bars with start <= day <= end (inclusive dates, None = unbounded); `bars` sorted by time."""
+    if start is None and end is None:
+        return bars
+    ts = [b.timestamp for b in bars]
+    i = bisect_left(ts, datetime.combine(start, time.min)) if start else 0
+    j = bisect_left(ts, datetime.combine(end + timedelta(days=1), time.min)) if end else len(bars)
+    return bars[i:j]
@@ -0,0 +1,79 @@
+"""
+Bounded, ordered prefetch: load the next few symbols on background threads
+while the caller works on the current one.
+
+    pre = Prefetcher(tickers, lambda t: load_symbol(t, cfg), depth=4, threads=2)
+    for item in pre:          # in input order
+        item.value / item.error, item.wait, item.ready
+
+At most `depth` loads are in flight or waiting to be consumed, besides the
+item the caller is working on, so at most depth + 1 symbols are in memory
+however far compute falls behind. File reads and network
+fetches (a missing cache file) release the GIL, so they overlap with
+strategy compute; pure-Python CSV parsing mostly doesn't, so the gain is
+largest on a cold cache or slow disk.
+
+Instrumentation per item: `seconds` the load took on its thread, `wait` the
+consumer spent blocked on it (a stall: the pipeline ran dry), and `ready`
+how many prefetched items were already done when it was taken (queue depth).
+"""
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+
+@dataclass
+class Prefetched:
+    key: Any
+    value: Any = None
+    error: Optional[BaseException] = None
+    seconds: float = 0.0  # load time on the background thread
+    wait: float = 0.0     # consumer blocked waiting for it
+    ready: int = 0        # prefetched items already loaded when it was taken
+
+
+def _timed(load: Callable, key):
+    t0 = time.perf_counter()
+    try:
+        return load(key), None, time.perf_counter() - t0
+    except Exception as e:
+        return None, e, time.perf_counter() - t0
+
+
+class Prefetcher:
+    def __init__(self, keys: Iterable, load: Callable, depth: int = 4, threads: int = 2):
+        self.keys = keys
+        self.load = load
+        self.depth = max(1, depth)
+        self.threads = max(1, threads)
+
+    def __iter__(self) -> Iterator[Prefetched]:
+        keys = iter(self.keys)
+        pending = deque()  # (key, future), in input order
+        pool = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="prefetch")
+        try:
+            def fill():
+                while len(pending) < self.depth:
+                    key = next(keys, _END)
+                    if key is _END:
+                        return
+                    pending.append((key, pool.submit(_timed, self.load, key)))
+
+            fill()
+            while pending:
+                key, fut = pending.popleft()
+                ready = sum(1 for _, f in pending if f.done()) + fut.done()
+                t0 = time.perf_counter()
+                value, error, seconds = fut.result()
+                wait = time.perf_counter() - t0
+                # Refill before handing over, so loads run during the caller's
+                # compute: depth pending plus the item handed over.
+                fill()
+                yield Prefetched(key, value, error, seconds, wait, ready)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+_END = object()
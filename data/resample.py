@@ -0,0 +1,170 @@
+import os
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from core.checkpoint import bars_to_rows, rows_to_bars
+from core.types import MarketBar
+from data.cache import cache_path
+from data.calendar_nse import SLOT_MINUTES, SLOTS_PER_SESSION, parse_interval, slot_datetime
+from data.ingestion import load_csv
+
+BASE_INTERVAL = "5m"
+
+
+def slots_per_bar(timeframe: str) -> int:
+    minutes = parse_interval(timeframe)
+    if minutes % SLOT_MINUTES:
+        raise ValueError(f"{timeframe} is not a multiple of {BASE_INTERVAL}")
+    return minutes // SLOT_MINUTES
+
+
+class BarAggregator:
+    """
+    Incrementally folds 5m bars into one higher timeframe, O(1) per bar.
+
+    Buckets are aligned to the session (09:15, 09:30, ... for 15m; 09:15,
+    10:15, ... for 1h), not clock hours, and never span two sessions; the
+    last bucket of a day may be short (15:15-15:30 for 1h). A bucket is
+    emitted as soon as its last slot arrives, or when a later bar shows it
+    is over (gaps, missing closing bars).
+    """
+
+    def __init__(self, symbol: str, timeframe: str):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.k = slots_per_bar(timeframe)
+        self.bars: List[MarketBar] = []
+        self._key: Optional[Tuple[int, int]] = None
+        self._o = self._h = self._l = self._c = self._v = 0.0
+        self.last_ts = None
+
+    def update(self, bar: MarketBar) -> Optional[MarketBar]:
+        """Fold one base bar in; returns the higher-timeframe bar it completed, if any."""
+        self.last_ts = bar.timestamp
+        bucket = bar.slot // self.k
+        key = (bar.day, bucket)
+        closed = None
+
+        if key != self._key:
+            if self._key is not None:
+                closed = self._close()
+            self._key = key
+            self._o, self._h, self._l, self._c, self._v = bar.open, bar.high, bar.low, bar.close, bar.volume
+        else:
+            if bar.high > self._h:
+                self._h = bar.high
+            if bar.low < self._l:
+                self._l = bar.low
+            self._c = bar.close
+            self._v += bar.volume
+
+        last_slot = min((bucket + 1) * self.k, SLOTS_PER_SESSION) - 1
+        if bar.slot >= last_slot:
+            closed = self._close()
+        return closed
+
+    def get_state(self, keep: int) -> dict:
+        """Forming bucket plus the last `keep` completed bars, for checkpoints."""
+        return {
+            "key": list(self._key) if self._key is not None else None,
+            "ohlcv": [self._o, self._h, self._l, self._c, self._v],
+            "bars": bars_to_rows(self.bars[-keep:]),
+            "last_ts": self.last_ts.isoformat() if self.last_ts is not None else None,
+        }
+
+    def set_state(self, state: dict):
+        self._key = tuple(state["key"]) if state["key"] is not None else None
+        self._o, self._h, self._l, self._c, self._v = state["ohlcv"]
+        # In place: strategies hold a reference to this list via htf.
+        self.bars[:] = rows_to_bars(self.symbol, state["bars"])
+        self.last_ts = datetime.fromisoformat(state["last_ts"]) if state["last_ts"] else None
+
+    def partial(self) -> Optional[MarketBar]:
+        """The still-forming bucket, or None."""
+        if self._key is None:
+            return None
+        return self._make()
+
+    def _make(self) -> MarketBar:
+        day, bucket = self._key
+        start = bucket * self.k
+        return MarketBar(
+            self.symbol, slot_datetime(day, start),
+            self._o, self._h, self._l, self._c, self._v,
+            day=day, slot=start,
+        )
+
+    def _close(self) -> MarketBar:
+        b = self._make()
+        self.bars.append(b)
+        self._key = None
+        return b
+
+
+def resample(bars: List[MarketBar], timeframe: str) -> List[MarketBar]:
+    """Completed higher-timeframe bars for a whole 5m series (a still-forming last bucket is left out)."""
+    if not bars:
+        return []
+    agg = BarAggregator(bars[0].symbol, timeframe)
+    for b in bars:
+        agg.update(b)
+    return agg.bars
+
+
+class Resampler:
+    """
+    Memoized higher-timeframe views of cached 5m data, per (symbol, timeframe),
+    for the `max_entries` most recently used pairs.
+    A later call with the same series plus new bars only folds in the new
+    ones; a changed history (the previously last bar no longer matches, in
+    timestamp or values) rebuilds from scratch. `load` also remembers the
+    cache file's mtime and size, so an unchanged file isn't parsed again at
+    all; a rewritten one is folded from scratch, since a re-fetch revises
+    bars already folded (at least the last, partial one).
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        # (symbol, timeframe) -> (aggregator, base bars folded in, last of them, file stamp), oldest first
+        self._aggs: "OrderedDict[Tuple[str, str], Tuple[BarAggregator, int, Optional[MarketBar], Optional[tuple]]]" = (
+            OrderedDict())
+
+    def get(self, symbol: str, timeframe: str, bars: List[MarketBar],
+            stamp: Optional[tuple] = None) -> List[MarketBar]:
+        key = (symbol, timeframe)
+        agg, n, last, _ = self._aggs.pop(key, (None, 0, None, None))
+        if agg is None or n > len(bars) or (n and bars[n - 1] != last):
+            agg, n = BarAggregator(symbol, timeframe), 0
+
+        for b in bars[n:]:
+            agg.update(b)
+        self._aggs[key] = (agg, len(bars), bars[-1] if bars else None, stamp)
+        while len(self._aggs) > self.max_entries:
+            self._aggs.popitem(last=False)
+        return list(agg.bars)
+
+    def load(self, path: str, symbol: str, timeframe: str) -> List[MarketBar]:
+        """Resampled bars of a 5m CSV; parsed only when its mtime or size changed."""
+        st = os.stat(path)
+        stamp = (path, st.st_mtime_ns, st.st_size)
+        key = (symbol, timeframe)
+        hit = self._aggs.pop(key, None)
+        if hit is not None and hit[3] == stamp:
+            self._aggs[key] = hit
+            return list(hit[0].bars)
+        return self.get(symbol, timeframe, load_csv(path, symbol), stamp)
+
+    def clear(self):
+        self._aggs.clear()
+
+
+_shared = Resampler()
+
+
+def load_resampled(cache_dir: str, ticker: str, symbol: str, timeframe: str) -> List[MarketBar]:
+    """Higher-timeframe bars built from the 5m cache file, no separate fetch."""
+    path = cache_path(cache_dir, ticker, BASE_INTERVAL)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"no {BASE_INTERVAL} cache to resample: {path}")
+    return _shared.load(path, symbol, timeframe)
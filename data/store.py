@@ -0,0 +1,164 @@
+"""
+Historical bar store partitioned by ticker/interval and month, one compressed
+columnar .npz file per partition:
+
+    <store_dir>/INFY.NS_5m/2026-01.npz   (ts: int64 epoch seconds, exchange time;
+                                          open/high/low/close/volume: float64)
+
+A date-range load only opens the months overlapping the range and slices each
+with a binary search, so reading one week costs the same with one month or
+five years of history.
+
+Ingest the CSV cache (merges into existing partitions, later rows win):
+    python -m data.store --cache_dir datasets/cache --store_dir datasets/store
+    python -m data.store --file datasets/INFY_5m.csv --ticker INFY.NS --store_dir datasets/store
+"""
+import argparse
+import glob
+import os
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from core.types import MarketBar
+from data.ingestion import load_csv
+
+COLUMNS = ("open", "high", "low", "close", "volume")
+EPOCH = datetime(1970, 1, 1)
+
+
+def series_dir(store_dir: str, ticker: str, interval: str) -> str:
+    return str(Path(store_dir) / f"{ticker}_{interval}")
+
+
+def _month_key(d) -> str:
+    return f"{d.year:04d}-{d.month:02d}"
+
+
+def _month_bounds(key: str):
+    y, m = int(key[:4]), int(key[5:7])
+    first = date(y, m, 1)
+    nxt = date(y + (m == 12), m % 12 + 1, 1)
+    return first, nxt - timedelta(days=1)
+
+
+def _to_seconds(d) -> int:
+    if not isinstance(d, datetime):
+        d = datetime.combine(d, datetime.min.time())
+    return int((d - EPOCH).total_seconds())
+
+
+def partitions(store_dir: str, ticker: str, interval: str,
+               start: Optional[date] = None, end: Optional[date] = None) -> List[str]:
+    """Partition files overlapping [start, end] (inclusive dates), oldest first."""
+    d = series_dir(store_dir, ticker, interval)
+    if not os.path.isdir(d):
+        return []
+    out = []
+    for name in sorted(os.listdir(d)):
+        if not name.endswith(".npz"):
+            continue
+        first, last = _month_bounds(name[:-4])
+        if (start is None or last >= start) and (end is None or first <= end):
+            out.append(os.path.join(d, name))
+    return out
+
+
+def _read(path: str) -> Dict[str, np.ndarray]:
+    with np.load(path) as z:
+        return {k: z[k] for k in ("ts",) + COLUMNS}
+
+
+def load_columns(store_dir: str, ticker: str, interval: str = "5m",
+                 start: Optional[date] = None, end: Optional[date] = None) -> Dict[str, np.ndarray]:
+    """Column arrays for bars with start <= day <= end (None = unbounded)."""
+    lo = _to_seconds(start) if start else None
+    hi = _to_seconds(end + timedelta(days=1)) if end else None
+    parts = []
+    for path in partitions(store_dir, ticker, interval, start, end):
+        cols = _read(path)
+        ts = cols["ts"]
+        i = int(np.searchsorted(ts, lo, "left")) if lo is not None else 0
+        j = int(np.searchsorted(ts, hi, "left")) if hi is not None else len(ts)
+        if j > i:
+            parts.append({k: v[i:j] for k, v in cols.items()})
+
+    if not parts:
+        return {k: np.empty(0, dtype=np.int64 if k == "ts" else np.float64) for k in ("ts",) + COLUMNS}
+    return {k: np.concatenate([p[k] for p in parts]) for k in parts[0]}
+
+
+def load_range(store_dir: str, ticker: str, symbol: str, interval: str = "5m",
+               start: Optional[date] = None, end: Optional[date] = None) -> List[MarketBar]:
+    cols = load_columns(store_dir, ticker, interval, start, end)
+    times = cols["ts"].astype("datetime64[s]").tolist()
+    o, h, l, c, v = (cols[k].tolist() for k in COLUMNS)
+    return [MarketBar(symbol, times[i], o[i], h[i], l[i], c[i], v[i]) for i in range(len(times))]
+
+
+def write_bars(store_dir: str, ticker: str, interval: str, bars: List[MarketBar]) -> int:
+    """Merge `bars` into their month partitions; returns the number of partitions written."""
+    by_month: Dict[str, List[MarketBar]] = {}
+    for b in bars:
+        by_month.setdefault(_month_key(b.timestamp), []).append(b)
+
+    d = series_dir(store_dir, ticker, interval)
+    Path(d).mkdir(parents=True, exist_ok=True)
+    for key, chunk in by_month.items():
+        new = {
+            "ts": np.array([_to_seconds(b.timestamp) for b in chunk], dtype=np.int64),
+            **{k: np.array([getattr(b, k) for b in chunk], dtype=np.float64) for k in COLUMNS},
+        }
+        path = os.path.join(d, f"{key}.npz")
+        if os.path.exists(path):
+            old = _read(path)
+            new = {k: np.concatenate([old[k], new[k]]) for k in new}
+
+        # Sort by time; on duplicate timestamps the later (newer) row wins.
+        order = np.argsort(new["ts"], kind="stable")
+        ts = new["ts"][order]
+        keep = np.ones(len(ts), dtype=bool)
+        keep[:-1] = ts[1:] != ts[:-1]
+        idx = order[keep]
+
+        tmp = path + ".tmp.npz"
+        np.savez_compressed(tmp, **{k: v[idx] for k, v in new.items()})
+        os.replace(tmp, path)
+    return len(by_month)
+
+
+def ingest_csv(path: str, store_dir: str, ticker: str, interval: str = "5m") -> int:
+    return write_bars(store_dir, ticker, interval, load_csv(path, ticker))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--store_dir", default="datasets/store")
+    ap.add_argument("--cache_dir", default=None, help="ingest every <ticker>_<interval>.csv here")
+    ap.add_argument("--file", default=None, help="ingest a single CSV (needs --ticker)")
+    ap.add_argument("--ticker", default=None)
+    ap.add_argument("--interval", default="5m")
+    args = ap.parse_args()
+
+    if not args.cache_dir and not args.file:
+        ap.error("Must provide --cache_dir or --file")
+    if args.file and not args.ticker:
+        ap.error("--file requires --ticker")
+
+    if args.file:
+        jobs = [(args.file, args.ticker)]
+    else:
+        suffix = f"_{args.interval}.csv"
+        jobs = [
+            (p, os.path.basename(p)[:-len(suffix)])
+            for p in sorted(glob.glob(os.path.join(args.cache_dir, f"*{suffix}")))
+        ]
+    for path, ticker in jobs:
+        n = ingest_csv(path, args.store_dir, ticker, args.interval)
+        print(f"ingested: {path} -> {series_dir(args.store_dir, ticker, args.interval)} ({n} partitions)")
+
+
+if __name__ == "__main__":
+    main()
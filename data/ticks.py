@@ -0,0 +1,139 @@
+"""
+Streaming trade ticks -> session-aligned OHLCV bars.
+
+    agg = TickAggregator("5m", on_bar=lambda b: engines[b.symbol].step(b))
+    for symbol, ts, price, size in read_ticks("ticks.csv"):
+        agg.on_tick(symbol, ts, price, size)
+    agg.flush()
+
+Recorded tick files are CSV: timestamp,symbol,price,size (ISO timestamps in
+exchange time, sorted by time).
+"""
+import csv
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from core.types import MarketBar
+from data.calendar_nse import CLOSE_MINUTE, MARKET_OPEN, OPEN_MINUTE, parse_interval
+
+SESSION_MINUTES = CLOSE_MINUTE - OPEN_MINUTE
+
+# Per-symbol forming bar: [day, bucket, open, high, low, close, volume]
+_DAY, _BUCKET, _O, _H, _L, _C, _V = range(7)
+
+
+class TickAggregator:
+    """
+    Folds trade ticks into bars of one interval for any number of symbols,
+    O(1) per tick (a dict lookup and a few comparisons).
+
+    Buckets are aligned to the session open like data/resample.py (09:15,
+    09:20, ... for 5m; the last bucket of a day may be short). A bar is
+    emitted through `on_bar` when a tick for a later bucket arrives or when
+    `advance(now)` is called with a time past the bucket's end; call
+    `advance` from a clock so quiet symbols still close on time. With
+    `on_partial`, the forming bar is also pushed after every tick.
+    Ticks outside the session are dropped; ticks older than the symbol's
+    forming bucket, or for a bucket already emitted (e.g. closed by
+    `advance`), are counted as late and dropped, so a bar is never emitted
+    twice or out of order.
+    """
+
+    def __init__(self, interval: str = "5m",
+                 on_bar: Optional[Callable[[MarketBar], None]] = None,
+                 on_partial: Optional[Callable[[MarketBar], None]] = None):
+        self.interval = interval
+        self.minutes = parse_interval(interval)
+        self.on_bar = on_bar
+        self.on_partial = on_partial
+        self._open: Dict[str, list] = {}
+        self._last: Dict[str, Tuple[int, int]] = {}  # symbol -> (day, bucket) of its last emitted bar
+        self.ticks = 0
+        self.bars = 0
+        self.dropped = 0
+        self.late = 0
+
+    def on_tick(self, symbol: str, ts: datetime, price: float, size: float) -> Optional[MarketBar]:
+        """Fold one trade in; returns the bar it closed for `symbol`, if any."""
+        m = ts.hour * 60 + ts.minute - OPEN_MINUTE
+        if m < 0 or m >= SESSION_MINUTES:
+            self.dropped += 1
+            return None
+        self.ticks += 1
+        day = ts.toordinal()
+        bucket = m // self.minutes
+
+        st = self._open.get(symbol)
+        closed = None
+        if st is not None and st[_BUCKET] == bucket and st[_DAY] == day:
+            if price > st[_H]:
+                st[_H] = price
+            elif price < st[_L]:
+                st[_L] = price
+            st[_C] = price
+            st[_V] += size
+        else:
+            key = (day, bucket)
+            last = self._last.get(symbol)
+            if (st is not None and key < (st[_DAY], st[_BUCKET])) or (last is not None and key <= last):
+                self.ticks -= 1
+                self.late += 1
+                return None
+            if st is not None:
+                closed = self._emit(symbol, st)
+            st = self._open[symbol] = [day, bucket, price, price, price, price, size]
+
+        if self.on_partial is not None:
+            self.on_partial(self._bar(symbol, st))
+        return closed
+
+    def advance(self, now: datetime) -> List[MarketBar]:
+        """Close every forming bar whose bucket ended at or before `now`."""
+        day = now.toordinal()
+        m = now.hour * 60 + now.minute - OPEN_MINUTE
+        done = [
+            sym for sym, st in self._open.items()
+            if st[_DAY] < day or m >= min((st[_BUCKET] + 1) * self.minutes, SESSION_MINUTES)
+        ]
+        return [self._emit(sym, self._open[sym]) for sym in done]
+
+    def flush(self) -> List[MarketBar]:
+        """Close all forming bars (end of feed / end of session)."""
+        return [self._emit(sym, st) for sym, st in list(self._open.items())]
+
+    def partial(self, symbol: str) -> Optional[MarketBar]:
+        st = self._open.get(symbol)
+        return self._bar(symbol, st) if st is not None else None
+
+    def _bar(self, symbol: str, st: list) -> MarketBar:
+        ts = datetime.combine(date.fromordinal(st[_DAY]), MARKET_OPEN) + timedelta(
+            minutes=st[_BUCKET] * self.minutes
+        )
+        return MarketBar(symbol, ts, st[_O], st[_H], st[_L], st[_C], st[_V])
+
+    def _emit(self, symbol: str, st: list) -> MarketBar:
+        del self._open[symbol]
+        self._last[symbol] = (st[_DAY], st[_BUCKET])
+        bar = self._bar(symbol, st)
+        self.bars += 1
+        if self.on_bar is not None:
+            self.on_bar(bar)
+        return bar
+
+
+def read_ticks(path: str) -> Iterator[Tuple[str, datetime, float, float]]:
+    parse = datetime.fromisoformat
+    with open(path, "r", newline="") as f:
+        r = csv.reader(f)
+        next(r, None)  # header
+        for ts, symbol, price, size in r:
+            yield symbol, parse(ts), float(price), float(size)
+
+
+def write_ticks(ticks: Iterable[Tuple[str, datetime, float, float]], path: str) -> str:
+    with open(path, "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["timestamp", "symbol", "price", "size"])
+        for symbol, ts, price, size in ticks:
+            w.writerow([ts.isoformat(), symbol, price, size])
+    return path
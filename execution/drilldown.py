@@ -0,0 +1,133 @@
+"""
+Intrabar drill-down for backtest exits.
+
+A 5m bar whose range touches both the stop and the target can't say which
+came first. Instead of running the whole backtest on 1m data, the Engine asks
+a DrillDown only for those bars: it loads the finer bars of that session
+(from the month-partitioned store or the CSV cache) on first use, keeps
+recently used sessions in an LRU, and walks the finer bars in order. A finer
+bar that still touches both, or a window with no finer data, resolves to the
+stop (conservative).
+"""
+import os
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from core.types import MarketBar, Side
+from data.cache import cache_path
+from data.calendar_nse import parse_interval
+
+STOP = "stop"
+TARGET = "target"
+
+
+def _line_from(f, pos: int, data_start: int) -> Tuple[int, bytes]:
+    """(offset, line) of the first non-blank line starting at or after byte `pos`; b"" at EOF."""
+    if pos > data_start:
+        f.seek(pos - 1)
+        f.readline()  # rest of the line holding pos - 1 (just its newline if a line starts at pos)
+    else:
+        f.seek(data_start)
+    while True:
+        off = f.tell()
+        line = f.readline()
+        if not line or line.strip():
+            return off, line
+
+
+def _csv_window(path: str, symbol: str, start: datetime, end: datetime) -> List[MarketBar]:
+    """
+    Rows with start <= timestamp < end. Rows are sorted by time, so the first
+    one is found by bisecting on byte offsets (comparing ISO strings) and only
+    the window itself is read and parsed. Blank lines are skipped.
+    """
+    lo, hi = start.isoformat().encode(), end.isoformat()
+    out = []
+    with open(path, "rb") as f:
+        f.readline()  # header: timestamp,open,high,low,close,volume
+        data_start = f.tell()
+        # Invariant: every row starting before `a` is < lo; the first row at or after `b` is >= lo (or EOF).
+        a, b = data_start, os.fstat(f.fileno()).st_size
+        while a < b:
+            mid = (a + b) // 2
+            off, line = _line_from(f, mid, data_start)
+            if line and line[:line.find(b",")] < lo:
+                a = off + 1
+            else:
+                b = mid
+        _, line = _line_from(f, a, data_start)
+        while line:
+            if line.strip():
+                ts, o, h, l, c, v = line.decode().rstrip().split(",")[:6]
+                if ts >= hi:
+                    break
+                out.append(MarketBar(symbol, datetime.fromisoformat(ts), float(o), float(h), float(l), float(c),
+                                     float(v)))
+            line = f.readline()
+    return out
+
+
+class DrillDown:
+    def __init__(self, ticker: str, symbol: str, cache_dir: str = "datasets/cache",
+                 store_dir: Optional[str] = None, interval: str = "1m", bar_minutes: int = 5,
+                 max_windows: int = 32):
+        self.ticker = ticker
+        self.symbol = symbol
+        self.cache_dir = cache_dir
+        self.store_dir = store_dir
+        self.interval = interval
+        self.bar_span = timedelta(minutes=bar_minutes)
+        self.max_windows = max_windows
+        self._windows: "OrderedDict[int, List[MarketBar]]" = OrderedDict()  # day ordinal -> finer bars
+        if parse_interval(interval) >= bar_minutes:
+            raise ValueError(f"drill-down interval {interval} is not finer than {bar_minutes}m")
+
+        self.resolved = 0  # ambiguous bars decided from finer data
+        self.missing = 0   # ambiguous bars with no finer data (fell back to the stop)
+        self.loads = 0
+        self.hits = 0
+
+    def stats(self) -> dict:
+        return {"resolved": self.resolved, "missing": self.missing, "loads": self.loads, "hits": self.hits}
+
+    def _load(self, day: int) -> List[MarketBar]:
+        start = datetime.fromordinal(day)
+        if self.store_dir:
+            from data.store import load_range
+            d = start.date()
+            return load_range(self.store_dir, self.ticker, self.symbol, self.interval, d, d)
+        path = cache_path(self.cache_dir, self.ticker, self.interval)
+        if not os.path.exists(path):
+            return []
+        return _csv_window(path, self.symbol, start, start + timedelta(days=1))
+
+    def window(self, day: int) -> List[MarketBar]:
+        bars = self._windows.get(day)
+        if bars is not None:
+            self.hits += 1
+            self._windows.move_to_end(day)
+            return bars
+        self.loads += 1
+        bars = self._windows[day] = self._load(day)
+        if len(self._windows) > self.max_windows:
+            self._windows.popitem(last=False)
+        return bars
+
+    def resolve(self, bar: MarketBar, side: Side, stop: float, target: float) -> str:
+        """STOP or TARGET, whichever the finer bars inside `bar` reach first."""
+        start, end = bar.timestamp, bar.timestamp + self.bar_span
+        for b in self.window(bar.day):
+            if b.timestamp < start:
+                continue
+            if b.timestamp >= end:
+                break
+            if side == Side.BUY:
+                hit_stop, hit_target = b.low <= stop, b.high >= target
+            else:
+                hit_stop, hit_target = b.high >= stop, b.low <= target
+            if hit_stop or hit_target:
+                self.resolved += 1
+                return STOP if hit_stop else TARGET
+        self.missing += 1
+        return STOP
@@ -1,41 +1,342 @@
 import argparse
 import os
-from dataclasses import replace
+import time
+from contextlib import contextmanager, nullcontext
 from datetime import datetime
 
 from core.types import RunMode
-from core.engine import Engine
-from data.ingestion import load_csv
+from core.checkpoint import checkpoint_path
+from core.memory import MemoryBudget, MemoryBudgetExceeded, MemoryTracker
+from core.profiling import Profiler
+from core.scanner import ScanConfig, run_bars, scan_universe
+from data.ingestion import clip_range, load_csv
 from data.universe import load_universe
-from data.cache import cache_path
-from strategies.mean_reversion import MeanReversionStrategy
-from strategies.orb import ORBStrategy
-from strategies.vwap import VWAPStrategy
-from reporting.performance import generate_html_report
-from reporting.watchlist import save_watchlist, save_watchlist_table
+from strategies import available, create_strategy
+from reporting.watchlist import WatchlistBuilder, compile_filter, save_watchlist, save_watchlist_table
+
+# NOTE: keep heavy dependencies (pandas/plotly via reporting.performance,
+# yfinance via scripts.fetch_yahoo_5m) out of module scope; they are imported
+# by the code paths that need them. tests/test_startup.py enforces this.
 
 
 def get_strategy(name, symbol, lookback, threshold, orb_minutes=15):
-    if name == "mr":
-        return MeanReversionStrategy(symbol, lookback=lookback, threshold=threshold)
-    elif name == "orb":
-        return ORBStrategy(symbol, orb_minutes=orb_minutes)
-    elif name == "vwap":
-        return VWAPStrategy(symbol)
-    else:
-        raise ValueError(f"Unknown strategy: {name}")
+    return create_strategy(name, symbol, lookback=lookback, threshold=threshold, orb_minutes=orb_minutes)
+
+
+def run_one_csv(mode, csv_path, symbol, capital, strategy_name, profiler=None, checkpoint=None, bars=None,
+                drilldown=None, gating=None, target_exits=False, **kwargs):
+    if bars is None:
+        bars = load_csv(csv_path, symbol)
+    params = {k: kwargs[k] for k in ("lookback", "threshold", "orb_minutes", "vwap_stop_mult", "vwap_target_mult")
+              if k in kwargs}
+    eng = run_bars(bars, symbol, strategy_name, mode, capital, params, profiler, checkpoint, drilldown=drilldown,
+                   gating=gating, target_exits=target_exits)
+    return eng, eng.summary()
+
+
+@contextmanager
+def stage(name, timings, mem=None):
+    """Time one pipeline stage and write it to stdout (the cron log)."""
+    t0 = time.perf_counter()
+    try:
+        with mem_stage(mem, name):
+            yield
+    finally:
+        timings[name] = time.perf_counter() - t0
+        print(f"[stage] {name}: {timings[name]:.2f}s", flush=True)
+
+
+def make_watchlist(args, t_start, t_end, prefiltered=False):
+    """
+    Streaming top-K watchlist (reporting/watchlist.py). The CLI filters are
+    compiled in unless the engines already applied them (`prefiltered`,
+    scans via ScanConfig.filters).
+    """
+    keep = None
+    if not prefiltered:
+        keep = compile_filter(args.min_avg_volume, args.min_avg_value, args.min_atr, t_start, t_end)
+    return WatchlistBuilder(args.top_k, args.top_k_per_strategy, keep)
+
+
+def draft_cap(args):
+    """
+    Per-engine signal cap for a top-K watchlist scan: the smaller K, or 0.
+    Engines may only drop signals early when no later watchlist filter can
+    remove one of the survivors, which holds for scans since the engines
+    apply the filters themselves (make_watchlist's `prefiltered`).
+    """
+    caps = [k for k in (args.top_k, args.top_k_per_strategy) if k]
+    if not caps:
+        return 0
+    return min(caps)
+
+
+def collect_signals(signals_by_strategy, builder):
+    for strat_name, signals in signals_by_strategy.items():
+        builder.extend(strat_name, signals)
+
+
+def write_watchlist(builder):
+    # Ranked by (-confidence, -avg_volume, -atr, symbol), see core.types.rank_key
+    ranked = builder.result()
+
+    path_json = save_watchlist(ranked)
+    path_txt = save_watchlist_table(ranked)
+    print(f"\nSaved watchlist JSON: {path_json}")
+    print(f"Saved watchlist table: {path_txt}")
+    print(f"Total signals: {len(ranked)} (passed filters: {builder.kept} of {builder.seen})")
+
+
+def write_profile(profiler, path):
+    if path is None:
+        ts = datetime.now().strftime("%Y-%m-%d_%H%M%S")
+        path = os.path.join("reports", f"profile_{ts}.json")
+    print("\n==== PROFILE ====")
+    print(profiler.table())
+    profiler.save(path)
+    print(f"\nSaved profile: {path}")
+
+
+def make_memory(args, n_symbols):
+    """(MemoryTracker or None, MemoryBudget or None) for --mem_report / --mem_budget."""
+    mem = MemoryTracker(args.mem_sample_every).start() if args.mem_report else None
+    budget = MemoryBudget(args.mem_budget, n_symbols) if args.mem_budget else None
+    return mem, budget
+
+
+def mem_stage(mem, name):
+    return mem.track(name) if mem is not None else nullcontext()
+
+
+def account_memory(mem, budget, scan):
+    if mem is not None:
+        if scan.memory:
+            mem.merge(scan.memory)
+        mem.symbol_done(scan.symbol)
+    if budget is not None:
+        try:
+            budget.check(scan.ticker)
+        except MemoryBudgetExceeded as e:
+            if mem is not None:
+                write_memory_report(mem, None)
+            raise SystemExit(f"ERROR: {e}. Bound the run with --top_k, --start/--end or a smaller universe.")
+
+
+def write_memory_report(mem, path):
+    if path is None:
+        ts = datetime.now().strftime("%Y-%m-%d_%H%M%S")
+        path = os.path.join("reports", f"memory_{ts}.json")
+    print("\n==== MEMORY ====")
+    print(mem.table())
+    mem.save(path)
+    print(f"\nSaved memory report: {path}")
+
+
+def add_drilldown_stats(total, stats):
+    for k, v in (stats or {}).items():
+        total[k] = total.get(k, 0) + v
+
+
+def print_drilldown_stats(total):
+    if total:
+        print(f"Drill-down: {total['resolved']} ambiguous bars resolved, {total['missing']} without finer data "
+              f"(window loads {total['loads']}, cache hits {total['hits']})")
+
+
+def add_cache_stats(total, scan):
+    total["hits"] = total.get("hits", 0) + scan.cache_hits
+    total["misses"] = total.get("misses", 0) + scan.cache_misses
+
+
+def print_cache_stats(total):
+    n = total.get("hits", 0) + total.get("misses", 0)
+    if n:
+        print(f"Result cache: {total['hits']}/{n} hits ({total['hits'] / n * 100:.1f}%), "
+              f"{total['misses']} recomputed")
+
+
+def add_gate_stats(total, scan):
+    for res in scan.results.values():
+        total["kept"] = total.get("kept", 0) + res["num_signals"]
+        total["dropped"] = total.get("dropped", 0) + res.get("num_suppressed", 0)
+
+
+def print_gate_stats(total):
+    if total.get("dropped"):
+        n = total["kept"] + total["dropped"]
+        print(f"Signal gate: kept {total['kept']}/{n} signals, dropped {total['dropped']} repeats")
+
+
+def add_load_stats(total, scan):
+    total["load"] = total.get("load", 0.0) + scan.load_seconds
+    total["wait"] = total.get("wait", 0.0) + scan.load_wait
+    if scan.prefetch_ready is not None:
+        total["prefetched"] = total.get("prefetched", 0) + 1
+        total["ready"] = total.get("ready", 0) + scan.prefetch_ready
+
+
+def print_load_stats(total, depth):
+    if total.get("prefetched"):
+        print(f"Prefetch: loading took {total['load']:.2f}s, scan stalled {total['wait']:.2f}s waiting for bars; "
+              f"{total['ready'] / total['prefetched']:.1f} of {depth} symbols ready on average")
+
+
+def size_correlated(panel, by_strategy, args):
+    """Scale down / drop panel signals that would pile onto correlated positions."""
+    from portfolio.portfolio import Portfolio
+    from risk.correlation import CorrelationRiskGovernor, size_panel_signals
+
+    gov = CorrelationRiskGovernor(panel.symbols, args.corr_window, args.corr_limit)
+    t0 = time.perf_counter()
+    everything = [s for sigs in by_strategy.values() for s in sigs]
+    kept = {id(s) for s in size_panel_signals(panel, everything, gov, Portfolio(args.capital))}
+    print(f"Correlation sizing: {gov.scaled} scaled down, {gov.rejected} rejected "
+          f"of {len(everything)}, {gov.exited} closed at stop/target ({time.perf_counter() - t0:.3f}s)")
+    return {name: [s for s in sigs if id(s) in kept] for name, sigs in by_strategy.items()}
+
+
+def start_recording(args, cfg, mode):
+    """(RunStore, run_id) when --run_store is set, else None."""
+    if not args.run_store:
+        return None
+    from reporting.runstore import RunStore
+
+    store = RunStore(args.run_store)
+    params = {"strategies": list(cfg.strategies), **cfg.params, "interval": cfg.interval,
+              "start": cfg.start, "end": cfg.end, "target_exits": cfg.target_exits,
+              "drilldown": cfg.drilldown}
+    return store, store.start_run(mode, args.universe or args.symbol, params, cfg.capital)
+
+
+def record_results(run, symbol, results):
+    if run is not None:
+        store, run_id = run
+        for strat_name, res in results.items():
+            store.add_result(run_id, symbol, strat_name, res)
+
+
+def finish_recording(run):
+    if run is not None:
+        store, run_id = run
+        store.finish_run(run_id)
+        store.close()
+        print(f"Recorded run {run_id} in {store.path}")
+
 
+def run_monte_carlo(trades, capital, args):
+    """Trade-ledger Monte Carlo for the report, or None when --mc_paths is 0."""
+    if args.mc_paths <= 0:
+        return None
+    from reporting.montecarlo import simulate, summary_lines
+    from risk.governor import RiskGovernor
+
+    scale = 1.0
+    if args.mc_risk_pct:
+        scale = args.mc_risk_pct / RiskGovernor().max_risk_per_trade_pct
+    mc = simulate([t['pnl_est'] for t in trades], capital, paths=args.mc_paths,
+                  method=args.mc_method, scale=scale)
+    print("\n".join(summary_lines(mc)))
+    return mc
+
+
+def write_universe_report(agg_trades, total_pnl, capital, report_dir, mc=None):
+    from reporting.performance import generate_html_report
+
+    os.makedirs(report_dir, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
+    report_path = os.path.join(report_dir, f"report_{timestamp}.html")
+
+    # Simple aggregation stats
+    wins = [t for t in agg_trades if t['pnl_est'] > 0]
+    win_rate = len(wins) / len(agg_trades) if agg_trades else 0.0
+
+    # Merging independent per-symbol equity curves needs a time-synced
+    # portfolio; until then the universe report focuses on the trade list
+    # and passes an empty curve rather than a misleading one.
+    stats = {
+        "final_equity": capital + total_pnl, # Mock estimate
+        "realized_pnl": total_pnl,
+        "num_trades": len(agg_trades),
+        "win_rate": win_rate
+    }
+
+    generate_html_report(stats, [], agg_trades, report_path, monte_carlo=mc)
+    print(f"\nSaved Backtest Report: {report_path}")
+    print(f"Total PnL: {total_pnl:.2f}")
+    print(f"Trades: {len(agg_trades)}")
+    print(f"Win Rate: {win_rate*100:.1f}%")
+
+
+def run_daily(args, cfg, t_start, t_end):
+    """
+    fetch -> one BACKTEST pass per (symbol, strategy) -> watchlist + report.
+    Bars are parsed once and each strategy runs once; the watchlist is built
+    from the signals the backtest engines recorded along the way.
+    """
+    tickers = load_universe(args.universe)
+    timings = {}
+    mem, budget = make_memory(args, len(tickers))
+    print(f"Running DAILY pipeline for {len(tickers)} symbols...")
+
+    if not args.skip_fetch:
+        with stage("fetch", timings, mem):
+            from scripts.fetch_yahoo_bulk import fetch_universe
+            ok, fail = fetch_universe(tickers, cfg.cache_dir, cfg.period, cfg.interval)
+            print(f"Fetched: ok={ok} fail={fail}")
+
+    watchlist = make_watchlist(args, t_start, t_end, prefiltered=True)
+    agg_trades = []
+    total_pnl = 0.0
+    dd_stats = {}
+    cache_stats = {}
+    gate_stats = {}
+    load_stats = {}
+
+    profiler = Profiler() if cfg.profile else None
+    run = start_recording(args, cfg, "daily")
+
+    with stage("scan", timings, mem):
+        for scan in scan_universe(tickers, RunMode.BACKTEST, cfg):
+            if profiler is not None and scan.profile:
+                profiler.merge(scan.profile)
+            if scan.error:
+                print(f"ERROR processing {scan.ticker}: {scan.error}")
+                continue
+            add_cache_stats(cache_stats, scan)
+            add_gate_stats(gate_stats, scan)
+            add_load_stats(load_stats, scan)
+            collect_signals(scan.signals, watchlist)
+            add_drilldown_stats(dd_stats, scan.drilldown)
+            for res in scan.results.values():
+                agg_trades.extend(res['trades'])
+                total_pnl += res['realized_pnl']
+            record_results(run, scan.symbol, scan.results)
+            account_memory(mem, budget, scan)
+        print_drilldown_stats(dd_stats)
+        print_cache_stats(cache_stats)
+        print_gate_stats(gate_stats)
+        print_load_stats(load_stats, args.prefetch)
+
+    with stage("signals", timings, mem):
+        write_watchlist(watchlist)
+
+    with stage("report", timings, mem):
+        mc = run_monte_carlo(agg_trades, args.capital, args)
+        write_universe_report(agg_trades, total_pnl, args.capital, args.report_dir, mc)
+        finish_recording(run)
+
+    total = sum(timings.values())
+    print(f"[stage] total: {total:.2f}s", flush=True)
+
+    if profiler is not None:
+        write_profile(profiler, args.profile_out)
+    if mem is not None:
+        write_memory_report(mem, None)
 
-def run_one_csv(mode, csv_path, symbol, capital, strategy_name, **kwargs):
-    bars = load_csv(csv_path, symbol)
-    strat = get_strategy(strategy_name, symbol, kwargs.get('lookback', 20), kwargs.get('threshold', 0.02), kwargs.get('orb_minutes', 15))
-    eng = Engine(strat, mode, initial_capital=capital)
-    res = eng.run(bars)
-    return eng, res
 
 def main():
     ap = argparse.ArgumentParser()
-    ap.add_argument("--mode", type=str, choices=["signal", "backtest"], default="signal")
+    ap.add_argument("--mode", type=str, choices=["signal", "backtest", "daily"], default="signal")
 
     # make optional
     ap.add_argument("--data", type=str, help="CSV path (single mode)")
@@ -47,9 +348,30 @@ def main():
     ap.add_argument("--cache_dir", type=str, default="datasets/cache")
     ap.add_argument("--period", type=str, default="5d")
     ap.add_argument("--interval", type=str, default="5m")
-    
+    ap.add_argument("--start", type=str, default=None, help="YYYY-MM-DD, first day to run over")
+    ap.add_argument("--end", type=str, default=None, help="YYYY-MM-DD, last day to run over (inclusive)")
+    ap.add_argument("--store_dir", type=str, default=None,
+                    help="load bars from the month-partitioned store (python -m data.store) instead of CSVs")
+    ap.add_argument("--skip_fetch", action="store_true", help="daily mode: use the cache as-is")
+    ap.add_argument("--workers", type=int, default=1, help="universe mode: symbols scanned in parallel processes")
+    ap.add_argument("--prefetch", type=int, default=0,
+                    help="universe/daily with --workers 1: symbols loaded (or fetched) ahead on background threads "
+                         "while the current one runs (0 = off)")
+    ap.add_argument("--prefetch_threads", type=int, default=2, help="threads loading prefetched symbols")
+    ap.add_argument("--panel", action="store_true", help="signal mode: evaluate the whole universe as one time x symbol panel")
+    ap.add_argument("--checkpoint_dir", type=str, default=None,
+                    help="signal mode: resume strategy state from here and only process new bars")
+    ap.add_argument("--latest_only", action="store_true", help="panel mode: only signals on the latest bar")
+    ap.add_argument("--corr_limit", type=float, default=None,
+                    help="panel mode: max daily vol a signal may add to the session's book, as a fraction of "
+                         "capital (e.g. 0.01); correlated signals are scaled down or dropped")
+    ap.add_argument("--corr_window", type=int, default=375, help="panel mode: bars in the rolling return covariance")
+    ap.add_argument("--result_cache", type=str, default=None,
+                    help="universe/daily: reuse per-symbol results whose bars, params and code are unchanged")
+    ap.add_argument("--result_cache_mb", type=int, default=256, help="result cache size limit (LRU eviction)")
+
     # Strategy selection
-    ap.add_argument("--strategy", type=str, choices=["mr", "orb", "vwap", "all"], default="mr")
+    ap.add_argument("--strategy", type=str, choices=available() + ["all"], default="mr")
 
     # Filters
     ap.add_argument("--min_avg_volume", type=float, default=0.0)
@@ -57,29 +379,78 @@ def main():
     ap.add_argument("--min_atr", type=float, default=0.0)
     ap.add_argument("--time_start", type=str, default=None, help="HH:MM")
     ap.add_argument("--time_end", type=str, default=None, help="HH:MM")
-    
+    ap.add_argument("--top_k", type=int, default=0, help="keep only the K best-ranked signals (0 = all)")
+    ap.add_argument("--signal_cooldown", type=int, default=0,
+                    help="report no signal within N bars of the symbol's last reported one (0 = off)")
+    ap.add_argument("--signal_on_change", action="store_true",
+                    help="report only the first of consecutive same-side signals")
+    ap.add_argument("--signal_min_move", type=float, default=0.0,
+                    help="report a same-side repeat only once its entry moved this fraction (e.g. 0.005)")
+    ap.add_argument("--top_k_per_strategy", type=int, default=0, help="at most K signals per strategy (0 = no cap)")
+
     # Reporting
     ap.add_argument("--report_dir", type=str, default="reports/backtests")
+    ap.add_argument("--run_store", type=str, default=None,
+                    help="backtest/daily: record trades, session equity, params and metrics in this SQLite file")
+    ap.add_argument("--profile", action="store_true", help="print per-stage engine timings")
+    ap.add_argument("--profile_out", type=str, default=None, help="profile JSON (default reports/profile_<ts>.json)")
+    ap.add_argument("--mem_report", action="store_true",
+                    help="universe/daily: tracemalloc peak and retained memory per stage and symbol")
+    ap.add_argument("--mem_sample_every", type=int, default=10,
+                    help="with --mem_report: diff an allocation snapshot every N symbols (0 = never)")
+    ap.add_argument("--mem_budget", type=float, default=None,
+                    help="universe/daily: stop early when projected RSS in MB (this process and its workers) exceeds this")
+
+    ap.add_argument("--target_exits", action="store_true",
+                    help="backtest: also exit at the signal's first target (default: stop and EOD square-off only)")
+    ap.add_argument("--drilldown", type=str, default=None,
+                    help="backtest: resolve bars touching both stop and target from this finer cached interval, e.g. 1m")
+
+    # Monte Carlo (backtest/daily reports)
+    ap.add_argument("--mc_paths", type=int, default=0, help="resample the trade ledger into N paths (0 = off)")
+    ap.add_argument("--mc_method", type=str, choices=["bootstrap", "block", "shuffle"], default="bootstrap")
+    ap.add_argument("--mc_risk_pct", type=float, default=None,
+                    help="rescale trade PnLs to this max_risk_per_trade_pct (e.g. 0.01)")
 
     # Strategy Params
     ap.add_argument("--mr_lookback", type=int, default=20)
     ap.add_argument("--mr_threshold", type=float, default=0.02)
     ap.add_argument("--orb_minutes", type=int, default=15)
+    ap.add_argument("--vwap_stop_mult", type=float, default=1.0, help="VWAP stop distance in ATRs")
+    ap.add_argument("--vwap_target_mult", type=float, default=1.5, help="VWAP target distance in multiples of the stop")
 
     args = ap.parse_args()
-    mode = RunMode(args.mode.upper())
 
     # Validation
     has_universe = bool(args.universe)
-    has_single = bool(args.data and args.symbol)
-    
+    has_single = bool(args.symbol and (args.data or args.store_dir))
+
     if not has_universe and not has_single:
-        ap.error("Must provide either --universe OR (--data and --symbol)")
-    
+        ap.error("Must provide either --universe OR (--data and --symbol) OR (--store_dir and --symbol)")
+
     if args.data and not args.symbol:
         ap.error("--data requires --symbol")
-    if args.symbol and not args.data:
-        ap.error("--symbol requires --data")
+    if args.data and args.store_dir:
+        ap.error("--data and --store_dir are alternative bar sources; give only one")
+    if args.symbol and not (args.data or args.store_dir):
+        ap.error("--symbol requires --data or --store_dir")
+    if args.mode == "daily" and not has_universe:
+        ap.error("--mode daily requires --universe")
+    if args.panel and (args.mode != "signal" or not has_universe):
+        ap.error("--panel requires --mode signal and --universe")
+    if args.checkpoint_dir and (args.mode != "signal" or args.panel):
+        ap.error("--checkpoint_dir requires --mode signal (per-symbol engines)")
+    if args.corr_limit and not args.panel:
+        ap.error("--corr_limit requires --panel (cross-sectional bars)")
+    if args.panel and (args.signal_cooldown or args.signal_on_change or args.signal_min_move):
+        ap.error("--signal_cooldown/--signal_on_change/--signal_min_move apply to per-symbol engines, not --panel")
+    if args.panel and (args.store_dir or args.start or args.end):
+        ap.error("--store_dir/--start/--end are not supported with --panel")
+    if args.drilldown and not args.target_exits:
+        ap.error("--drilldown requires --target_exits (it decides stop-vs-target bars)")
+
+    d_start = datetime.strptime(args.start, "%Y-%m-%d").date() if args.start else None
+    d_end = datetime.strptime(args.end, "%Y-%m-%d").date() if args.end else None
 
     # Time parsing
     t_start, t_end = None, None
@@ -88,140 +459,158 @@ def main():
     if args.time_end:
         t_end = datetime.strptime(args.time_end, "%H:%M").time()
 
-    strategies_to_run = ["mr", "orb", "vwap"] if args.strategy == "all" else [args.strategy]
+    strategies_to_run = available() if args.strategy == "all" else [args.strategy]
+
+    cfg = ScanConfig(
+        cache_dir=args.cache_dir,
+        period=args.period,
+        interval=args.interval,
+        capital=args.capital, # Note: Separate capital per symbol in this simple loop
+        strategies=tuple(strategies_to_run),
+        params={
+            "lookback": args.mr_lookback,
+            "threshold": args.mr_threshold,
+            "orb_minutes": args.orb_minutes,
+            "vwap_stop_mult": args.vwap_stop_mult,
+            "vwap_target_mult": args.vwap_target_mult,
+        },
+        profile=args.profile,
+        workers=args.workers,
+        filters={
+            "min_avg_volume": args.min_avg_volume,
+            "min_avg_value": args.min_avg_value,
+            "min_atr": args.min_atr,
+            "time_start": t_start,
+            "time_end": t_end,
+        },
+        max_drafts=draft_cap(args),
+        gating={k: v for k, v in (("cooldown_bars", args.signal_cooldown),
+                                  ("on_change", args.signal_on_change),
+                                  ("min_move", args.signal_min_move)) if v},
+        checkpoint_dir=args.checkpoint_dir,
+        store_dir=args.store_dir,
+        target_exits=args.target_exits,
+        drilldown=args.drilldown,
+        result_cache=args.result_cache,
+        result_cache_mb=args.result_cache_mb,
+        mem_report=args.mem_report,
+        prefetch=args.prefetch,
+        prefetch_threads=args.prefetch_threads,
+        start=d_start,
+        end=d_end,
+    )
+
+    if args.mode == "daily":
+        run_daily(args, cfg, t_start, t_end)
+        return
+
+    mode = RunMode(args.mode.upper())
+
+    # ---- panel mode: whole universe as one (time x symbol) matrix ----
+    if args.panel:
+        from core.panel import evaluate, load_panel, rank_cross_section
+
+        tickers = load_universe(args.universe)
+        print(f"Running PANEL {mode.name} for {len(tickers)} symbols...")
+        t0 = time.perf_counter()
+        panel = load_panel(tickers, args.cache_dir, args.interval)
+        t1 = time.perf_counter()
+        by_strategy = evaluate(panel, strategies_to_run, cfg.params, latest_only=args.latest_only)
+        for name, sigs in by_strategy.items():
+            by_strategy[name] = rank_cross_section(sigs)
+        t2 = time.perf_counter()
+        print(f"Panel {panel.shape[0]} bars x {panel.shape[1]} symbols: load {t1 - t0:.2f}s, evaluate {t2 - t1:.3f}s")
+        if args.corr_limit:
+            by_strategy = size_correlated(panel, by_strategy, args)
+
+        watchlist = make_watchlist(args, t_start, t_end)
+        collect_signals(by_strategy, watchlist)
+        write_watchlist(watchlist)
+        return
 
     # ---- universe mode ----
     if args.universe:
         tickers = load_universe(args.universe)
-        all_signals = []
-        
-        # Backtest Aggregation
+        mem, budget = make_memory(args, len(tickers))
+        watchlist = make_watchlist(args, t_start, t_end, prefiltered=True)
+
+        # Backtest Aggregation: independent per-symbol backtests, so collect
+        # all trades and sum PnL. Real portfolio backtest requires time-sync.
         agg_trades = []
-        agg_equity = [] # This is tricky for universe. We'll simplify: just sum PnL? 
-                        # Real portfolio backtest requires time-sync.
-                        # For now, let's collect all trades and PnL.
-        
         total_pnl = 0.0
-        
+        dd_stats = {}
+        cache_stats = {}
+        gate_stats = {}
+        load_stats = {}
+
+        profiler = Profiler() if args.profile else None
+        run = start_recording(args, cfg, "backtest") if mode == RunMode.BACKTEST else None
+
         print(f"Running {mode.name} for {len(tickers)} symbols...")
 
-        for t in tickers:
-            sym = t.replace(".NS", "")
-            csv_path = cache_path(args.cache_dir, t, args.interval)
-
-            try:
-                if not os.path.exists(csv_path):
-                    from scripts.fetch_yahoo_5m import fetch_one
-                    fetch_one(t, csv_path, args.period, args.interval)
-
-                for strat_name in strategies_to_run:
-                    eng, res = run_one_csv(
-                        mode=mode,
-                        csv_path=csv_path,
-                        symbol=sym,
-                        capital=args.capital, # Note: Separate capital per symbol in this simple loop
-                        strategy_name=strat_name,
-                        lookback=args.mr_lookback,
-                        threshold=args.mr_threshold,
-                        orb_minutes=args.orb_minutes
-                    )
-
-                    if mode == RunMode.SIGNAL:
-                        # Apply filters (existing logic)
-                        for sig in eng.signals:
-                            meta = sig.meta or {}
-                            
-                            if meta.get("avg_volume", 0) < args.min_avg_volume:
-                                continue
-                            if meta.get("avg_value", 0) < args.min_avg_value:
-                                continue
-                            if meta.get("atr", 0) < args.min_atr:
-                                continue
-                            
-                            ts_time = sig.timestamp.time()
-                            if t_start and ts_time < t_start:
-                                continue
-                            if t_end and ts_time > t_end:
-                                continue
-                                
-                            # Add strategy name to meta/reasoning
-                            sig = replace(sig, reasoning=f"[{strat_name.upper()}] {sig.reasoning}")
-                            all_signals.append(sig)
-                    
-                    else:
-                        # BACKTEST Mode aggregation
-                        # We are running independent simulated backtests.
-                        # We will aggregate all trades.
+        with mem_stage(mem, "scan"):
+            for scan in scan_universe(tickers, mode, cfg):
+                if profiler is not None and scan.profile:
+                    profiler.merge(scan.profile)
+                if scan.error:
+                    print(f"ERROR processing {scan.ticker}: {scan.error}")
+                    continue
+                add_cache_stats(cache_stats, scan)
+                add_gate_stats(gate_stats, scan)
+                add_load_stats(load_stats, scan)
+
+                if mode == RunMode.SIGNAL:
+                    collect_signals(scan.signals, watchlist)
+                else:
+                    add_drilldown_stats(dd_stats, scan.drilldown)
+                    for res in scan.results.values():
                         agg_trades.extend(res['trades'])
                         total_pnl += res['realized_pnl']
-                        # Ensure equity curve is not empty before extending
-                        if res.get('equity_curve'):
-                            agg_equity.extend(res['equity_curve']) 
-            except Exception as e:
-                print(f"ERROR processing {t}: {e}")
-                continue 
+                    record_results(run, scan.symbol, scan.results)
+                account_memory(mem, budget, scan)
+        print_drilldown_stats(dd_stats)
+        print_cache_stats(cache_stats)
+        print_gate_stats(gate_stats)
+        print_load_stats(load_stats, args.prefetch)
 
-        if mode == RunMode.SIGNAL:
-            # Sort: (-confidence, -avg_volume, -atr, symbol)
-            all_signals.sort(key=lambda s: (
-                -float(s.confidence),
-                -float(s.meta.get("avg_volume", 0) if s.meta else 0),
-                -float(s.meta.get("atr", 0) if s.meta else 0),
-                s.symbol
-            ))
-
-            path_json = save_watchlist(all_signals)
-            path_txt = save_watchlist_table(all_signals)
-            print(f"\nSaved watchlist JSON: {path_json}")
-            print(f"Saved watchlist table: {path_txt}")
-            print(f"Total signals: {len(all_signals)}")
-            return
-        
-        else:
-            # Backtest Report
-            os.makedirs(args.report_dir, exist_ok=True)
-            timestamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
-            report_path = os.path.join(args.report_dir, f"report_{timestamp}.html")
-            
-            # Simple aggregation stats
-            wins = [t for t in agg_trades if t['pnl_est'] > 0]
-            win_rate = len(wins) / len(agg_trades) if agg_trades else 0.0
-            
-            # For equity curve, merging multiple independent backtests is complex.
-            # We will just plot one concatenating or maybe just show Total PnL.
-            # To do it right, we'd need a Portfolio object managing all tickers at once.
-            # For Phase 2 simple version: We will pass an empty equity curve if aggregated, 
-            # OR better: create a synthetic daily equity curve by summing daily PnL?
-            # Let's just pass the raw trades for now, and maybe a dummy equity curve of just final points.
-            
-            stats = {
-                "final_equity": args.capital + total_pnl, # Mock estimate
-                "realized_pnl": total_pnl,
-                "num_trades": len(agg_trades),
-                "win_rate": win_rate
-            }
-            
-            # For universe, let's just use the first symbol's curve or empty for now to avoid misleading graphs
-            # unless we implement time-aligned summation.
-            # Implementation Plan said "Aggregate results".
-            # Let's try to pass the raw list. generate_html_report sorts by timestamp. 
-            # If we pass ALL equity points from ALL symbols, it will look chaotic but "correct" in time.
-            # Actually, calculate_drawdown assumes a single series. 
-            # Lets just pass an empty curve for universe mode for now, focusing on Trade List.
-            
-            generate_html_report(stats, [], agg_trades, report_path)
-            print(f"\nSaved Backtest Report: {report_path}")
-            print(f"Total PnL: {total_pnl:.2f}")
-            print(f"Trades: {len(agg_trades)}")
-            print(f"Win Rate: {win_rate*100:.1f}%")
-            return
+        with mem_stage(mem, "report"):
+            if mode == RunMode.SIGNAL:
+                write_watchlist(watchlist)
+            else:
+                mc = run_monte_carlo(agg_trades, args.capital, args)
+                write_universe_report(agg_trades, total_pnl, args.capital, args.report_dir, mc)
+                finish_recording(run)
+
+        if profiler is not None:
+            write_profile(profiler, args.profile_out)
+        if mem is not None:
+            write_memory_report(mem, None)
+        return
 
     # ---- single symbol mode ----
     # Just run first selected strategy or all? Single mode usually creates one report.
     # If "all", we might print multiple summaries.
-    
+
     os.makedirs(args.report_dir, exist_ok=True)
-    
+    if mode != RunMode.SIGNAL:
+        from reporting.performance import generate_html_report
+
+    profiler = Profiler() if args.profile else None
+
+    if args.store_dir:
+        from data.store import load_range
+        bars = load_range(args.store_dir, args.symbol, args.symbol, args.interval, d_start, d_end)
+    else:
+        bars = clip_range(load_csv(args.data, args.symbol), d_start, d_end)
+
+    run = start_recording(args, cfg, "backtest") if mode == RunMode.BACKTEST else None
+    dd = None
+    if args.drilldown and mode == RunMode.BACKTEST:
+        from execution.drilldown import DrillDown
+        from data.calendar_nse import parse_interval
+        dd = DrillDown(args.symbol, args.symbol, args.cache_dir, args.store_dir, args.drilldown,
+                       parse_interval(args.interval))
+
     for strat_name in strategies_to_run:
         print(f"\n--- Strategy: {strat_name.upper()} ---")
         eng, res = run_one_csv(
@@ -230,9 +619,17 @@ def main():
             symbol=args.symbol,
             capital=args.capital,
             strategy_name=strat_name,
+            profiler=profiler,
+            bars=bars,
+            drilldown=dd,
+            gating=cfg.gating,
+            target_exits=args.target_exits,
+            checkpoint=checkpoint_path(args.checkpoint_dir, args.symbol, args.interval, strat_name) if args.checkpoint_dir else None,
             lookback=args.mr_lookback,
             threshold=args.mr_threshold,
-            orb_minutes=args.orb_minutes
+            orb_minutes=args.orb_minutes,
+            vwap_stop_mult=args.vwap_stop_mult,
+            vwap_target_mult=args.vwap_target_mult,
         )
 
         if mode == RunMode.SIGNAL:
@@ -243,15 +640,23 @@ def main():
             # Generate Report per strategy
             timestamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
             report_path = os.path.join(args.report_dir, f"report_{args.symbol}_{strat_name}_{timestamp}.html")
-            
-            generate_html_report(res, res['equity_curve'], res['trades'], report_path)
-            
+
+            mc = run_monte_carlo(res['trades'], args.capital, args)
+            generate_html_report(res, res['equity_curve'], res['trades'], report_path, monte_carlo=mc)
+            record_results(run, args.symbol, {strat_name: res})
+
             print("==== BACKTEST SUMMARY ====")
             print("Final Equity:", res["final_equity"])
             print("Realized PnL:", res["realized_pnl"])
             print("Trades:", res["num_trades"])
             print(f"Report: {report_path}")
 
+    if dd is not None:
+        print_drilldown_stats(dd.stats())
+    finish_recording(run)
+
+    if profiler is not None:
+        write_profile(profiler, args.profile_out)
+
 if __name__ == "__main__":
     main()
-
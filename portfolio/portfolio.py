@@ -12,6 +12,7 @@ class Portfolio:
         self.initial_capital = initial_capital
         self.realized_pnl = 0.0
         self.daily_realized = 0.0
+        self.day = None  # session (date ordinal) daily_realized belongs to
         self.pos = {}  # symbol -> Position
 
     def get_pos(self, symbol: str) -> Position:
@@ -19,6 +20,14 @@ class Portfolio:
             self.pos[symbol] = Position()
         return self.pos[symbol]
 
+    def roll_day(self, day: int) -> bool:
+        """Start a new session's daily PnL (the risk governor's daily stop); True if `day` is new."""
+        if day == self.day:
+            return False
+        self.day = day
+        self.daily_realized = 0.0
+        return True
+
     def update_fill(self, fill):
         p = self.get_pos(fill.symbol)
         q = fill.quantity if fill.side == "BUY" else -fill.quantity
@@ -35,6 +44,20 @@ class Portfolio:
             p.qty += q
             p.avg = fill.price
 
+    def get_state(self) -> dict:
+        return {
+            "realized_pnl": self.realized_pnl,
+            "daily_realized": self.daily_realized,
+            "day": self.day,
+            "pos": {sym: [p.qty, p.avg] for sym, p in self.pos.items()},
+        }
+
+    def set_state(self, state: dict):
+        self.realized_pnl = state["realized_pnl"]
+        self.daily_realized = state["daily_realized"]
+        self.day = state.get("day")
+        self.pos = {sym: Position(qty, avg) for sym, (qty, avg) in state["pos"].items()}
+
     def equity(self) -> float:
         return self.initial_capital + self.realized_pnl
 
@@ -0,0 +1,128 @@
+"""
+Monte Carlo resampling of a backtest's trade ledger.
+
+Each path reorders/resamples the realized per-trade PnLs and compounds them
+additively from the starting capital, giving distributions of final equity,
+max drawdown and the probability of losing a given fraction of capital
+(risk of ruin). Paths are generated in fixed-size batches of index matrices,
+so memory is bounded by `batch * n_trades` regardless of `paths`.
+
+Methods:
+  bootstrap  trades drawn i.i.d. with replacement
+  block      circular block bootstrap (keeps streaks of `block` trades)
+  shuffle    the same trades in random order (final equity fixed, path varies)
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+METHODS = ("bootstrap", "block", "shuffle")
+PERCENTILES = (5, 25, 50, 75, 95)
+RUIN_LEVELS = (0.05, 0.1, 0.2, 0.5)
+MAX_BAND_STEPS = 200      # equity bands are sampled at most at this many trade counts
+MAX_BAND_PATHS = 20_000   # ... from at most this many paths
+
+
+@dataclass
+class MonteCarloResult:
+    method: str
+    paths: int
+    n_trades: int
+    initial_capital: float
+    steps: List[int] = field(default_factory=list)                  # trade counts the bands are taken at
+    equity_bands: Dict[int, List[float]] = field(default_factory=dict)  # percentile -> equity per step
+    final_equity: Dict[int, float] = field(default_factory=dict)   # percentile -> final equity
+    max_drawdown: Dict[int, float] = field(default_factory=dict)   # percentile -> max drawdown fraction
+    ruin: Dict[float, float] = field(default_factory=dict)         # loss fraction -> P(equity ever <= capital*(1-loss))
+
+    def to_dict(self) -> Dict:
+        return {
+            "method": self.method,
+            "paths": self.paths,
+            "n_trades": self.n_trades,
+            "initial_capital": self.initial_capital,
+            "steps": self.steps,
+            "equity_bands": {str(p): v for p, v in self.equity_bands.items()},
+            "final_equity": {str(p): v for p, v in self.final_equity.items()},
+            "max_drawdown": {str(p): v for p, v in self.max_drawdown.items()},
+            "ruin": {str(k): v for k, v in self.ruin.items()},
+        }
+
+
+def _indices(rng: np.random.Generator, method: str, b: int, n: int, block: int) -> np.ndarray:
+    if method == "bootstrap":
+        return rng.integers(0, n, size=(b, n))
+    if method == "shuffle":
+        return np.argsort(rng.random((b, n)), axis=1)
+    if method == "block":
+        k = -(-n // block)
+        starts = rng.integers(0, n, size=(b, k, 1))
+        return ((starts + np.arange(block)) % n).reshape(b, k * block)[:, :n]
+    raise ValueError(f"Unknown method: {method} (choose from {', '.join(METHODS)})")
+
+
+def simulate(pnls: Sequence[float], initial_capital: float, paths: int = 100_000,
+             method: str = "bootstrap", block: int = 5, batch: int = 10_000, seed: int = 0,
+             ruin_levels: Sequence[float] = RUIN_LEVELS,
+             percentiles: Sequence[int] = PERCENTILES, scale: float = 1.0) -> MonteCarloResult:
+    """
+    Resample `pnls` (per-trade PnL, in ledger order) into `paths` equity paths.
+    `scale` multiplies every PnL, e.g. new_risk_pct / current_risk_pct to see
+    the same trades at a different RiskGovernor.max_risk_per_trade_pct.
+    """
+    pnl = np.asarray(pnls, dtype=np.float64) * scale
+    n = len(pnl)
+    res = MonteCarloResult(method=method, paths=paths, n_trades=n, initial_capital=initial_capital)
+    if n == 0 or paths <= 0:
+        return res
+
+    rng = np.random.default_rng(seed)
+    steps = np.unique(np.linspace(0, n, min(n, MAX_BAND_STEPS) + 1).astype(np.int64))
+    band_rows = min(paths, MAX_BAND_PATHS)
+
+    finals = np.empty(paths)
+    dds = np.empty(paths)
+    troughs = np.empty(paths)
+    band = np.empty((band_rows, len(steps)))
+
+    done = 0
+    while done < paths:
+        b = min(batch, paths - done)
+        eq = np.empty((b, n + 1))
+        eq[:, 0] = initial_capital
+        np.cumsum(pnl[_indices(rng, method, b, n, block)], axis=1, out=eq[:, 1:])
+        eq[:, 1:] += initial_capital
+
+        peak = np.maximum.accumulate(eq, axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            dd = np.where(peak > 0, (peak - eq) / peak, 1.0)
+        finals[done:done + b] = eq[:, -1]
+        dds[done:done + b] = dd.max(axis=1)
+        troughs[done:done + b] = eq.min(axis=1)
+        if done < band_rows:
+            m = min(b, band_rows - done)
+            band[done:done + m] = eq[:m, steps]
+        done += b
+
+    res.steps = steps.tolist()
+    bands = np.percentile(band, percentiles, axis=0)
+    for i, p in enumerate(percentiles):
+        res.equity_bands[p] = bands[i].tolist()
+    for p, v in zip(percentiles, np.percentile(finals, percentiles)):
+        res.final_equity[p] = float(v)
+    for p, v in zip(percentiles, np.percentile(dds, percentiles)):
+        res.max_drawdown[p] = float(v)
+    for lvl in ruin_levels:
+        res.ruin[lvl] = float(np.mean(troughs <= initial_capital * (1.0 - lvl)))
+    return res
+
+
+def summary_lines(res: MonteCarloResult) -> List[str]:
+    if res.n_trades == 0:
+        return ["Monte Carlo: no trades"]
+    lines = [f"Monte Carlo ({res.method}, {res.paths} paths x {res.n_trades} trades)"]
+    lines.append("  final equity  " + "  ".join(f"p{p}={v:.0f}" for p, v in res.final_equity.items()))
+    lines.append("  max drawdown  " + "  ".join(f"p{p}={v*100:.1f}%" for p, v in res.max_drawdown.items()))
+    lines.append("  risk of ruin  " + "  ".join(f"-{k*100:.0f}%: {v*100:.2f}%" for k, v in res.ruin.items()))
+    return lines
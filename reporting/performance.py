@@ -13,9 +13,58 @@ def calculate_drawdown(equity_curve: List[float]) -> float:
     drawdown = (series - cum_max) / cum_max
     return abs(drawdown.min())
 
-def generate_html_report(stats: Dict, equity_curve: List[Dict], trades: List[Dict], filename: str):
+def monte_carlo_section(mc) -> str:
+    """Equity percentile bands, drawdown/final-equity percentiles and risk of ruin (reporting/montecarlo.py)."""
+    if mc is None or mc.n_trades == 0:
+        return ""
+
+    fig = go.Figure()
+    x = mc.steps
+    lo, hi = min(mc.equity_bands), max(mc.equity_bands)
+    inner = sorted(mc.equity_bands)[1:-1]
+    fig.add_trace(go.Scatter(x=x, y=mc.equity_bands[hi], mode='lines', line=dict(width=0), showlegend=False))
+    fig.add_trace(go.Scatter(x=x, y=mc.equity_bands[lo], mode='lines', line=dict(width=0), fill='tonexty',
+                             fillcolor='rgba(99,110,250,0.2)', name=f'p{lo}-p{hi}'))
+    if len(inner) >= 2:
+        fig.add_trace(go.Scatter(x=x, y=mc.equity_bands[inner[-1]], mode='lines', line=dict(width=0), showlegend=False))
+        fig.add_trace(go.Scatter(x=x, y=mc.equity_bands[inner[0]], mode='lines', line=dict(width=0), fill='tonexty',
+                                 fillcolor='rgba(99,110,250,0.4)', name=f'p{inner[0]}-p{inner[-1]}'))
+    if 50 in mc.equity_bands:
+        fig.add_trace(go.Scatter(x=x, y=mc.equity_bands[50], mode='lines', name='Median'))
+    fig.update_layout(
+        title=f'Monte Carlo Equity Bands ({mc.method}, {mc.paths} paths)',
+        xaxis_title='Trades',
+        yaxis_title='Capital',
+        template='plotly_dark'
+    )
+    div = plot(fig, output_type='div', include_plotlyjs=False)
+
+    rows = "".join(
+        f"<tr><td>p{p}</td><td>{mc.final_equity[p]:.2f}</td><td>{mc.max_drawdown[p]*100:.2f}%</td></tr>"
+        for p in mc.final_equity
+    )
+    ruin = "".join(f"<tr><td>-{k*100:.0f}%</td><td>{v*100:.2f}%</td></tr>" for k, v in mc.ruin.items())
+    return f"""
+            <h2>Monte Carlo</h2>
+            <div class="chart">
+                {div}
+            </div>
+            <table>
+                <thead><tr><th>Percentile</th><th>Final Equity</th><th>Max Drawdown</th></tr></thead>
+                <tbody>{rows}</tbody>
+            </table>
+            <table>
+                <thead><tr><th>Loss Threshold</th><th>Risk of Ruin</th></tr></thead>
+                <tbody>{ruin}</tbody>
+            </table>
     """
-    Generates a standalone HTML report with equity curve and trade list.
+
+
+def generate_html_report(stats: Dict, equity_curve: List[Dict], trades: List[Dict], filename: str,
+                         monte_carlo=None):
+    """
+    Generates a standalone HTML report with equity curve and trade list, plus
+    Monte Carlo bands when a reporting.montecarlo.MonteCarloResult is given.
     """
     
     # Prepare Data
@@ -102,7 +151,7 @@ def generate_html_report(stats: Dict, equity_curve: List[Dict], trades: List[Dic
             <div class="chart">
                 {plot_div}
             </div>
-            
+            {monte_carlo_section(monte_carlo)}
             <h2>Trade List</h2>
             <table>
                 <thead>
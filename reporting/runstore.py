@@ -0,0 +1,235 @@
+"""
+SQLite store of backtest runs, for comparing runs without opening HTML files.
+
+Each run records its parameters and totals, one metrics row per (strategy,
+symbol), every trade, and the equity at each session close per (strategy,
+symbol). Comparisons are aggregate SQL over indexed tables, so they stay
+interactive with thousands of runs:
+
+    python -m reporting.runstore runs [--last 20]
+    python -m reporting.runstore pnl [--last 10]                 # PnL by strategy per run
+    python -m reporting.runstore drift [--run A --vs B] [--top 20]  # per-symbol PnL change
+    python -m reporting.runstore params A B                      # parameter deltas
+
+Runs are written with `main.py ... --run_store reports/runs.sqlite`.
+"""
+import argparse
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_DB = "reports/runs.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    started TEXT NOT NULL,
+    mode TEXT,
+    universe TEXT,
+    params TEXT,          -- JSON
+    capital REAL,
+    total_pnl REAL,
+    num_trades INTEGER,
+    win_rate REAL
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id INTEGER NOT NULL,
+    strategy TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    pnl REAL,
+    num_trades INTEGER,
+    wins INTEGER,
+    num_signals INTEGER,
+    PRIMARY KEY (run_id, strategy, symbol)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS metrics_symbol ON metrics (symbol, run_id);
+CREATE TABLE IF NOT EXISTS trades (
+    run_id INTEGER NOT NULL,
+    strategy TEXT,
+    symbol TEXT,
+    side TEXT,
+    entry REAL,
+    exit REAL,
+    qty INTEGER,
+    pnl REAL,
+    exit_tag TEXT,
+    exit_time TEXT
+);
+CREATE INDEX IF NOT EXISTS trades_run ON trades (run_id, strategy, symbol);
+CREATE TABLE IF NOT EXISTS equity (
+    run_id INTEGER NOT NULL,
+    strategy TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    ts TEXT NOT NULL,
+    equity REAL
+);
+CREATE INDEX IF NOT EXISTS equity_run ON equity (run_id, strategy, symbol);
+"""
+
+
+def session_closes(equity_curve: List[Dict]) -> List[Tuple[str, float]]:
+    """(timestamp, equity) of the last point of each session."""
+    out = []
+    for i, p in enumerate(equity_curve):
+        ts = p["timestamp"]
+        nxt = equity_curve[i + 1]["timestamp"] if i + 1 < len(equity_curve) else None
+        if nxt is None or nxt.date() != ts.date():
+            out.append((ts.isoformat(), p["equity"]))
+    return out
+
+
+class RunStore:
+    def __init__(self, path: str = DEFAULT_DB):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    # ---- writing: start_run -> add_result per (symbol, strategy) -> finish_run ----
+
+    def start_run(self, mode: str, universe: Optional[str], params: Dict, capital: float,
+                  started: Optional[datetime] = None) -> int:
+        cur = self.db.execute(
+            "INSERT INTO runs (started, mode, universe, params, capital) VALUES (?, ?, ?, ?, ?)",
+            ((started or datetime.now()).isoformat(timespec="seconds"), mode, universe,
+             json.dumps(params, sort_keys=True, default=str), capital),
+        )
+        return cur.lastrowid
+
+    def add_result(self, run_id: int, symbol: str, strategy: str, summary: Dict):
+        trades = summary["trades"]
+        self.db.execute(
+            "INSERT OR REPLACE INTO metrics VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (run_id, strategy, symbol, summary["realized_pnl"], len(trades),
+             sum(1 for t in trades if t["pnl_est"] > 0), summary.get("num_signals", 0)),
+        )
+        self.db.executemany(
+            "INSERT INTO trades VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(run_id, strategy, symbol, t["side"], t["entry"], t["exit"], t["qty"], t["pnl_est"],
+              t.get("exit_tag"), t["exit_time"].isoformat() if t.get("exit_time") else None) for t in trades],
+        )
+        self.db.executemany(
+            "INSERT INTO equity VALUES (?, ?, ?, ?, ?)",
+            [(run_id, strategy, symbol, ts, eq) for ts, eq in session_closes(summary.get("equity_curve", []))],
+        )
+
+    def finish_run(self, run_id: int):
+        """Fill in the run's totals from its metrics and commit."""
+        self.db.execute(
+            """UPDATE runs SET
+                 total_pnl = (SELECT COALESCE(SUM(pnl), 0) FROM metrics WHERE run_id = :r),
+                 num_trades = (SELECT COALESCE(SUM(num_trades), 0) FROM metrics WHERE run_id = :r),
+                 win_rate = (SELECT CAST(SUM(wins) AS REAL) / NULLIF(SUM(num_trades), 0)
+                             FROM metrics WHERE run_id = :r)
+               WHERE run_id = :r""",
+            {"r": run_id},
+        )
+        self.db.commit()
+
+    # ---- queries ----
+
+    def runs(self, last: int = 20) -> List[tuple]:
+        return self.db.execute(
+            "SELECT run_id, started, mode, universe, total_pnl, num_trades, win_rate "
+            "FROM runs ORDER BY run_id DESC LIMIT ?", (last,)).fetchall()
+
+    def latest_runs(self, n: int = 2) -> List[int]:
+        return [r[0] for r in self.db.execute(
+            "SELECT run_id FROM runs WHERE total_pnl IS NOT NULL ORDER BY run_id DESC LIMIT ?", (n,))]
+
+    def pnl_by_strategy(self, last: int = 10) -> List[tuple]:
+        """(run_id, started, strategy, pnl, trades, win_rate) for the last `last` runs."""
+        return self.db.execute(
+            """SELECT m.run_id, r.started, m.strategy, SUM(m.pnl), SUM(m.num_trades),
+                      CAST(SUM(m.wins) AS REAL) / NULLIF(SUM(m.num_trades), 0)
+               FROM metrics m JOIN runs r USING (run_id)
+               WHERE m.run_id IN (SELECT run_id FROM runs ORDER BY run_id DESC LIMIT ?)
+               GROUP BY m.run_id, m.strategy
+               ORDER BY m.run_id DESC, m.strategy""", (last,)).fetchall()
+
+    def symbol_drift(self, run_id: int, vs: int, top: int = 20) -> List[tuple]:
+        """(symbol, strategy, pnl in `vs`, pnl in `run_id`, change), largest changes first."""
+        return self.db.execute(
+            """SELECT k.symbol, k.strategy, COALESCE(b.pnl, 0), COALESCE(a.pnl, 0),
+                      COALESCE(a.pnl, 0) - COALESCE(b.pnl, 0) AS delta
+               FROM (SELECT symbol, strategy FROM metrics WHERE run_id IN (:a, :b)
+                     GROUP BY symbol, strategy) k
+               LEFT JOIN metrics a ON a.run_id = :a AND a.symbol = k.symbol AND a.strategy = k.strategy
+               LEFT JOIN metrics b ON b.run_id = :b AND b.symbol = k.symbol AND b.strategy = k.strategy
+               ORDER BY ABS(delta) DESC LIMIT :top""",
+            {"a": run_id, "b": vs, "top": top}).fetchall()
+
+    def params(self, run_id: int) -> Dict:
+        row = self.db.execute("SELECT params FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"no run {run_id}")
+        return json.loads(row[0] or "{}")
+
+    def param_deltas(self, run_id: int, vs: int) -> Dict[str, Tuple]:
+        """{param: (value in `vs`, value in `run_id`)} for params that differ."""
+        a, b = self.params(run_id), self.params(vs)
+        return {k: (b.get(k), a.get(k)) for k in sorted(set(a) | set(b)) if a.get(k) != b.get(k)}
+
+
+def _fmt_rate(x) -> str:
+    return f"{x * 100:5.1f}%" if x is not None else "    -"
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Query stored backtest runs")
+    ap.add_argument("--db", default=DEFAULT_DB)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("runs", help="recent runs")
+    p.add_argument("--last", type=int, default=20)
+    p = sub.add_parser("pnl", help="PnL by strategy over the last N runs")
+    p.add_argument("--last", type=int, default=10)
+    p = sub.add_parser("drift", help="per-symbol PnL change between two runs (default: latest vs previous)")
+    p.add_argument("--run", type=int, default=None)
+    p.add_argument("--vs", type=int, default=None)
+    p.add_argument("--top", type=int, default=20)
+    p = sub.add_parser("params", help="parameter differences between two runs")
+    p.add_argument("run", type=int)
+    p.add_argument("vs", type=int)
+    args = ap.parse_args()
+
+    if not Path(args.db).exists():
+        ap.error(f"no run store at {args.db}")
+    store = RunStore(args.db)
+
+    if args.cmd == "runs":
+        print(f"{'RUN':>5} {'STARTED':<19} {'MODE':<8} {'PNL':>12} {'TRADES':>7} {'WIN':>6}  UNIVERSE")
+        for run_id, started, mode, universe, pnl, n, wr in store.runs(args.last):
+            print(f"{run_id:>5} {started:<19} {mode or '':<8} {pnl or 0:>12.2f} {n or 0:>7} {_fmt_rate(wr)}  {universe or ''}")
+    elif args.cmd == "pnl":
+        print(f"{'RUN':>5} {'STARTED':<19} {'STRATEGY':<10} {'PNL':>12} {'TRADES':>7} {'WIN':>6}")
+        for run_id, started, strat, pnl, n, wr in store.pnl_by_strategy(args.last):
+            print(f"{run_id:>5} {started:<19} {strat:<10} {pnl:>12.2f} {n:>7} {_fmt_rate(wr)}")
+    elif args.cmd == "drift":
+        latest = store.latest_runs(2)
+        run_id = args.run if args.run is not None else (latest[0] if latest else None)
+        vs = args.vs if args.vs is not None else next((r for r in latest if r != run_id), None)
+        if run_id is None or vs is None:
+            ap.error("need two finished runs (or --run and --vs)")
+        print(f"Run {run_id} vs {vs}")
+        print(f"{'SYMBOL':<12} {'STRATEGY':<10} {'BEFORE':>10} {'AFTER':>10} {'CHANGE':>10}")
+        for sym, strat, before, after, delta in store.symbol_drift(run_id, vs, args.top):
+            print(f"{sym:<12} {strat:<10} {before:>10.2f} {after:>10.2f} {delta:>+10.2f}")
+        for k, (old, new) in store.param_deltas(run_id, vs).items():
+            print(f"param {k}: {old} -> {new}")
+    elif args.cmd == "params":
+        deltas = store.param_deltas(args.run, args.vs)
+        if not deltas:
+            print("No parameter differences.")
+        for k, (old, new) in deltas.items():
+            print(f"{k}: {old} -> {new}")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
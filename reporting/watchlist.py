@@ -1,7 +1,13 @@
+import heapq
 import json
 from dataclasses import asdict
 from datetime import datetime
+from itertools import count
 from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from core.filters import compile_filter
+from core.types import rank_key
 
 
 def save_watchlist(signals, out_dir="reports"):
@@ -42,3 +48,69 @@ def save_watchlist_table(signals, out_dir="reports"):
     return str(path)
 
 
+class _Entry:
+    # Heap item ordered worst-first, so heap[0] is the one to evict.
+    __slots__ = ("key", "strategy", "sig")
+
+    def __init__(self, key, strategy, sig):
+        self.key, self.strategy, self.sig = key, strategy, sig
+
+    def __lt__(self, other):
+        return self.key > other.key
+
+
+class WatchlistBuilder:
+    """
+    Streaming watchlist: filters signals as they are emitted and keeps only
+    the best under rank_key in one bounded heap per strategy.
+
+    The global top `k` is always contained in the union of each strategy's
+    top `k`, so per-strategy heaps capped at min(k, per_strategy_k) are
+    enough; `result()` merges them. Memory is O(strategies * K) however many
+    signals are added. k/per_strategy_k of None mean unbounded.
+    Ties keep arrival order, like a stable sort of the full list.
+    """
+
+    def __init__(self, k: Optional[int] = None, per_strategy_k: Optional[int] = None,
+                 keep: Optional[Callable] = None):
+        caps = [c for c in (k, per_strategy_k) if c]
+        self.k = k or None
+        self.cap = min(caps) if caps else None
+        self.keep = keep or (lambda sig: True)
+        self._heaps: Dict[str, List[_Entry]] = {}
+        self._seq = count()
+        self.seen = 0
+        self.kept = 0
+
+    def add(self, strategy: str, sig) -> bool:
+        self.seen += 1
+        if not self.keep(sig):
+            return False
+        self.kept += 1
+        heap = self._heaps.setdefault(strategy, [])
+        e = _Entry((rank_key(sig), next(self._seq)), strategy, sig)
+        if self.cap is None or len(heap) < self.cap:
+            heapq.heappush(heap, e)
+            return True
+        if e.key < heap[0].key:
+            heapq.heapreplace(heap, e)
+            return True
+        return False
+
+    def extend(self, strategy: str, signals: Iterable) -> None:
+        for sig in signals:
+            self.add(strategy, sig)
+
+    def _ranked(self, entries: Iterable[_Entry], limit: Optional[int]) -> List:
+        out = sorted(entries, key=lambda e: e.key)
+        if limit:
+            out = out[:limit]
+        # Only the survivors are materialized (meta dict, reasoning text).
+        return [e.sig.materialize(f"[{e.strategy.upper()}] ") for e in out]
+
+    def by_strategy(self) -> Dict[str, List]:
+        return {name: self._ranked(heap, None) for name, heap in self._heaps.items()}
+
+    def result(self) -> List:
+        """Final ranked set (global top k), reasoning prefixed with the strategy name."""
+        return self._ranked((e for heap in self._heaps.values() for e in heap), self.k)
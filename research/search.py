@@ -0,0 +1,296 @@
+"""
+Successive-halving parameter search over a universe.
+
+Every candidate config is first backtested on a small random sample of
+symbols and sessions; the best 1/eta survive to a rung with eta times more
+symbol-days, and so on until the last few are run on the full universe. Each
+rung costs about as much as the first, so the whole search is a few rungs'
+worth of compute instead of (configs x symbols x days).
+
+    python -m research.search --universe universe/nifty50.txt --strategy mr
+    python -m research.search --universe universe/nifty50.txt --strategy vwap \\
+        --grid vwap_stop_mult=0.5,1,1.5,2 --grid vwap_target_mult=1,1.5,2,3 --target_exits --workers 8
+    python -m research.search ... --exhaustive   # also run the full grid and report regret
+
+Samples are nested prefixes of one seeded shuffle of the symbols and of the
+sessions, so a fixed --seed reproduces the search and every (config, symbol,
+sample) backtest is run at most once, including by --exhaustive. Sessions
+come from the first sampled symbol (NSE symbols share the calendar).
+"""
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from core.scanner import ScanConfig, load_symbol, run_bars, symbol_of
+from core.types import MarketBar, RunMode
+from data.universe import load_universe
+from strategies import REGISTRY, available
+
+DEFAULT_GRIDS = {
+    "mr": {"lookback": [10, 20, 30, 50], "threshold": [0.005, 0.01, 0.02, 0.03]},
+    "orb": {"orb_minutes": [5, 15, 30, 45, 60]},
+    "vwap": {"vwap_stop_mult": [0.5, 1.0, 1.5, 2.0], "vwap_target_mult": [1.0, 1.5, 2.0, 3.0]},
+}
+
+
+def expand_grid(grid: Dict[str, Sequence]) -> List[Dict]:
+    keys = sorted(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+def parse_grid(items: Sequence[str], strategy: str) -> Dict[str, list]:
+    """["lookback=10,20", "threshold=0.01,0.02"] -> {"lookback": [10, 20], ...}"""
+    accepted = REGISTRY[strategy][1]
+    grid = {}
+    for item in items:
+        key, _, values = item.partition("=")
+        if key not in accepted:
+            raise ValueError(f"{strategy} has no param {key!r} (accepts {', '.join(accepted) or 'none'})")
+        grid[key] = [json.loads(v) for v in values.split(",") if v]
+    return grid
+
+
+@dataclass
+class Rung:
+    configs: int
+    symbols: int
+    days: int
+    best: float = 0.0
+    seconds: float = 0.0
+
+
+def schedule(n_configs: int, n_symbols: int, n_days: int, eta: int = 3) -> List[Tuple[int, int]]:
+    """
+    (symbols, days) per rung. The last rung is the full universe and each
+    earlier one has 1/eta of the next one's symbol-days, split evenly between
+    symbols and days; there are enough rungs to halve n_configs down to ~1.
+    """
+    rungs = 1 + int(math.log(max(n_configs, 1), eta) + 1e-9)
+    out = []
+    for k in range(rungs):
+        frac = eta ** -(rungs - 1 - k)
+        out.append((max(1, min(n_symbols, round(n_symbols * math.sqrt(frac)))),
+                    max(1, min(n_days, round(n_days * math.sqrt(frac))))))
+    return out
+
+
+@dataclass(frozen=True)
+class BarSource:
+    """Hashable view of the ScanConfig fields load_symbol uses."""
+    cache_dir: str
+    interval: str
+    store_dir: Optional[str]
+    start: Optional[date]
+    end: Optional[date]
+
+    @property
+    def scan(self) -> ScanConfig:
+        return ScanConfig(cache_dir=self.cache_dir, interval=self.interval, store_dir=self.store_dir,
+                          start=self.start, end=self.end, fetch_missing=False)
+
+    @classmethod
+    def from_args(cls, args) -> "BarSource":
+        return cls(args.cache_dir, args.interval, args.store_dir,
+                   datetime.strptime(args.start, "%Y-%m-%d").date() if args.start else None,
+                   datetime.strptime(args.end, "%Y-%m-%d").date() if args.end else None)
+
+
+def add_source_args(ap: argparse.ArgumentParser):
+    """Universe, data source and backtest flags shared by the research CLIs."""
+    ap.add_argument("--universe", type=str, required=True)
+    ap.add_argument("--strategy", type=str, choices=available() + ["all"], default="mr")
+    ap.add_argument("--grid", action="append", default=[],
+                    help="param=v1,v2,... (repeatable); default: a built-in grid per strategy")
+    ap.add_argument("--cache_dir", type=str, default="datasets/cache")
+    ap.add_argument("--interval", type=str, default="5m")
+    ap.add_argument("--store_dir", type=str, default=None)
+    ap.add_argument("--start", type=str, default=None, help="YYYY-MM-DD")
+    ap.add_argument("--end", type=str, default=None, help="YYYY-MM-DD")
+    ap.add_argument("--capital", type=float, default=100000.0)
+    ap.add_argument("--target_exits", action="store_true", help="also exit at the signal's first target")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+
+
+def grids_from_args(ap: argparse.ArgumentParser, args) -> Dict[str, Dict[str, list]]:
+    """strategy -> param grid, from --strategy and --grid."""
+    strategies = available() if args.strategy == "all" else [args.strategy]
+    if args.grid and len(strategies) > 1:
+        ap.error("--grid needs a single --strategy")
+    try:
+        return {name: parse_grid(args.grid, name) if args.grid else DEFAULT_GRIDS[name] for name in strategies}
+    except ValueError as e:
+        ap.error(str(e))
+
+
+@lru_cache(maxsize=64)
+def load_bars(ticker: str, source: BarSource) -> List[MarketBar]:
+    return load_symbol(ticker, source.scan)
+
+
+def session_days(ticker: str, load: BarSource) -> List[date]:
+    return sorted({b.timestamp.date() for b in load_bars(ticker, load)})
+
+
+def eval_symbol(ticker: str, strategy: str, configs: List[Dict], days: Tuple[date, ...],
+                load: BarSource, capital: float, target_exits: bool = False) -> List[float]:
+    """Realized PnL of each config backtested over `ticker`'s bars on `days`."""
+    keep = set(days)
+    bars = [b for b in load_bars(ticker, load) if b.timestamp.date() in keep]
+    out = []
+    for params in configs:
+        eng = run_bars(bars, symbol_of(ticker), strategy, RunMode.BACKTEST, capital, params,
+                       target_exits=target_exits)
+        out.append(eng.portfolio.realized_pnl)
+    return out
+
+
+@dataclass
+class Search:
+    tickers: List[str]
+    strategy: str
+    configs: List[Dict]
+    load: BarSource
+    capital: float = 100000.0
+    eta: int = 3
+    seed: int = 0
+    target_exits: bool = False
+    # (config index, ticker, n_days) -> PnL; shared by all rungs and --exhaustive
+    scores: Dict[Tuple[int, str, int], float] = field(default_factory=dict)
+    backtests: int = 0  # (config, symbol) backtests actually run
+    symbol_days: int = 0  # their total size, the compute measure
+
+    def __post_init__(self):
+        rng = random.Random(self.seed)
+        self.order = list(self.tickers)
+        rng.shuffle(self.order)
+        self.days = session_days(self.order[0], self.load)
+        rng.shuffle(self.days)
+
+    def evaluate(self, pool, idx: Sequence[int], n_symbols: int, n_days: int) -> Dict[int, float]:
+        """Total PnL of configs `idx` over the first n_symbols x n_days of the sample."""
+        days = tuple(self.days[:n_days])
+        jobs = []
+        for ticker in self.order[:n_symbols]:
+            todo = [i for i in idx if (i, ticker, n_days) not in self.scores]
+            if todo:
+                jobs.append((ticker, todo))
+        args = [(t, self.strategy, [self.configs[i] for i in todo], days, self.load, self.capital,
+                 self.target_exits) for t, todo in jobs]
+        if pool is not None and args:
+            results = pool.map(eval_symbol, *zip(*args))
+        else:
+            results = (eval_symbol(*a) for a in args)
+        for (ticker, todo), pnls in zip(jobs, results):
+            for i, pnl in zip(todo, pnls):
+                self.scores[(i, ticker, n_days)] = pnl
+            self.backtests += len(todo)
+            self.symbol_days += len(todo) * n_days
+        return {i: sum(self.scores[(i, t, n_days)] for t in self.order[:n_symbols]) for i in idx}
+
+    def run(self, pool=None, exhaustive: bool = False) -> Dict:
+        alive = list(range(len(self.configs)))
+        rungs = []
+        for n_symbols, n_days in schedule(len(alive), len(self.order), len(self.days), self.eta):
+            t0 = time.perf_counter()
+            scores = self.evaluate(pool, alive, n_symbols, n_days)
+            ranked = sorted(alive, key=scores.get, reverse=True)
+            rungs.append(Rung(len(alive), n_symbols, n_days, scores[ranked[0]], time.perf_counter() - t0))
+            alive = ranked[:math.ceil(len(ranked) / self.eta)]
+        best = alive[0]
+        full = (len(self.order), len(self.days))
+        out = {
+            "strategy": self.strategy,
+            "best": self.configs[best],
+            "best_pnl": rungs[-1].best,
+            "rungs": [r.__dict__ for r in rungs],
+            "backtests": self.backtests,
+            "symbol_days": self.symbol_days,
+            "exhaustive_symbol_days": len(self.configs) * full[0] * full[1],
+            "seconds": sum(r.seconds for r in rungs),
+        }
+        if exhaustive:
+            out["exhaustive"] = self.compare(pool, best)
+        return out
+
+    def compare(self, pool, best: int) -> Dict:
+        """Full grid on the full universe, against the successive-halving pick."""
+        t0 = time.perf_counter()
+        full = self.evaluate(pool, range(len(self.configs)), len(self.order), len(self.days))
+        ranked = sorted(full, key=full.get, reverse=True)
+        top = ranked[0]
+        return {
+            "best": self.configs[top],
+            "best_pnl": full[top],
+            "pick_rank": ranked.index(best) + 1,
+            "regret": full[top] - full[best],
+            "seconds": time.perf_counter() - t0,  # only the backtests the search hadn't already run
+        }
+
+
+def save_report(doc: Dict, path: Optional[str], prefix: str) -> str:
+    path = path or os.path.join("reports", f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(doc, f, indent=2, default=str)
+    print(f"\nSaved: {path}")
+    return path
+
+
+def print_result(res: Dict):
+    print(f"\n=== {res['strategy']} ===")
+    print(f"{'RUNG':>4} {'CONFIGS':>8} {'SYMBOLS':>8} {'DAYS':>5} {'BEST PNL':>12} {'SECONDS':>8}")
+    for k, r in enumerate(res["rungs"]):
+        print(f"{k:>4} {r['configs']:>8} {r['symbols']:>8} {r['days']:>5} {r['best']:>12.2f} {r['seconds']:>8.2f}")
+    share = res["symbol_days"] / max(res["exhaustive_symbol_days"], 1)
+    print(f"Best: {res['best']}  PnL {res['best_pnl']:.2f}")
+    print(f"Compute: {res['symbol_days']} of {res['exhaustive_symbol_days']} config-symbol-days "
+          f"({share:.0%} of exhaustive), {res['seconds']:.1f}s")
+    ex = res.get("exhaustive")
+    if ex:
+        print(f"Exhaustive best: {ex['best']}  PnL {ex['best_pnl']:.2f}  "
+              f"(pick ranked #{ex['pick_rank']}, regret {ex['regret']:.2f}, +{ex['seconds']:.1f}s)")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Successive-halving parameter search")
+    add_source_args(ap)
+    ap.add_argument("--eta", type=int, default=3, help="keep the best 1/eta configs per rung")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--exhaustive", action="store_true", help="also run the full grid and report the regret")
+    ap.add_argument("--out", type=str, default=None, help="result JSON (default reports/search_<ts>.json)")
+    args = ap.parse_args()
+    if args.eta < 2:
+        ap.error("--eta must be at least 2")
+
+    grids = grids_from_args(ap, args)
+    load = BarSource.from_args(args)
+    tickers = load_universe(args.universe)
+
+    results = []
+    pool = ProcessPoolExecutor(max_workers=args.workers) if args.workers > 1 else None
+    try:
+        for name, grid in grids.items():
+            search = Search(tickers, name, expand_grid(grid), load, capital=args.capital, eta=args.eta,
+                            seed=args.seed, target_exits=args.target_exits)
+            res = search.run(pool, args.exhaustive)
+            print_result(res)
+            results.append(res)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    save_report({"universe": args.universe, "seed": args.seed, "eta": args.eta, "results": results},
+                args.out, "search")
+
+
+if __name__ == "__main__":
+    main()
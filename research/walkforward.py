@@ -0,0 +1,208 @@
+"""
+Walk-forward optimization: pick params on each train window, trade them on
+the following test window, and stitch the test windows into one
+out-of-sample equity curve.
+
+    python -m research.walkforward --universe universe/nifty50.txt --strategy mr \\
+        --train_days 40 --test_days 10 [--anchored] [--workers 8]
+
+Windows overlap heavily (every session is in several train windows), so
+nothing is backtested per window. Each (config, symbol) is run once over the
+whole history, in a process pool, and its trades are bucketed into per-session
+PnL. A window's score is then a difference of prefix sums. Bars are loaded
+once per symbol, and indicators carry over from one window to the next as
+they would live, instead of warming up again at each window start.
+
+Prefix sums are only valid if a session's PnL doesn't depend on the sessions
+before it. Strategies are flat by the close and the daily loss stop resets
+each session. These backtests also size from fixed capital rather than
+compounding equity. So past the first session's indicator warm-up, a session
+trades the same whether the run starts at the beginning of the history or
+just before that session.
+"""
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, List, Tuple
+
+from core.scanner import run_bars, symbol_of
+from core.types import RunMode
+from data.universe import load_universe
+from risk.governor import RiskGovernor
+from research.search import (BarSource, add_source_args, expand_grid, grids_from_args, load_bars,
+                             save_report)
+
+
+def windows(n_days: int, train_days: int, test_days: int,
+            anchored: bool = False) -> List[Tuple[int, int, int, int]]:
+    """(train_lo, train_hi, test_lo, test_hi) session indices, half-open; test windows tile the rest."""
+    out = []
+    t = train_days
+    while t < n_days:
+        out.append((0 if anchored else t - train_days, t, t, min(t + test_days, n_days)))
+        t += test_days
+    return out
+
+
+def daily_pnl(ticker: str, strategy: str, configs: List[Dict], source: BarSource,
+              capital: float, target_exits: bool = False) -> Tuple[List[date], List[Dict[date, float]]]:
+    """
+    Sessions of `ticker` and, per config, realized PnL by exit session from one
+    full-history backtest sized off fixed `capital`.
+    """
+    bars = load_bars(ticker, source)
+    days = sorted({b.timestamp.date() for b in bars})
+    out = []
+    for params in configs:
+        eng = run_bars(bars, symbol_of(ticker), strategy, RunMode.BACKTEST, capital, params,
+                       risk=RiskGovernor(fixed_capital=capital), target_exits=target_exits)
+        by_day: Dict[date, float] = {}
+        for t in eng.trades:
+            d = t["exit_time"].date()
+            by_day[d] = by_day.get(d, 0.0) + t["pnl_est"]
+        out.append(by_day)
+    return days, out
+
+
+@dataclass
+class WalkForward:
+    tickers: List[str]
+    strategy: str
+    configs: List[Dict]
+    source: BarSource
+    train_days: int = 40
+    test_days: int = 10
+    anchored: bool = False
+    capital: float = 100000.0
+    target_exits: bool = False
+    days: List[date] = field(default_factory=list)
+    # cum[c][i]: universe PnL of config c over sessions [0, i)
+    cum: List[List[float]] = field(default_factory=list)
+    seconds: float = 0.0
+
+    def load(self, pool=None):
+        """One backtest per (config, symbol) over the whole history -> per-session PnL prefix sums."""
+        t0 = time.perf_counter()
+        args = [(t, self.strategy, self.configs, self.source, self.capital, self.target_exits)
+                for t in self.tickers]
+        if pool is not None and args:
+            results = list(pool.map(daily_pnl, *zip(*args)))
+        else:
+            results = [daily_pnl(*a) for a in args]
+        self.days = sorted({d for days, _ in results for d in days})
+        index = {d: i for i, d in enumerate(self.days)}
+        per_day = [[0.0] * len(self.days) for _ in self.configs]
+        for _, by_config in results:
+            for c, by_day in enumerate(by_config):
+                for d, pnl in by_day.items():
+                    per_day[c][index[d]] += pnl
+        self.cum = []
+        for row in per_day:
+            acc, cum = 0.0, [0.0]
+            for pnl in row:
+                acc += pnl
+                cum.append(acc)
+            self.cum.append(cum)
+        self.seconds = time.perf_counter() - t0
+        return self
+
+    def pnl(self, c: int, lo: int, hi: int) -> float:
+        return self.cum[c][hi] - self.cum[c][lo]
+
+    def best(self, lo: int, hi: int) -> int:
+        return max(range(len(self.configs)), key=lambda c: self.pnl(c, lo, hi))
+
+    def run(self) -> Dict:
+        wins = windows(len(self.days), self.train_days, self.test_days, self.anchored)
+        rows, equity = [], []
+        eq = self.capital
+        for train_lo, train_hi, test_lo, test_hi in wins:
+            c = self.best(train_lo, train_hi)
+            rows.append({
+                "train": [self.days[train_lo], self.days[train_hi - 1]],
+                "test": [self.days[test_lo], self.days[test_hi - 1]],
+                "params": self.configs[c],
+                "train_pnl": self.pnl(c, train_lo, train_hi),
+                "test_pnl": self.pnl(c, test_lo, test_hi),
+            })
+            for i in range(test_lo, test_hi):
+                eq += self.pnl(c, i, i + 1)
+                equity.append([self.days[i], eq])
+
+        out = {
+            "strategy": self.strategy,
+            "anchored": self.anchored,
+            "windows": rows,
+            "oos_pnl": eq - self.capital,
+            "oos_equity": equity,
+            "symbols": len(self.tickers),
+            "sessions": len(self.days),
+            "symbol_days": len(self.configs) * len(self.tickers) * len(self.days),
+            # what backtesting every window's train + test span from scratch would cost
+            "per_window_symbol_days": len(self.configs) * len(self.tickers) * sum(
+                b - a for a, _, _, b in wins),
+            "seconds": self.seconds,
+        }
+        if wins:
+            # What a single in-sample optimization over the same sessions
+            # would have reported: the config that is best there in hindsight.
+            lo, hi = wins[0][2], wins[-1][3]
+            c = self.best(lo, hi)
+            out["in_sample"] = {"params": self.configs[c], "pnl": self.pnl(c, lo, hi)}
+        return out
+
+
+def print_result(res: Dict):
+    kind = "anchored" if res["anchored"] else "rolling"
+    print(f"\n=== {res['strategy']} ({kind}, {res['symbols']} symbols, {res['sessions']} sessions) ===")
+    print(f"{'TRAIN':<23} {'TEST':<23} {'TRAIN PNL':>11} {'TEST PNL':>11}  PARAMS")
+    for w in res["windows"]:
+        train = f"{w['train'][0]}..{w['train'][1]}"
+        test = f"{w['test'][0]}..{w['test'][1]}"
+        print(f"{train:<23} {test:<23} {w['train_pnl']:>11.2f} {w['test_pnl']:>11.2f}  {w['params']}")
+    if not res["windows"]:
+        print("No windows: fewer sessions than --train_days + 1.")
+        return
+    print(f"Out-of-sample PnL: {res['oos_pnl']:.2f}")
+    ins = res["in_sample"]
+    print(f"In-sample optimum over the same sessions: {ins['params']}  PnL {ins['pnl']:.2f}")
+    print(f"Compute: {res['symbol_days']} config-symbol-days "
+          f"(per-window backtests: {res['per_window_symbol_days']}), {res['seconds']:.1f}s")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Walk-forward parameter optimization")
+    add_source_args(ap)
+    ap.add_argument("--train_days", type=int, default=40, help="sessions per train window")
+    ap.add_argument("--test_days", type=int, default=10, help="sessions per test window (and step)")
+    ap.add_argument("--anchored", action="store_true", help="train windows all start at the first session")
+    ap.add_argument("--out", type=str, default=None, help="result JSON (default reports/walkforward_<ts>.json)")
+    args = ap.parse_args()
+    if args.train_days < 1 or args.test_days < 1:
+        ap.error("--train_days and --test_days must be positive")
+
+    grids = grids_from_args(ap, args)
+    source = BarSource.from_args(args)
+    tickers = load_universe(args.universe)
+
+    results = []
+    pool = ProcessPoolExecutor(max_workers=args.workers) if args.workers > 1 else None
+    try:
+        for name, grid in grids.items():
+            wf = WalkForward(tickers, name, expand_grid(grid), source, args.train_days, args.test_days,
+                             args.anchored, args.capital, args.target_exits).load(pool)
+            res = wf.run()
+            print_result(res)
+            results.append(res)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    save_report({"universe": args.universe, "train_days": args.train_days, "test_days": args.test_days,
+                 "results": results}, args.out, "walkforward")
+
+
+if __name__ == "__main__":
+    main()
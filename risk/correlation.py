@@ -0,0 +1,197 @@
+"""
+Correlation-aware position sizing across a universe.
+
+RollingCovariance keeps the covariance of the last `window` bar returns of N
+symbols as running sums (S1 = sum r, S2 = sum r r^T). Each bar is an O(N^2)
+rank-one update (add the new outer product, subtract the one leaving the
+window) instead of a recomputation over the whole window; the sums are
+rebuilt from the ring buffer every `window` bars so rounding drift cannot
+accumulate. Sizing only ever needs one row of the matrix, which is O(N).
+
+CorrelationRiskGovernor sizes a signal like RiskGovernor and then limits the
+variance it adds to the open book. With b = (C w)_j for the book's signed
+notionals w and c = C_jj, adding notional x on symbol j changes the book's
+daily variance by
+
+    dV = 2 x b + x^2 c
+
+and the position is scaled down to the largest x with dV <= L, where
+L = (equity * max_marginal_vol_pct)^2. A trade with the book adds little,
+one against it (hedging) adds less than standalone, and the 20th long
+bank stock in a row of correlated longs is cut down or rejected.
+
+A position stays in the book until a later bar reaches its stop or first
+target, or the session squares off, so the book is what is actually open.
+"""
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from core.types import Side, rank_key
+from data.calendar_nse import FORCE_SQUAREOFF_SLOT
+from risk.governor import RiskGovernor
+
+BARS_PER_DAY = 75  # 5m NSE session; scales per-bar covariance to daily
+
+
+class RollingCovariance:
+    def __init__(self, symbols: List[str], window: int = 375):
+        self.symbols = list(symbols)
+        self.index = {s: i for i, s in enumerate(self.symbols)}
+        n = len(self.symbols)
+        self.window = window
+        self.buf = np.zeros((window, n))  # ring buffer of return rows
+        self.count = 0                    # rows added so far
+        self.s1 = np.zeros(n)
+        self.s2 = np.zeros((n, n))
+        self.prev = np.full(n, np.nan)    # last seen close per symbol
+
+    def update(self, close: np.ndarray):
+        """Add one bar of closes (NaN = no bar for that symbol, counted as no move)."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            r = close / self.prev - 1.0
+        r[~np.isfinite(r)] = 0.0
+        self.prev = np.where(np.isnan(close), self.prev, close)
+        self.push(r)
+
+    def push(self, r: np.ndarray):
+        slot = self.count % self.window
+        old = self.buf[slot].copy()
+        self.buf[slot] = r
+        self.count += 1
+        if self.count % self.window == 0:
+            # Periodic exact rebuild (amortised O(N^2) per bar).
+            self.s1 = self.buf.sum(axis=0)
+            self.s2 = self.buf.T @ self.buf
+            return
+        self.s1 += r - old
+        self.s2 += np.outer(r, r) - np.outer(old, old)
+
+    @property
+    def n(self) -> int:
+        return min(self.count, self.window)
+
+    def row(self, j: int) -> np.ndarray:
+        """Covariance of symbol j with every symbol (per bar)."""
+        n = self.n
+        if n < 2:
+            return np.zeros(len(self.symbols))
+        return (self.s2[j] - self.s1[j] * self.s1 / n) / (n - 1)
+
+    def matrix(self) -> np.ndarray:
+        n = self.n
+        if n < 2:
+            return np.zeros_like(self.s2)
+        return (self.s2 - np.outer(self.s1, self.s1) / n) / (n - 1)
+
+
+class CorrelationRiskGovernor(RiskGovernor):
+    def __init__(self, symbols: List[str], window: int = 375, max_marginal_vol_pct: float = 0.01,
+                 min_scale: float = 0.25, bars_per_day: int = BARS_PER_DAY, **kwargs):
+        super().__init__(**kwargs)
+        self.cov = RollingCovariance(symbols, window)
+        self.max_marginal_vol_pct = max_marginal_vol_pct
+        self.min_scale = min_scale  # reject when scaled below this fraction of the base size
+        self.bars_per_day = bars_per_day
+        self.book = np.zeros(len(symbols))  # signed notional per symbol
+        self.open: List[tuple] = []  # (symbol index, signed notional, side, stop, target) per position
+        self.scaled = 0
+        self.rejected = 0
+        self.exited = 0  # positions taken off the book at their stop or target
+
+    def on_bar(self, close: np.ndarray):
+        self.cov.update(close)
+
+    def reset_book(self):
+        self.book[:] = 0.0
+        self.open = []
+
+    def on_exits(self, high: np.ndarray, low: np.ndarray):
+        """Take positions whose stop or target this bar's `high`/`low` reached off the book."""
+        keep = []
+        for pos in self.open:
+            j, notional, side, stop, target = pos
+            if side == Side.BUY:
+                hit = low[j] <= stop or (target is not None and high[j] >= target)
+            else:
+                hit = high[j] >= stop or (target is not None and low[j] <= target)
+            if hit:
+                self.book[j] -= notional
+                self.exited += 1
+            else:
+                keep.append(pos)
+        self.open = keep
+        if not keep:
+            self.book[:] = 0.0  # no rounding residue once flat
+
+    def marginal_variance(self, symbol: str, notional: float) -> float:
+        """Daily variance added to the book by `notional` (signed) more of `symbol`."""
+        j = self.cov.index[symbol]
+        row = self.cov.row(j) * self.bars_per_day
+        return 2 * notional * float(row @ self.book) + notional * notional * row[j]
+
+    def size_position(self, portfolio, signal) -> int:
+        base = super().size_position(portfolio, signal)
+        j = self.cov.index.get(signal.symbol)
+        if base <= 0 or j is None or self.cov.n < 2:
+            return base
+
+        row = self.cov.row(j) * self.bars_per_day
+        c = row[j]
+        if c <= 0:
+            return base
+        sign = 1.0 if signal.side == Side.BUY else -1.0
+        b = sign * float(row @ self.book)
+        limit = (portfolio.equity() * self.max_marginal_vol_pct) ** 2
+        # Largest notional a >= 0 with 2 a b + a^2 c <= limit.
+        a_max = (-b + np.sqrt(b * b + c * limit)) / c
+        qty = min(base, int(a_max / signal.entry))
+        if qty < base:
+            if qty < base * self.min_scale:
+                self.rejected += 1
+                return 0
+            self.scaled += 1
+        return qty
+
+    def add(self, signal, qty: int):
+        sign = 1.0 if signal.side == Side.BUY else -1.0
+        j = self.cov.index[signal.symbol]
+        notional = sign * qty * signal.entry
+        self.book[j] += notional
+        target = float(signal.targets[0]) if signal.targets else None
+        self.open.append((j, notional, signal.side, float(signal.stop), target))
+
+
+def size_panel_signals(panel, signals: List, governor: CorrelationRiskGovernor, portfolio) -> List:
+    """
+    Walk the panel bar by bar, updating the covariance, and size the signals
+    firing on each bar (best-ranked first) against the book of signals
+    accepted earlier and still open. A position is filled at its signal bar's
+    close and leaves the book on the first later bar whose high/low reaches
+    its stop or target, at the square-off slot, or at the end of the session.
+    Accepted signals get meta["qty"] and meta["corr_scale"] (qty /
+    uncorrelated size); rejected ones are dropped.
+    """
+    by_ts: Dict = {}
+    for s in signals:
+        by_ts.setdefault(np.datetime64(s.timestamp, "m"), []).append(s)
+
+    out = []
+    day: Optional[int] = None
+    for t in range(len(panel.ts)):
+        governor.on_bar(panel.close[t])
+        if panel.days[t] != day or panel.slots[t] >= FORCE_SQUAREOFF_SLOT:
+            day = panel.days[t]
+            governor.reset_book()  # intraday: positions are squared off each session
+        elif governor.open:
+            governor.on_exits(panel.high[t], panel.low[t])
+        for s in sorted(by_ts.get(panel.ts[t], ()), key=rank_key):
+            base = RiskGovernor.size_position(governor, portfolio, s)
+            qty = governor.size_position(portfolio, s)
+            if qty <= 0:
+                continue
+            governor.add(s, qty)
+            s.meta["qty"] = qty
+            s.meta["corr_scale"] = round(qty / base, 4) if base else 1.0
+            out.append(s)
+    return out
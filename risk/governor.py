@@ -1,5 +1,7 @@
 from datetime import time
-from data.calendar_nse import ENTRY_CUTOFF
+from typing import Optional
+
+from data.calendar_nse import ENTRY_CUTOFF, slots_until
 
 
 class RiskGovernor:
@@ -8,16 +10,22 @@ class RiskGovernor:
         max_daily_loss_pct: float = 0.01,       # 1% equity
         max_risk_per_trade_pct: float = 0.005,  # 0.5% equity
         cutoff_time: time = ENTRY_CUTOFF,
+        fixed_capital: Optional[float] = None,  # size off this instead of compounding equity
     ):
         self.max_daily_loss_pct = max_daily_loss_pct
         self.max_risk_per_trade_pct = max_risk_per_trade_pct
         self.cutoff_time = cutoff_time
+        self.cutoff_slot = slots_until(cutoff_time)
+        self.fixed_capital = fixed_capital
 
     def allow_entry_time(self, ts) -> bool:
         return ts.time() < self.cutoff_time
 
+    def allow_entry(self, bar) -> bool:
+        return bar.slot < self.cutoff_slot
+
     def size_position(self, portfolio, signal) -> int:
-        eq = portfolio.equity()
+        eq = self.fixed_capital if self.fixed_capital is not None else portfolio.equity()
 
         # daily stop
         if portfolio.daily_realized <= -eq * self.max_daily_loss_pct:
@@ -32,29 +32,22 @@ fi
 # Move to project directory
 cd "$PROJECT_DIR" || exit
 
-# 2. Fetch Latest Data
-log "Fetching latest data for universe: $UNIVERSE"
-python3 -m scripts.fetch_yahoo_bulk --universe "$UNIVERSE" --interval 5m --period 5d >> "$LOG_FILE" 2>&1
+# 2. Fetch, generate signals and run the daily backtest in one process.
+# Bars are loaded once and each strategy runs once; per-stage timings are
+# written to the log as "[stage] <name>: <seconds>s". Symbols whose bars did
+# not change since the last run are served from the result cache.
+log "Running daily pipeline for universe: $UNIVERSE (Strategy: ALL)..."
+python3 main.py --mode daily --universe "$UNIVERSE" --strategy all \
+    --interval 5m --period 5d \
+    --min_avg_volume 500000 --min_avg_value 5000000 \
+    --result_cache "$PROJECT_DIR/datasets/results" \
+    --run_store "$REPORT_DIR/runs.sqlite" \
+    --report_dir "$REPORT_DIR/backtests" >> "$LOG_FILE" 2>&1
 
 if [ $? -eq 0 ]; then
-    log "Data fetch completed successfully."
+    log "Daily pipeline completed."
 else
-    log "ERROR: Data fetch failed."
-    # Decide if we should continue? For now, yes, maybe partial data works.
+    log "ERROR: Daily pipeline failed."
 fi
 
-# 3. Generate Signals
-log "Generating Signals (Strategy: ALL)..."
-python3 main.py --mode signal --universe "$UNIVERSE" --strategy all --min_avg_volume 500000 --min_avg_value 5000000 >> "$LOG_FILE" 2>&1
-
-if [ $? -eq 0 ]; then
-    log "Signal generation completed."
-else
-    log "ERROR: Signal generation failed."
-fi
-
-# 4. Run Daily Backtest (Optional - for performance tracking)
-log "Running Daily Backtest/Performance Check..."
-python3 main.py --mode backtest --universe "$UNIVERSE" --strategy all --report_dir "$REPORT_DIR/backtests" >> "$LOG_FILE" 2>&1
-
 log "Daily execution finished."
@@ -2,6 +2,9 @@ import argparse
 import pandas as pd
 import yfinance as yf
 
+from data.calendar_nse import parse_interval
+from data.cleaning import clean_ohlcv, write_quality_report
+
 
 def _flatten_cols(df: pd.DataFrame) -> pd.DataFrame:
     # yfinance can return MultiIndex columns like ('Open', 'INFY.NS')
@@ -39,17 +42,25 @@ def fetch_one(ticker: str, out: str, period: str = "5d", interval: str = "5m"):
         if c not in df.columns:
             raise ValueError(f"Missing column {c}. Columns: {list(df.columns)}")
 
-    out_df = pd.DataFrame({
-        "timestamp": pd.to_datetime(df[ts_col]).dt.strftime("%Y-%m-%dT%H:%M:%S"),
-        "open": pd.to_numeric(df["Open"], errors="coerce"),
-        "high": pd.to_numeric(df["High"], errors="coerce"),
-        "low": pd.to_numeric(df["Low"], errors="coerce"),
-        "close": pd.to_numeric(df["Close"], errors="coerce"),
-        "volume": pd.to_numeric(df["Volume"], errors="coerce").fillna(0),
-    }).dropna(subset=["open", "high", "low", "close"])
+    raw = pd.DataFrame({
+        "timestamp": pd.to_datetime(df[ts_col]),
+        "open": df["Open"],
+        "high": df["High"],
+        "low": df["Low"],
+        "close": df["Close"],
+        "volume": df["Volume"],
+    })
+
+    # Dedupe, session-filter (in exchange time) and sanity-check once here so
+    # strategies can assume clean bars.
+    out_df, rep = clean_ohlcv(raw, parse_interval(interval))
 
     out_df.to_csv(out, index=False)
-    print(f"saved: {out}  rows={len(out_df)}  ticker={ticker}")
+    write_quality_report(rep, out, ticker)
+    print(
+        f"saved: {out}  rows={len(out_df)}  ticker={ticker}  "
+        f"dropped={rep['rows_in'] - rep['rows_out']}  missing_bars={rep['missing_bars']}"
+    )
 
 
 def main():
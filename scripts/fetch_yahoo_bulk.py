@@ -6,29 +6,35 @@ from data.cache import cache_path
 from scripts.fetch_yahoo_5m import fetch_one
 
 
-def main():
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--universe", required=True, help="e.g. universe/nifty50.txt")
-    ap.add_argument("--cache_dir", default="datasets/cache", help="where to save csvs")
-    ap.add_argument("--period", default="5d")
-    ap.add_argument("--interval", default="5m")
-    args = ap.parse_args()
-
-    tickers = load_universe(args.universe)
-    Path(args.cache_dir).mkdir(parents=True, exist_ok=True)
+def fetch_universe(tickers, cache_dir, period="5d", interval="5m"):
+    Path(cache_dir).mkdir(parents=True, exist_ok=True)
 
     ok = 0
     fail = 0
 
     for t in tickers:
-        out = cache_path(args.cache_dir, t, args.interval)
+        out = cache_path(cache_dir, t, interval)
         try:
-            fetch_one(t, out, args.period, args.interval)
+            fetch_one(t, out, period, interval)
             ok += 1
         except Exception as e:
             print(f"[FAIL] {t}: {e}")
             fail += 1
 
+    return ok, fail
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--universe", required=True, help="e.g. universe/nifty50.txt")
+    ap.add_argument("--cache_dir", default="datasets/cache", help="where to save csvs")
+    ap.add_argument("--period", default="5d")
+    ap.add_argument("--interval", default="5m")
+    args = ap.parse_args()
+
+    tickers = load_universe(args.universe)
+    ok, fail = fetch_universe(tickers, args.cache_dir, args.period, args.interval)
+
     print(f"\nDONE: ok={ok} fail={fail} cache_dir={args.cache_dir}")
 
 
@@ -0,0 +1,44 @@
+from importlib import import_module
+
+# name -> ("module:Class", constructor params taken from the CLI/scan config).
+# Modules are imported on first use so a run only pays for the strategies it
+# actually evaluates.
+REGISTRY = {
+    "mr": ("strategies.mean_reversion:MeanReversionStrategy", ("lookback", "threshold")),
+    "orb": ("strategies.orb:ORBStrategy", ("orb_minutes",)),
+    "vwap": ("strategies.vwap:VWAPStrategy", ("vwap_stop_mult", "vwap_target_mult")),
+}
+
+_loaded = {}
+
+
+def available():
+    return list(REGISTRY)
+
+
+def load_strategy_class(name: str):
+    cls = _loaded.get(name)
+    if cls is not None:
+        return cls
+
+    if name not in REGISTRY:
+        raise ValueError(f"Unknown strategy: {name}")
+
+    target, _ = REGISTRY[name]
+    module_name, cls_name = target.split(":")
+    cls = getattr(import_module(module_name), cls_name)
+    _loaded[name] = cls
+    return cls
+
+
+def strategy_params(name: str, params: dict) -> dict:
+    """Subset of `params` accepted by the named strategy's constructor."""
+    if name not in REGISTRY:
+        raise ValueError(f"Unknown strategy: {name}")
+    _, accepted = REGISTRY[name]
+    return {k: params[k] for k in accepted if k in params}
+
+
+def create_strategy(name: str, symbol: str, **params):
+    cls = load_strategy_class(name)
+    return cls(symbol, **strategy_params(name, params))
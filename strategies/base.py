@@ -1,44 +1,106 @@
-from abc import ABC, abstractmethod
-from typing import List, Optional
-from core.types import MarketBar, Signal
+import statistics
+from abc import ABC
+from collections import deque
+from itertools import islice
+from typing import Deque, Dict, List, Optional, Tuple, Union
+from core.checkpoint import bars_to_rows, rows_to_bars
+from core.types import MarketBar, Signal, SignalDraft
+from strategies import REGISTRY
+
+ATR_PERIOD = 14
+AVG_VOLUME_PERIOD = 20
 
 
 class Strategy(ABC):
+    name = ""  # registry key, see strategies/__init__.py
+    # Higher timeframes (e.g. ("15m", "1h")) the Engine should build from the
+    # base bars; completed bars are exposed as self.htf[tf].
+    timeframes: Tuple[str, ...] = ()
+    # Attributes that, together with the tail of `history`, make up the
+    # running state saved by get_state (see core/checkpoint.py).
+    state_fields: Tuple[str, ...] = ()
+
     def __init__(self, symbol: str):
         self.symbol = symbol
         self.history: List[MarketBar] = []
+        self.htf: Dict[str, List[MarketBar]] = {}
+        # Per-bar true ranges and volumes, so _atr/_avg_volume don't rescan
+        # history and cost nothing unless a signal (or filter) asks for them.
+        self._trs: Deque[float] = deque(maxlen=ATR_PERIOD)
+        self._vols: Deque[float] = deque(maxlen=AVG_VOLUME_PERIOD)
+
+    # A bar is processed in two steps so the Engine can skip evaluation
+    # (e.g. bars failing the liquidity/time pre-checks, see core/filters.py):
+    #   update(bar)  - all state changes; always runs
+    #   evaluate()   - pure check of the current state; returns a Signal or
+    #                  SignalDraft, or None
+    # Subclasses override evaluate() (or, for simple strategies,
+    # generate_signal()) and, if they keep state, update().
 
     def on_bar(self, bar: MarketBar) -> Optional[Signal]:
-        self.history.append(bar)
+        self.update(bar)
         return self.generate_signal()
 
-    def _atr(self, period: int = 14) -> float:
+    def update(self, bar: MarketBar):
+        self._track(bar)
+
+    def _track(self, bar: MarketBar):
+        h = self.history
+        if h:
+            prev = h[-1].close
+            self._trs.append(max(bar.high - bar.low, abs(bar.high - prev), abs(bar.low - prev)))
+        h.append(bar)
+        self._vols.append(bar.volume)
+
+    def evaluate(self) -> Optional[Union[Signal, SignalDraft]]:
+        return self.generate_signal()
+
+    def generate_signal(self) -> Optional[Signal]:
+        sig = self.evaluate()
+        return sig.materialize() if sig is not None else None
+
+    def params(self) -> dict:
+        """Constructor params, as listed in the registry."""
+        return {k: getattr(self, k) for k in REGISTRY[self.name][1]}
+
+    def history_needed(self) -> int:
+        """Bars of history generate_signal looks back over (ATR(14) needs 15, avg volume 20)."""
+        return 20
+
+    def get_state(self) -> dict:
+        state = {k: getattr(self, k) for k in self.state_fields}
+        state["history"] = bars_to_rows(self.history[-self.history_needed():])
+        return state
+
+    def set_state(self, state: dict):
+        for k in self.state_fields:
+            setattr(self, k, state[k])
+        self.history = []
+        self._trs.clear()
+        self._vols.clear()
+        for bar in rows_to_bars(self.symbol, state["history"]):
+            self._track(bar)
+
+    def _atr(self, period: int = ATR_PERIOD) -> float:
         if len(self.history) < period + 1:
             return 0.0
+        if period > len(self._trs):
+            trs = [
+                max(c.high - c.low, abs(c.high - p.close), abs(c.low - p.close))
+                for p, c in zip(self.history[-period - 1:-1], self.history[-period:])
+            ]
+        else:
+            trs = self._trs
 
+        # simple ATR: newest first, as the original loop summed them
         tr_sum = 0.0
-        # simple ATR calculation for now
-        for i in range(1, period + 1):
-            curr = self.history[-i]
-            prev = self.history[-i - 1]
-            tr = max(
-                curr.high - curr.low,
-                abs(curr.high - prev.close),
-                abs(curr.low - prev.close),
-            )
+        for tr in islice(reversed(trs), period):
             tr_sum += tr
-
         return tr_sum / period
 
-    def _avg_volume(self, period: int = 20) -> float:
+    def _avg_volume(self, period: int = AVG_VOLUME_PERIOD) -> float:
         if len(self.history) < period:
             return 0.0
-        
-        vols = [b.volume for b in self.history[-period:]]
-        import statistics
-        return statistics.mean(vols)
-
-    @abstractmethod
-    def generate_signal(self) -> Optional[Signal]:
-        raise NotImplementedError
-
+        if period > len(self._vols):
+            return statistics.mean([b.volume for b in self.history[-period:]])
+        return statistics.mean(list(self._vols)[-period:])
@@ -1,66 +1,78 @@
 import statistics
-from typing import Optional
-from core.types import Signal, Side
+from collections import deque
+from math import fsum
+from typing import Optional, Tuple
+from core.types import MarketBar, SignalDraft, Side
 from strategies.base import Strategy
 
+# Relative slack on the cheap SMA estimate; only bars this close to the
+# threshold pay for the exact statistics.mean below.
+_SMA_SLACK = 1e-9
+
 
 class MeanReversionStrategy(Strategy):
+    name = "mr"
+
     def __init__(self, symbol: str, lookback: int = 20, threshold: float = 0.02):
         super().__init__(symbol)
         self.lookback = lookback
         self.threshold = threshold
+        self._closes = deque(maxlen=lookback)
+
+    @classmethod
+    def reason(cls, side: Side, px: float, dev: float, sma: float, lookback: int) -> Tuple[str, tuple]:
+        """Reasoning template and args; core/panel.py builds its text through this too."""
+        args = (px, abs(dev) * 100, lookback, sma)
+        if side == Side.SELL:
+            return "Mean-reversion SELL: close {:.2f} is {:.2f}% above {}SMA {:.2f}", args
+        return "Mean-reversion BUY: close {:.2f} is {:.2f}% below {}SMA {:.2f}", args
 
-    def generate_signal(self) -> Optional[Signal]:
+    def history_needed(self) -> int:
+        return max(self.lookback + 1, super().history_needed())
+
+    def _track(self, bar: MarketBar):
+        super()._track(bar)
+        self._closes.append(bar.close)
+
+    def evaluate(self) -> Optional[SignalDraft]:
         if len(self.history) < self.lookback + 1:
             return None
 
-        closes = [b.close for b in self.history[-self.lookback:]]
-        sma = statistics.mean(closes)
         last = self.history[-1]
         px = last.close
 
-        dev = (px - sma) / sma
-
-        atr = self._atr(14)
-        avg_vol = self._avg_volume(20)
-        avg_val = avg_vol * px
+        # Most bars are nowhere near the threshold: reject them on an
+        # fsum-based SMA (within an ulp of the exact mean) without
+        # building anything.
+        est = fsum(self._closes) / self.lookback
+        if abs(px - est) <= self.threshold * est * (1.0 - _SMA_SLACK):
+            return None
 
-        meta = {
-            "sma": sma, 
-            "deviation": dev,
-            "atr": atr,
-            "avg_volume": avg_vol,
-            "avg_value": avg_val,
-        }
+        sma = statistics.mean(self._closes)
+        dev = (px - sma) / sma
 
         # 1R stop default: 1% away (placeholder). We’ll later use ATR.
         if dev > self.threshold:
             stop = px * 1.01
-            return Signal(
-                symbol=self.symbol,
-                timestamp=last.timestamp,
-                side=Side.SELL,
-                entry=px,
-                stop=stop,
-                targets=[sma],
-                confidence=min(abs(dev) * 10, 1.0),
-                reasoning=f"Mean-reversion SELL: close {px:.2f} is {dev*100:.2f}% above {self.lookback}SMA {sma:.2f}",
-                meta=meta,
-            )
-
-        if dev < -self.threshold:
+            side = Side.SELL
+        elif dev < -self.threshold:
             stop = px * 0.99
-            return Signal(
-                symbol=self.symbol,
-                timestamp=last.timestamp,
-                side=Side.BUY,
-                entry=px,
-                stop=stop,
-                targets=[sma],
-                confidence=min(abs(dev) * 10, 1.0),
-                reasoning=f"Mean-reversion BUY: close {px:.2f} is {abs(dev)*100:.2f}% below {self.lookback}SMA {sma:.2f}",
-                meta=meta,
-            )
-
-        return None
+            side = Side.BUY
+        else:
+            return None
+        template, args = self.reason(side, px, dev, sma, self.lookback)
 
+        return SignalDraft(
+            symbol=self.symbol,
+            timestamp=last.timestamp,
+            side=side,
+            entry=px,
+            stop=stop,
+            targets=[sma],
+            confidence=min(abs(dev) * 10, 1.0),
+            atr=self._atr(14),
+            avg_volume=self._avg_volume(20),
+            extras=(("sma", sma), ("deviation", dev)),
+            template=template,
+            args=args,
+        )
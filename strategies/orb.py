@@ -1,114 +1,104 @@
-from datetime import datetime, timedelta
-from typing import Optional
-from core.types import Signal, Side
+from typing import Optional, Tuple
+from core.types import MarketBar, SignalDraft, Side
 from strategies.base import Strategy
-from data.calendar_nse import MARKET_OPEN
+from data.calendar_nse import slots_for_minutes
 
 
 class ORBStrategy(Strategy):
+    name = "orb"
+    state_fields = ("current_day", "orb_high", "orb_low", "orb_complete", "entry_taken")
+
     def __init__(self, symbol: str, orb_minutes: int = 15):
         super().__init__(symbol)
         self.orb_minutes = orb_minutes
-        self.current_date = None
+        # Bars in session slots [0, orb_slots) form the opening range.
+        self.orb_slots = slots_for_minutes(orb_minutes)
+        self.current_day = None
         self.orb_high = -float('inf')
         self.orb_low = float('inf')
         self.orb_complete = False
         self.entry_taken = False
+        # Side of a breakout on the latest bar (set by update, read by evaluate).
+        self.breakout: Optional[Side] = None
+
+    @classmethod
+    def reason(cls, side: Side, px: float, orb_high: float, orb_low: float) -> Tuple[str, tuple]:
+        """Reasoning template and args; core/panel.py builds its text through this too."""
+        if side == Side.BUY:
+            return "ORB Buy: Close {} > Range High {}", (px, orb_high)
+        return "ORB Sell: Close {} < Range Low {}", (px, orb_low)
+
+    def update(self, bar: MarketBar):
+        super().update(bar)
+        self.breakout = None
 
-    def generate_signal(self) -> Optional[Signal]:
-        bar = self.history[-1]
-        
         # Reset on new day
-        if self.current_date != bar.timestamp.date():
-            self.current_date = bar.timestamp.date()
+        if self.current_day != bar.day:
+            self.current_day = bar.day
             self.orb_high = -float('inf')
             self.orb_low = float('inf')
             self.orb_complete = False
             self.entry_taken = False
 
         if self.entry_taken:
-            return None
+            return
 
-        # Calculate ORB end time
-        orb_start_dt = datetime.combine(self.current_date, MARKET_OPEN)
-        orb_end_dt = orb_start_dt + timedelta(minutes=self.orb_minutes)
-        
-        # If inside ORB period, update high/low
-        if bar.timestamp < orb_end_dt:
-            # If pre-market data exists (before 9:15), ignore it or assume it's part of opening? 
-            # Usually data starts at 9:15.
-            if bar.timestamp >= orb_start_dt:
+        # If inside ORB period, update high/low. Only fetched data goes through
+        # data/cleaning.py, so pre-open bars (negative slots, e.g. a CSV in
+        # UTC) can still show up here and are ignored.
+        if bar.slot < self.orb_slots:
+            if bar.slot >= 0:
                 self.orb_high = max(self.orb_high, bar.high)
                 self.orb_low = min(self.orb_low, bar.low)
-            return None
-        
+            return
+
         # Range complete
         self.orb_complete = True
-        
-        # Check breakout
-        px = bar.close
-        
-        # Calculate common metrics
-        atr = self._atr()
-        avg_vol = self._avg_volume()
-        avg_val = avg_vol * px
-        
-        meta = {
-            "orb_high": self.orb_high,
-            "orb_low": self.orb_low,
-            "atr": atr,
-            "avg_volume": avg_vol,
-            "avg_value": avg_val
-        }
 
         # Need valid range
         if self.orb_high == -float('inf') or self.orb_low == float('inf'):
+            return
+
+        # Check breakout; one entry per day, taken on the first breakout bar
+        # with positive risk whether or not the signal is reported.
+        px = bar.close
+        if px > self.orb_high and px - self.orb_low > 0:
+            self.breakout = Side.BUY
+        elif px < self.orb_low and self.orb_high - px > 0:
+            self.breakout = Side.SELL
+        if self.breakout is not None:
+            self.entry_taken = True
+
+    def evaluate(self) -> Optional[SignalDraft]:
+        if self.breakout is None:
             return None
 
-        signal = None
-        
-        if px > self.orb_high:
+        bar = self.history[-1]
+        px = bar.close
+
+        if self.breakout == Side.BUY:
             # ORB Buy
             stop = self.orb_low
             risk = px - stop
-            
-            # Sanity check risk (if range is huge)
-            # For now, raw ORB validation
-            
-            if risk > 0:
-                target = px + 1.5 * risk
-                signal = Signal(
-                    symbol=self.symbol,
-                    timestamp=bar.timestamp,
-                    side=Side.BUY,
-                    entry=px,
-                    stop=stop,
-                    targets=[target],
-                    confidence=0.7,
-                    reasoning=f"ORB Buy: Close {px} > Range High {self.orb_high}",
-                    meta=meta
-                )
-
-        elif px < self.orb_low:
+            target = px + 1.5 * risk
+        else:
             # ORB Sell
             stop = self.orb_high
             risk = stop - px
-            if risk > 0:
-                target = px - 1.5 * risk
-                signal = Signal(
-                    symbol=self.symbol,
-                    timestamp=bar.timestamp,
-                    side=Side.SELL,
-                    entry=px,
-                    stop=stop,
-                    targets=[target],
-                    confidence=0.7,
-                    reasoning=f"ORB Sell: Close {px} < Range Low {self.orb_low}",
-                    meta=meta
-                )
-        
-        if signal:
-            self.entry_taken = True
-            return signal
-            
-        return None
+            target = px - 1.5 * risk
+        template, args = self.reason(self.breakout, px, self.orb_high, self.orb_low)
+
+        return SignalDraft(
+            symbol=self.symbol,
+            timestamp=bar.timestamp,
+            side=self.breakout,
+            entry=px,
+            stop=stop,
+            targets=[target],
+            confidence=0.7,
+            atr=self._atr(),
+            avg_volume=self._avg_volume(),
+            extras=(("orb_high", self.orb_high), ("orb_low", self.orb_low)),
+            template=template,
+            args=args,
+        )
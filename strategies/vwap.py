@@ -1,108 +1,94 @@
-from typing import Optional
-from core.types import Signal, Side
+from typing import Optional, Tuple
+from core.types import MarketBar, SignalDraft, Side
 from strategies.base import Strategy
 
 
 class VWAPStrategy(Strategy):
-    def __init__(self, symbol: str):
+    name = "vwap"
+    state_fields = ("current_day", "cum_vol", "cum_pv", "vwap", "prev_vwap")
+
+    def __init__(self, symbol: str, vwap_stop_mult: float = 1.0, vwap_target_mult: float = 1.5):
         super().__init__(symbol)
-        self.current_date = None
+        self.vwap_stop_mult = vwap_stop_mult      # stop distance in ATRs
+        self.vwap_target_mult = vwap_target_mult  # target distance in multiples of the stop
+        self.current_day = None
         self.cum_vol = 0.0
         self.cum_pv = 0.0
-        self.prev_vwap = None
+        self.vwap = None       # session VWAP after the latest bar
+        self.prev_vwap = None  # ... after the previous bar of the session
+
+    def update(self, bar: MarketBar):
+        super().update(bar)
 
-    def generate_signal(self) -> Optional[Signal]:
-        bar = self.history[-1]
-        
         # Reset on new day
-        if self.current_date != bar.timestamp.date():
-            self.current_date = bar.timestamp.date()
+        if self.current_day != bar.day:
+            self.current_day = bar.day
             self.cum_vol = 0.0
             self.cum_pv = 0.0
+            self.vwap = None
             self.prev_vwap = None
 
         # Update VWAP
         current_pv = (bar.high + bar.low + bar.close) / 3 * bar.volume
         self.cum_pv += current_pv
         self.cum_vol += bar.volume
-        
+
+        self.prev_vwap = self.vwap
         if self.cum_vol == 0:
-            return None
-            
-        vwap = self.cum_pv / self.cum_vol
-        
-        # Need at least 2 bars of data/vwap to detect crossover
-        # We need the PREVIOUS bar's VWAP and Close to detect crossover
-        if len(self.history) < 2 or self.prev_vwap is None:
-            self.prev_vwap = vwap
+            return
+        self.vwap = self.cum_pv / self.cum_vol
+
+    @classmethod
+    def reason(cls, side: Side, px: float, vwap: float) -> Tuple[str, tuple]:
+        """Reasoning template and args; core/panel.py builds its text through this too."""
+        if side == Side.BUY:
+            return "VWAP Reclaim: Close {:.2f} crossed above VWAP {:.2f}", (px, vwap)
+        return "VWAP Breakdown: Close {:.2f} crossed below VWAP {:.2f}", (px, vwap)
+
+    def evaluate(self) -> Optional[SignalDraft]:
+        # Need the PREVIOUS bar's VWAP and Close to detect crossover
+        if self.cum_vol == 0 or len(self.history) < 2 or self.prev_vwap is None:
             return None
 
-        # Check Crossover
+        bar = self.history[-1]
+        # Ensure previous bar was same day (sanity check, though reset handled in update)
         prev_bar = self.history[-2]
-        # Ensure previous bar was same day (sanity check, though reset handled above)
-        if prev_bar.timestamp.date() != self.current_date:
-            self.prev_vwap = vwap
+        if prev_bar.day != self.current_day:
             return None
 
-        signal = None
-        px = bar.close
-        
-        # Metrics
-        atr = self._atr()
-        avg_vol = self._avg_volume()
-        avg_val = avg_vol * px
-        
-        meta = {
-            "vwap": vwap,
-            "atr": atr,
-            "avg_volume": avg_vol,
-            "avg_value": avg_val
-        }
-
-        # Logic: 
+        # Logic:
         # Buy: Prev Close < Prev VWAP AND Curr Close > Curr VWAP (Reclaim from below)
         # Sell: Prev Close > Prev VWAP AND Curr Close < Curr VWAP (Breakdown)
-        
-        # Stop loss: For now fixed % (0.5%) or ATR based. Let's use 1*ATR if available, else 0.5%
-        risk_pct = 0.005
-        if atr > 0:
-            risk_amt = atr
-        else:
-            risk_amt = px * risk_pct
-
+        px = bar.close
+        vwap = self.vwap
         if prev_bar.close < self.prev_vwap and px > vwap:
-            # Bullish Crossover
-            stop = px - risk_amt
-            target = px + 1.5 * risk_amt
-            signal = Signal(
-                symbol=self.symbol,
-                timestamp=bar.timestamp,
-                side=Side.BUY,
-                entry=px,
-                stop=stop,
-                targets=[target],
-                confidence=0.6,
-                reasoning=f"VWAP Reclaim: Close {px:.2f} crossed above VWAP {vwap:.2f}",
-                meta=meta
-            )
-
+            side = Side.BUY
         elif prev_bar.close > self.prev_vwap and px < vwap:
-            # Bearish Breakdown
-            stop = px + risk_amt
-            target = px - 1.5 * risk_amt
-            signal = Signal(
-                symbol=self.symbol,
-                timestamp=bar.timestamp,
-                side=Side.SELL,
-                entry=px,
-                stop=stop,
-                targets=[target],
-                confidence=0.6,
-                reasoning=f"VWAP Breakdown: Close {px:.2f} crossed below VWAP {vwap:.2f}",
-                meta=meta
-            )
+            side = Side.SELL
+        else:
+            return None
+        template, args = self.reason(side, px, vwap)
+
+        # Stop loss: vwap_stop_mult * ATR if available, else that many 0.5%s
+        atr = self._atr()
+        risk_amt = self.vwap_stop_mult * (atr if atr > 0 else px * 0.005)
+        reward = self.vwap_target_mult * risk_amt
+        if side == Side.BUY:
+            stop, target = px - risk_amt, px + reward
+        else:
+            stop, target = px + risk_amt, px - reward
 
-        # Update prev state
-        self.prev_vwap = vwap
-        
-        return signal
+        return SignalDraft(
+            symbol=self.symbol,
+            timestamp=bar.timestamp,
+            side=side,
+            entry=px,
+            stop=stop,
+            targets=[target],
+            confidence=0.6,
+            atr=atr,
+            avg_volume=self._avg_volume(),
+            extras=(("vwap", vwap),),
+            template=template,
+            args=args,
+        )
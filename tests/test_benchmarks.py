@@ -0,0 +1,24 @@
+from benchmarks.suite import compare, run_suite
+from benchmarks.synthetic import generate_bars
+from data.calendar_nse import MARKET_CLOSE, MARKET_OPEN
+
+
+def test_synthetic_bars_deterministic_and_in_session():
+    a = generate_bars("SYN000", days=2, seed=7)
+    b = generate_bars("SYN000", days=2, seed=7)
+    assert a == b
+    assert len(a) == 2 * 75
+    assert all(MARKET_OPEN <= x.timestamp.time() < MARKET_CLOSE for x in a)
+    assert all(x.low <= min(x.open, x.close) and x.high >= max(x.open, x.close) for x in a)
+
+
+def test_suite_runs_and_compare_flags_regressions():
+    res = run_suite("tiny", repeat=1)
+    assert res["results"]["load_csv"]["bars"] == 75
+    assert "engine.backtest.mr" in res["results"]
+
+    slower = {"meta": res["meta"], "results": {
+        k: dict(v, seconds=v["seconds"] * 2) for k, v in res["results"].items()
+    }}
+    assert compare(res, res, 0.25) == []
+    assert {r["case"] for r in compare(slower, res, 0.25)} == set(res["results"])
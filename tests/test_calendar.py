@@ -0,0 +1,34 @@
+from datetime import date, datetime
+
+import pytest
+
+from data.calendar_nse import (
+    ENTRY_CUTOFF_SLOT, FORCE_SQUAREOFF_SLOT, SLOTS_PER_SESSION,
+    is_trading_day, session_slot, slot_time, trading_days,
+)
+
+
+def test_session_slots():
+    assert SLOTS_PER_SESSION == 75
+    assert session_slot(datetime(2026, 2, 17, 9, 15))[1] == 0
+    assert session_slot(datetime(2026, 2, 17, 9, 19, 59))[1] == 0
+    assert session_slot(datetime(2026, 2, 17, 9, 10))[1] < 0
+    assert slot_time(ENTRY_CUTOFF_SLOT).strftime("%H:%M") == "15:10"
+    assert slot_time(FORCE_SQUAREOFF_SLOT).strftime("%H:%M") == "15:20"
+
+
+def test_trading_days_skip_weekends_and_holidays():
+    assert not is_trading_day(date(2026, 1, 26))  # Republic Day
+    days = trading_days(date(2026, 1, 23), date(2026, 1, 28))
+    assert days == [date(2026, 1, 23), date(2026, 1, 27), date(2026, 1, 28)]
+
+
+def test_vectorized_slots_match_scalar():
+    np = pytest.importorskip("numpy")
+    from data.calendar_nse import session_slots, slot_gaps
+
+    ts = [datetime(2026, 2, 17, 9, 15), datetime(2026, 2, 17, 9, 20),
+          datetime(2026, 2, 17, 9, 35), datetime(2026, 2, 18, 9, 15)]
+    days, slots = session_slots(np.array(ts, dtype="datetime64[m]"))
+    assert [(int(d), int(s)) for d, s in zip(days, slots)] == [session_slot(t) for t in ts]
+    assert slot_gaps(days, slots).tolist() == [0, 0, 2, 0]
@@ -0,0 +1,51 @@
+from datetime import date
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from benchmarks.synthetic import generate_bars, write_csv
+from data import chart
+
+
+def _cols(tmp_path, days=60):
+    path = str(tmp_path / "SYN.NS_5m.csv")
+    write_csv(generate_bars("SYN", days=days, start=date(2025, 1, 1)), path)
+    return chart.csv_columns(path)
+
+
+def test_range_is_downsampled_to_max_points(tmp_path):
+    cols = _cols(tmp_path)
+    out, res = chart.query(cols, max_points=300)
+    assert res == "2h" and len(out["ts"]) == 4 * 60  # 08:00, 10:00, 12:00, 14:00 buckets
+    out, res = chart.query(cols, max_points=200)
+    assert res == "1d" and len(out["ts"]) == 60
+    assert out["high"].max() == cols["high"].max()
+    assert np.isclose(out["volume"].sum(), cols["volume"].sum())
+    assert out["open"][0] == cols["open"][0] and out["close"][-1] == cols["close"][-1]
+
+    day, res = chart.query(cols, start=date(2025, 1, 2), end=date(2025, 1, 2), max_points=100)
+    assert res == "5m" and len(day["ts"]) == 75
+
+
+def test_since_returns_only_the_open_bucket_and_newer(tmp_path):
+    cols = _cols(tmp_path, days=3)
+    last = int(cols["ts"][-10])
+    out, _ = chart.query(cols, since=last)
+    assert out["ts"].tolist() == cols["ts"][-10:].tolist()
+
+    hourly, res = chart.query(cols, since=last, resolution="1h")
+    full, _ = chart.query(cols, resolution="1h")
+    assert res == "1h" and 1 <= len(hourly["ts"]) <= 2
+    assert hourly["close"].tolist() == full["close"][-len(hourly["ts"]):].tolist()
+    with pytest.raises(ValueError):
+        chart.query(cols, resolution="7m")
+
+
+def test_packed_f32_roundtrip(tmp_path):
+    out, _ = chart.query(_cols(tmp_path), max_points=500)
+    payload, base = chart.pack_f32(out)
+    assert len(payload) == 6 * 4 * len(out["ts"])
+    back = chart.unpack_f32(payload, base)
+    assert back["ts"].tolist() == out["ts"].tolist()
+    assert np.allclose(back["close"], out["close"], rtol=1e-6)
@@ -0,0 +1,40 @@
+from dataclasses import replace
+
+from benchmarks.synthetic import generate_bars
+from core.scanner import run_bars
+from core.types import RunMode
+from strategies import available
+
+PARAMS = {"lookback": 20, "threshold": 0.003, "orb_minutes": 15}
+
+
+def test_resume_only_processes_new_bars(tmp_path):
+    bars = generate_bars("SYN000", days=3)
+    cut = 75 + 40  # mid-session, so VWAP/ORB day state is carried over
+    for name in available():
+        ckpt = str(tmp_path / f"{name}.json")
+        full = run_bars(bars, "SYN000", name, RunMode.SIGNAL, 1e5, PARAMS)
+        run_bars(bars[:cut], "SYN000", name, RunMode.SIGNAL, 1e5, PARAMS, checkpoint=ckpt)
+        resumed = run_bars(bars, "SYN000", name, RunMode.SIGNAL, 1e5, PARAMS, checkpoint=ckpt)
+
+        assert len(resumed.strategy.history) < len(bars)
+        expected = [s for s in full.signals if s.timestamp > bars[cut - 1].timestamp]
+        assert expected and resumed.signals == expected, name
+
+
+def test_checkpoint_invalidated_by_params_or_data(tmp_path):
+    bars = generate_bars("SYN000", days=2)
+    ckpt = str(tmp_path / "mr.json")
+    run_bars(bars[:100], "SYN000", "mr", RunMode.SIGNAL, 1e5, PARAMS, checkpoint=ckpt)
+
+    # Different params: full replay.
+    other = dict(PARAMS, lookback=10)
+    eng = run_bars(bars, "SYN000", "mr", RunMode.SIGNAL, 1e5, other, checkpoint=ckpt)
+    assert len(eng.strategy.history) == len(bars)
+
+    # Rewritten bar inside the fingerprinted span: full replay.
+    run_bars(bars[:100], "SYN000", "mr", RunMode.SIGNAL, 1e5, PARAMS, checkpoint=ckpt)
+    changed = list(bars)
+    changed[95] = replace(bars[95], close=bars[95].close + 1.0)
+    eng = run_bars(changed, "SYN000", "mr", RunMode.SIGNAL, 1e5, PARAMS, checkpoint=ckpt)
+    assert len(eng.strategy.history) == len(bars)
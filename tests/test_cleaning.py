@@ -0,0 +1,41 @@
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from data.cleaning import clean_ohlcv
+
+
+def test_clean_ohlcv_drops_bad_rows_and_flags_gaps():
+    df = pd.DataFrame({
+        "timestamp": [
+            "2026-02-17T09:10:00",  # pre-open
+            "2026-02-17T09:15:00",
+            "2026-02-17T09:15:00",  # duplicate, this one wins
+            "2026-02-17T09:20:00",  # high < low
+            "2026-02-17T09:30:00",  # after a missing 09:25 bar
+            "2026-02-17T09:35:00",  # zero volume
+            "2026-02-21T09:15:00",  # Saturday
+        ],
+        "open":   [100, 100, 101, 100, 100, 100, 100],
+        "high":   [101, 101, 102, 99, 101, 101, 101],
+        "low":    [99, 99, 100, 100, 99, 99, 99],
+        "close":  [100, 100, 101, 100, 100, 100, 100],
+        "volume": [10, 10, 20, 10, 10, 0, 10],
+    })
+    clean, rep = clean_ohlcv(df)
+
+    assert clean["timestamp"].tolist() == ["2026-02-17T09:15:00", "2026-02-17T09:30:00"]
+    assert clean["volume"].tolist()[0] == 20
+    assert rep["duplicates"] == 1
+    assert rep["out_of_session"] == 1
+    assert rep["non_trading_day"] == 1
+    assert rep["invalid_ohlc"] == 1
+    assert rep["zero_volume"] == 1
+    assert rep["missing_bars"] == 2
+
+
+def test_clean_ohlcv_converts_utc_to_exchange_time():
+    df = pd.DataFrame({"timestamp": ["2026-02-17T03:45:00"], "open": [1.0], "high": [1.0],
+                       "low": [1.0], "close": [1.0], "volume": [5]})
+    clean, _ = clean_ohlcv(df, source_tz="UTC")
+    assert clean["timestamp"].tolist() == ["2026-02-17T09:15:00"]
@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from core.panel import panel_from_bars
+from core.types import MarketBar, Side, Signal
+from portfolio.portfolio import Portfolio
+from risk.correlation import CorrelationRiskGovernor, RollingCovariance, size_panel_signals
+from risk.governor import RiskGovernor
+
+
+def test_rank_one_updates_match_full_covariance():
+    rng = np.random.default_rng(0)
+    rets = rng.normal(0, 0.01, size=(130, 6))
+    cov = RollingCovariance([f"S{i}" for i in range(6)], window=50)
+    for t, r in enumerate(rets, 1):
+        cov.push(r)
+        if t >= 2:
+            want = np.cov(rets[max(0, t - 50):t], rowvar=False)
+            assert np.allclose(cov.matrix(), want, atol=1e-12), t
+            assert np.allclose(cov.row(3), want[3], atol=1e-12)
+
+
+def _signal(sym, side=Side.BUY):
+    stop = 99.0 if side == Side.BUY else 101.0
+    return Signal(sym, datetime(2026, 1, 5, 10, 0), side, 100.0, stop, [102.0], 0.5, "test")
+
+
+def test_correlated_signals_are_scaled_down_or_rejected():
+    rng = np.random.default_rng(1)
+    common = rng.normal(0, 0.001, 300)  # ~0.9% daily vol
+    own = rng.normal(0, 0.001, 300)
+    gov = CorrelationRiskGovernor(["BANK1", "BANK2", "IT"], window=300, max_marginal_vol_pct=0.005)
+    for r in np.column_stack([common, common + rng.normal(0, 0.0001, 300), own]):
+        gov.cov.push(r)
+    pf = Portfolio(100000.0)
+    base = RiskGovernor().size_position(pf, _signal("BANK1"))
+
+    first = gov.size_position(pf, _signal("BANK1"))
+    assert first == base  # empty book: only the standalone limit applies
+    gov.add(_signal("BANK1"), first)
+
+    second = gov.size_position(pf, _signal("BANK2"))
+    assert base * 0.25 <= second < base and gov.scaled == 1
+    assert gov.size_position(pf, _signal("BANK2", Side.SELL)) == base  # hedges the book
+    assert gov.size_position(pf, _signal("IT")) == base  # uncorrelated
+    assert gov.marginal_variance("BANK2", 100.0 * base) > gov.marginal_variance("IT", 100.0 * base)
+
+    gov.add(_signal("BANK1"), 3 * first)
+    assert gov.size_position(pf, _signal("BANK2")) == 0 and gov.rejected == 1
+
+
+def test_panel_positions_leave_the_book_at_their_target():
+    # Two sessions of two near-identical bank stocks; the first warms up the covariance.
+    rng = np.random.default_rng(2)
+    common = rng.normal(0, 0.001, 150)
+    bars = {}
+    for sym, noise in (("BANK1", 0.0), ("BANK2", 0.0001)):
+        px = 100.0 * np.cumprod(1 + common + rng.normal(0, noise, 150))
+        bars[sym] = [MarketBar(sym, datetime(2026, 1, 5 + i // 75, 9, 15) + timedelta(minutes=5 * (i % 75)),
+                               c, c * 1.0005, c * 0.9995, c, 1000.0) for i, c in enumerate(px)]
+    panel = panel_from_bars(bars)
+
+    def signal(sym, i, target):
+        b = bars[sym][i]
+        return Signal(sym, b.timestamp, Side.BUY, b.close, b.close - 1.0, [target], 0.5, "test", meta={})
+
+    first, second = 85, 105  # session 2, slots 10 and 30
+    between = bars["BANK1"][first + 1:second]
+    assert min(b.low for b in between) > bars["BANK1"][first].close - 1.0  # stop never reached
+
+    def run(target):
+        sigs = [signal("BANK1", first, target), signal("BANK2", second, 1000.0)]
+        gov = CorrelationRiskGovernor(panel.symbols, window=150, max_marginal_vol_pct=0.005)
+        kept = size_panel_signals(panel, sigs, gov, Portfolio(100000.0))
+        return {s.symbol: s.meta["corr_scale"] for s in kept}, gov
+
+    # BANK1 is still open when BANK2 fires: BANK2 adds to a correlated book.
+    held, gov = run(1000.0)
+    assert held["BANK1"] == 1.0 and held.get("BANK2", 0.0) < 1.0 and gov.exited == 0
+
+    # BANK1 hit its target in between: the book is flat again.
+    closed, gov = run(max(b.high for b in between))
+    assert closed == {"BANK1": 1.0, "BANK2": 1.0} and gov.exited == 1 and not gov.open
@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta
+
+from benchmarks.synthetic import write_csv
+from core.engine import Engine
+from core.types import MarketBar, RunMode, Side, Signal
+from data.cache import cache_path
+from execution.drilldown import DrillDown
+from strategies.base import Strategy
+
+T0 = datetime(2026, 1, 5, 9, 15)
+
+
+class _OneShot(Strategy):
+    """BUY at 100 on the first bar, stop 99, target 101."""
+
+    def generate_signal(self):
+        if len(self.history) != 1:
+            return None
+        b = self.history[-1]
+        return Signal(b.symbol, b.timestamp, Side.BUY, 100.0, 99.0, [101.0], 1.0, "test")
+
+
+def _bar(i, o, h, l, c, minutes=5):
+    return MarketBar("ABC", T0 + timedelta(minutes=i * minutes), o, h, l, c, 1000.0)
+
+
+def _five_minute():
+    # Bar 1 touches both the stop (99) and the target (101).
+    return [_bar(0, 100, 100.2, 99.8, 100), _bar(1, 100, 101.5, 98.5, 100), _bar(2, 100, 100.1, 99.9, 100)]
+
+
+def _one_minute(target_first):
+    path = [(100, 101.2, 99.9, 101), (101, 101, 98.8, 99)]
+    if not target_first:
+        path.reverse()
+    rows = [_bar(i, 100, 100.2, 99.8, 100, 1) for i in range(5)]
+    rows += [_bar(5 + i, *p, minutes=1) for i, p in enumerate(path)]
+    rows += [_bar(7 + i, 100, 100.1, 99.9, 100, 1) for i in range(8)]
+    return rows
+
+
+def _run(drilldown, bars=None, target_exits=True):
+    eng = Engine(_OneShot("ABC"), RunMode.BACKTEST, drilldown=drilldown, target_exits=target_exits)
+    eng.exec.slippage_bps = 0
+    eng.run(bars or _five_minute())
+    return eng.trades
+
+
+def test_ambiguous_bar_uses_finer_bars(tmp_path):
+    assert _run(None)[0]["exit_tag"] == "stop"  # no finer data: conservative
+
+    for target_first, tag in ((True, "target"), (False, "stop")):
+        cache = tmp_path / str(target_first)
+        write_csv(_one_minute(target_first), cache_path(str(cache), "ABC", "1m"))
+        dd = DrillDown("ABC", "ABC", str(cache))
+        trades = _run(dd)
+        assert [t["exit_tag"] for t in trades] == [tag]
+        assert trades[0]["exit"] == (101.0 if tag == "target" else 99.0)
+        assert dd.stats() == {"resolved": 1, "missing": 0, "loads": 1, "hits": 0}
+
+
+def test_missing_window_and_lru(tmp_path):
+    write_csv(_one_minute(True), cache_path(str(tmp_path), "ABC", "1m"))
+    dd = DrillDown("ABC", "ABC", str(tmp_path), max_windows=1)
+    bar = _five_minute()[1]
+    assert dd.resolve(bar, Side.BUY, 99.0, 101.0) == "target"
+    assert dd.resolve(bar, Side.BUY, 99.0, 101.0) == "target"
+    later = MarketBar("ABC", T0 + timedelta(days=1), 100, 102, 98, 100, 1.0)
+    assert dd.resolve(later, Side.BUY, 99.0, 101.0) == "stop"
+    assert dd.stats() == {"resolved": 2, "missing": 1, "loads": 2, "hits": 1}
+
+
+def test_targets_are_opt_in():
+    bars = [_bar(0, 100, 100.2, 99.8, 100), _bar(1, 100, 101.5, 99.5, 101)]
+    assert _run(None, bars)[0]["exit_tag"] == "target"
+    assert _run(None, bars, target_exits=False) == []  # still open: stop or square-off only
+
+
+def test_entry_bar_stop_is_checked_with_and_without_drilldown(tmp_path):
+    # The entry bar itself trades through the stop (and the target).
+    bars = [_bar(0, 100, 101.5, 98.5, 100), _bar(1, 100, 100.1, 99.9, 100)]
+    write_csv(_one_minute(True), cache_path(str(tmp_path), "ABC", "1m"))
+    dd = DrillDown("ABC", "ABC", str(tmp_path))
+    for drilldown in (None, dd):
+        trades = _run(drilldown, bars)
+        assert [(t["exit_tag"], t["exit"]) for t in trades] == [("stop", 99.0)]
+    assert dd.stats()["resolved"] == 0
+
+
+def test_window_bisects_the_csv_and_skips_blank_lines(tmp_path):
+    rows = [MarketBar("ABC", datetime(2026, 1, d, 9, 15) + timedelta(minutes=i), 100, 101, 99, 100, 1.0)
+            for d in (5, 6, 8) for i in range(0, 375, 7)]
+    path = cache_path(str(tmp_path), "ABC", "1m")
+    write_csv(rows, path)
+    with open(path) as f:
+        lines = f.read().splitlines()
+    with open(path, "w") as f:  # stray blank lines in the middle and at the end
+        f.write("\n".join(lines[:40] + [""] + lines[40:]) + "\n\n")
+
+    dd = DrillDown("ABC", "ABC", str(tmp_path))
+    for d in (4, 5, 6, 7, 8, 9):
+        day = datetime(2026, 1, d).toordinal()
+        assert dd.window(day) == [b for b in rows if b.day == day], d
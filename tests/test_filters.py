@@ -0,0 +1,40 @@
+from datetime import time
+
+from benchmarks.synthetic import generate_bars
+from core.engine import Engine
+from core.filters import compile_bar_filter
+from core.types import RunMode, SignalDraft
+from reporting.watchlist import compile_filter
+from strategies import available, create_strategy
+
+PARAMS = {"lookback": 10, "threshold": 0.003, "orb_minutes": 15}
+
+
+def test_prefilter_matches_filtering_signals_afterwards():
+    bars = generate_bars("SYN001", days=4, seed=5)
+    filters = {"min_avg_volume": 150000, "min_atr": 1.0, "time_start": time(9, 45), "time_end": time(14, 30)}
+    post = compile_filter(**filters)
+    pre = compile_bar_filter(**filters)
+
+    for name in available():
+        full = Engine(create_strategy(name, "SYN001", **PARAMS), RunMode.SIGNAL)
+        full.run(bars)
+        pushed = Engine(create_strategy(name, "SYN001", **PARAMS), RunMode.SIGNAL, prefilter=pre)
+        pushed.run(bars)
+
+        want = [s for s in full.signals if post(s)]
+        assert want and len(want) < len(full.signals), name
+        assert pushed.signals == want, name
+
+
+def test_drafts_are_lazy_and_materialize_like_signals():
+    bars = generate_bars("SYN002", days=2)
+    eng = Engine(create_strategy("mr", "SYN002", **PARAMS), RunMode.SIGNAL)
+    eng.run(bars)
+    d = eng.drafts[0]
+    assert isinstance(d, SignalDraft)
+    s = d.materialize("[MR] ")
+    assert s.reasoning.startswith("[MR] Mean-reversion") and list(s.meta) == [
+        "sma", "deviation", "atr", "avg_volume", "avg_value"
+    ]
+    assert compile_bar_filter() is None
@@ -0,0 +1,69 @@
+from datetime import datetime, time, timedelta
+
+from benchmarks.synthetic import generate_bars, write_csv
+from core.gating import SignalGate, make_gate
+from core.scanner import ScanConfig, run_bars, scan_symbol
+from core.types import MarketBar, RunMode, Side, Signal
+from data.cache import cache_path
+
+PARAMS = {"lookback": 10, "threshold": 0.002}
+
+
+def _feed(gate, sides, entries=None, day=datetime(2026, 1, 5, 9, 15)):
+    out = []
+    for i, side in enumerate(sides):
+        ts = day + timedelta(minutes=5 * i)
+        bar = MarketBar("X", ts, 100.0, 100.0, 100.0, 100.0, 1.0)
+        entry = entries[i] if entries else 100.0
+        sig = Signal("X", ts, side, entry, entry - 1, [entry + 1], 0.5, "t") if side else None
+        out.append(gate(sig, bar) is not None)
+    return out
+
+
+def test_rules():
+    B, S = Side.BUY, Side.SELL
+    assert make_gate() is None
+    assert _feed(SignalGate(on_change=True), [B, B, B, None, B, S, S]) == [1, 0, 0, 0, 1, 1, 0]
+    assert _feed(SignalGate(cooldown_bars=2), [B, S, B, B, None, S]) == [1, 0, 0, 1, 0, 0]
+    moves = [100.0, 100.2, 100.6, 100.7, 101.2]
+    assert _feed(SignalGate(min_move=0.005), [B] * 5, moves) == [1, 0, 1, 0, 1]
+    # A new session starts clean.
+    gate = SignalGate(on_change=True, cooldown_bars=100)
+    _feed(gate, [B, B])
+    assert _feed(gate, [B], day=datetime(2026, 1, 6, 9, 15)) == [1]
+    assert gate.suppressed == 1
+
+
+def test_engine_reports_gated_signals_but_trades_on_raw_ones():
+    bars = generate_bars("SYN", days=5, seed=4)
+    raw = run_bars(bars, "SYN", "mr", RunMode.BACKTEST, 1e5, PARAMS)
+    gated = run_bars(bars, "SYN", "mr", RunMode.BACKTEST, 1e5, PARAMS, gating={"on_change": True})
+    assert gated.trades == raw.trades
+    s = gated.summary()
+    assert s["num_signals"] + s["num_suppressed"] == len(raw.drafts)
+    assert s["num_signals"] < len(raw.drafts) / 2
+    kept = {d.timestamp for d in gated.drafts}
+    assert kept <= {d.timestamp for d in raw.drafts}
+
+
+def test_gate_state_survives_checkpoint_resume(tmp_path):
+    bars = generate_bars("SYN", days=5, seed=4)
+    gating = {"on_change": True, "cooldown_bars": 3}
+    full = run_bars(bars, "SYN", "mr", RunMode.SIGNAL, 1e5, PARAMS, gating=gating)
+    ckpt = str(tmp_path / "mr.json")
+    cut = len(bars) // 2
+    first = run_bars(bars[:cut], "SYN", "mr", RunMode.SIGNAL, 1e5, PARAMS, checkpoint=ckpt, gating=gating)
+    rest = run_bars(bars, "SYN", "mr", RunMode.SIGNAL, 1e5, PARAMS, checkpoint=ckpt, gating=gating)
+    assert [d.timestamp for d in first.drafts + rest.drafts] == [d.timestamp for d in full.drafts]
+
+
+def test_daily_and_signal_scans_gate_the_same_filtered_signals(tmp_path):
+    write_csv(generate_bars("SYN", days=20, seed=3), cache_path(str(tmp_path), "SYN.NS", "5m"))
+    cfg = ScanConfig(cache_dir=str(tmp_path), strategies=("mr",), params=PARAMS,
+                     fetch_missing=False, filters={"time_start": time(10, 0)}, gating={"on_change": True})
+    got = {}
+    for mode in (RunMode.SIGNAL, RunMode.BACKTEST):
+        drafts = scan_symbol("SYN.NS", mode, cfg).signals["mr"]
+        got[mode] = [(d.timestamp, d.side) for d in drafts]
+    assert got[RunMode.SIGNAL] and got[RunMode.SIGNAL] == got[RunMode.BACKTEST]
+    assert all(ts.time() >= time(10, 0) for ts, _ in got[RunMode.BACKTEST])
@@ -0,0 +1,60 @@
+import os
+import subprocess
+import sys
+import tracemalloc
+
+import pytest
+
+from core.memory import MB, MemoryBudget, MemoryBudgetExceeded, MemoryTracker, current_bytes
+
+
+@pytest.fixture
+def tracker():
+    was_tracing = tracemalloc.is_tracing()
+    yield MemoryTracker(sample_every=2).start()
+    if not was_tracing:
+        tracemalloc.stop()
+
+
+def test_nested_stages_report_peak_and_retained(tracker):
+    kept = []
+    with tracker.track("scan"):
+        for sym in ("AAA", "BBB"):
+            with tracker.track("load", sym):
+                tmp = bytearray(4 * MB)   # freed: counts towards the peak only
+                kept.append(bytearray(MB))
+                del tmp
+            tracker.symbol_done(sym)
+
+    d = {(r["stage"], r["symbol"]): r for r in tracker.to_dict()["stages"]}
+    load = d[("load", "AAA")]
+    assert load["peak"] >= 5 * MB and MB <= load["retained"] < 2 * MB
+    # The nested stage's peak is carried up to the enclosing one.
+    assert d[("scan", "")]["peak"] >= 5 * MB and d[("scan", "")]["retained"] >= 2 * MB
+
+    merged = MemoryTracker().merge(tracker.to_dict())
+    assert merged.stats == tracker.stats
+    assert "load" in merged.table()
+
+
+def test_budget_projects_growth_per_symbol(monkeypatch):
+    used = iter(range(110 * MB, 200 * MB, 10 * MB))
+    monkeypatch.setattr("core.memory.current_bytes", lambda: next(used))
+    budget = MemoryBudget(150, total=10, warmup=2)  # 110 MB after the first symbol, +10 MB per symbol
+    budget.check("A")
+    with pytest.raises(MemoryBudgetExceeded, match="projected memory 200 MB"):
+        budget.check("B")
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/statm"), reason="needs /proc")
+def test_current_bytes_counts_child_processes():
+    before = current_bytes()
+    child = subprocess.Popen(
+        [sys.executable, "-c", "import sys, time; b = b'x' * (64 << 20); print(1, flush=True); time.sleep(60)"],
+        stdout=subprocess.PIPE)
+    try:
+        child.stdout.readline()  # the child has touched its 64 MB
+        assert current_bytes() - before >= 48 * MB
+    finally:
+        child.kill()
+        child.wait()
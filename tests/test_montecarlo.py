@@ -0,0 +1,29 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from reporting.montecarlo import simulate
+
+
+def test_shuffle_keeps_final_equity_and_bounds_drawdown():
+    pnls = [100.0, -50.0, 30.0, -80.0, 120.0, -10.0]
+    res = simulate(pnls, 1000.0, paths=2_000, method="shuffle", batch=300)
+    assert all(v == pytest.approx(1000.0 + sum(pnls)) for v in res.final_equity.values())
+    # Worst case: all losses first -> 140 below the 1000 peak.
+    assert res.max_drawdown[95] <= 0.14 + 1e-12
+    assert res.steps[0] == 0 and res.steps[-1] == len(pnls)
+    assert res.equity_bands[50][0] == 1000.0
+
+
+def test_ruin_and_methods_deterministic():
+    pnls = np.random.default_rng(3).normal(-5, 50, 200)
+    a = simulate(pnls, 1000.0, paths=5_000, method="block", block=10, seed=1)
+    b = simulate(pnls, 1000.0, paths=5_000, method="block", block=10, seed=1)
+    assert a.final_equity == b.final_equity
+    assert 0.0 < a.ruin[0.5] <= a.ruin[0.2] <= a.ruin[0.1] <= 1.0
+
+    boot = simulate(pnls, 1000.0, paths=5_000, method="bootstrap", scale=0.0)
+    assert boot.ruin[0.05] == 0.0 and boot.max_drawdown[95] == 0.0
+
+    with pytest.raises(ValueError):
+        simulate(pnls, 1000.0, paths=10, method="nope")
@@ -0,0 +1,84 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from benchmarks.synthetic import generate_bars
+from core.engine import Engine
+from core.panel import evaluate, panel_from_bars, rank_cross_section
+from core.types import RunMode
+from strategies import create_strategy
+
+
+def _key(s):
+    return (s.symbol, s.timestamp, s.side, round(s.entry, 6), round(s.stop, 6), round(s.targets[0], 4))
+
+
+def test_panel_matches_per_symbol_engines():
+    bars = {f"SYN{i:03d}": generate_bars(f"SYN{i:03d}", days=3, seed=1) for i in range(4)}
+    params = {"lookback": 10, "threshold": 0.004, "orb_minutes": 15}
+    got = evaluate(panel_from_bars(bars), ["mr", "orb", "vwap"], params)
+
+    for name in ("mr", "orb", "vwap"):
+        want = []
+        for sym, b in bars.items():
+            eng = Engine(create_strategy(name, sym, **params), RunMode.SIGNAL)
+            eng.run(b)
+            want.extend(eng.signals)
+        assert want, name
+        assert sorted(map(_key, got[name])) == sorted(map(_key, want)), name
+        # Same wording, so panel and engine watchlists agree.
+        assert sorted((_key(s), s.reasoning) for s in got[name]) == sorted((_key(s), s.reasoning) for s in want), name
+
+
+def test_latest_only_and_cross_sectional_rank():
+    bars = {f"SYN{i:03d}": generate_bars(f"SYN{i:03d}", days=2, seed=2) for i in range(20)}
+    p = panel_from_bars(bars)
+    latest = evaluate(p, ["mr"], {"lookback": 5, "threshold": 0.001}, latest_only=True)["mr"]
+    assert latest and all(s.timestamp == latest[0].timestamp for s in latest)
+
+    ranked = rank_cross_section(latest)
+    assert [s.meta["xs_rank"] for s in ranked] == list(range(1, len(ranked) + 1))
+    assert ranked[0].confidence >= ranked[-1].confidence
+
+
+def test_latest_only_matches_full_evaluation():
+    bars = {f"SYN{i:03d}": generate_bars(f"SYN{i:03d}", days=4, seed=3) for i in range(10)}
+    p = panel_from_bars(bars)
+    params = {"lookback": 5, "threshold": 0.001}
+    last_ts = max(b[-1].timestamp for b in bars.values())
+    for name in ("mr", "orb", "vwap"):
+        full = [s for s in evaluate(p, [name], params)[name] if s.timestamp == last_ts]
+        latest = evaluate(p, [name], params, latest_only=True)[name]
+        assert sorted(map(_key, latest)) == sorted(map(_key, full))
+        for a, b in zip(sorted(latest, key=_key), sorted(full, key=_key)):
+            assert a.meta == pytest.approx(b.meta)
+
+
+def test_orb_ignores_pre_open_bars():
+    # Uncleaned data (e.g. a CSV in UTC) can carry bars before 09:15.
+    from datetime import timedelta
+    from core.types import MarketBar
+
+    clean = {f"SYN{i:03d}": generate_bars(f"SYN{i:03d}", days=3, seed=4) for i in range(4)}
+    raw = {}
+    for sym, bars in clean.items():
+        out = []
+        for b in bars:
+            if b.slot == 0:
+                for k in (3, 2, 1):
+                    out.append(MarketBar(sym, b.timestamp - timedelta(minutes=5 * k), 1.0, 1e6, 0.01, 1.0, 100))
+            out.append(b)
+        raw[sym] = out
+
+    def engine_keys(data):
+        keys = []
+        for sym, b in data.items():
+            eng = Engine(create_strategy("orb", sym, orb_minutes=15), RunMode.SIGNAL)
+            eng.run(b)
+            keys.extend(map(_key, eng.signals))
+        return sorted(keys)
+
+    want = engine_keys(clean)
+    assert want and engine_keys(raw) == want
+    got = evaluate(panel_from_bars(raw), ["orb"], {"orb_minutes": 15})["orb"]
+    assert sorted(map(_key, got)) == want
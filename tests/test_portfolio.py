@@ -0,0 +1,30 @@
+from benchmarks.synthetic import generate_bars
+from core.engine import Engine
+from core.types import RunMode
+from portfolio.portfolio import Portfolio
+from risk.governor import RiskGovernor
+from strategies import create_strategy
+
+
+def test_roll_day_resets_daily_pnl_only_on_a_new_session():
+    p = Portfolio(1e5)
+    assert p.roll_day(1)
+    p.daily_realized = -500.0
+    assert not p.roll_day(1) and p.daily_realized == -500.0
+    assert p.roll_day(2) and p.daily_realized == 0.0
+    assert p.get_state()["day"] == 2
+
+
+def test_daily_loss_stop_blocks_the_rest_of_the_session_not_the_backtest():
+    # Any loss trips the stop, so each session trades until its first loss.
+    bars = generate_bars("SYN", days=10, seed=4)
+    strat = create_strategy("mr", "SYN", lookback=10, threshold=0.002)
+    eng = Engine(strat, RunMode.BACKTEST, risk=RiskGovernor(max_daily_loss_pct=1e-6))
+    eng.run(bars)
+    first_loss = next(i for i, t in enumerate(eng.trades) if t["pnl_est"] < 0)
+    days = [t["exit_time"].date() for t in eng.trades]
+    assert days[first_loss + 1:] and days[-1] > days[first_loss]
+    # After a losing trade no further trade closes that session.
+    for i, t in enumerate(eng.trades[:-1]):
+        if t["pnl_est"] < 0:
+            assert days[i + 1] > days[i]
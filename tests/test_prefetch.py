@@ -0,0 +1,62 @@
+import threading
+import time
+
+from benchmarks.synthetic import generate_universe, write_csv
+from core.scanner import ScanConfig, scan_universe
+from core.types import RunMode
+from data.cache import cache_path
+from data.prefetch import Prefetcher
+
+
+def test_order_errors_and_bounded_depth():
+    lock = threading.Lock()
+    started, in_flight = [], []
+
+    def load(k):
+        with lock:
+            started.append(k)
+        if k == 3:
+            raise ValueError("bad symbol")
+        return k * 10
+
+    out = []
+    for item in Prefetcher(range(8), load, depth=3, threads=2):
+        in_flight.append(len(started) - len(out))
+        out.append(item)
+    assert [i.key for i in out] == list(range(8))
+    assert [i.value for i in out if i.error is None] == [k * 10 for k in range(8) if k != 3]
+    assert isinstance(out[3].error, ValueError)
+    assert max(in_flight) <= 3
+
+
+def test_io_overlaps_compute():
+    def load(k):
+        time.sleep(0.03)
+        return k
+
+    t0 = time.perf_counter()
+    items = []
+    for item in Prefetcher(range(10), load, depth=2, threads=1):
+        time.sleep(0.03)  # strategy compute
+        items.append(item)
+    elapsed = time.perf_counter() - t0
+    assert elapsed < 0.6 * 10 * 0.06  # ~max(io, compute) rather than their sum
+    assert sum(i.wait for i in items) < 0.5 * sum(i.seconds for i in items)
+
+
+def test_prefetched_scan_matches_sequential(tmp_path):
+    tickers = []
+    for bars in generate_universe(5, 2, seed=1):
+        ticker = f"{bars[0].symbol}.NS"
+        write_csv(bars, cache_path(str(tmp_path), ticker, "5m"))
+        tickers.append(ticker)
+    tickers.append("MISSING.NS")
+    cfg = ScanConfig(cache_dir=str(tmp_path), strategies=("mr", "orb"), fetch_missing=False)
+    plain = list(scan_universe(tickers, RunMode.BACKTEST, cfg))
+    cfg.prefetch = 3
+    piped = list(scan_universe(tickers, RunMode.BACKTEST, cfg))
+    assert [s.ticker for s in piped] == tickers
+    assert [s.results for s in piped] == [s.results for s in plain]
+    assert piped[-1].error == plain[-1].error and "no cached data" in piped[-1].error
+    assert all(s.prefetch_ready is not None for s in piped)
+    assert all(s.prefetch_ready is None and s.load_wait == s.load_seconds for s in plain)
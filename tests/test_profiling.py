@@ -0,0 +1,19 @@
+from datetime import datetime, timedelta
+from core.engine import Engine
+from core.profiling import Profiler
+from core.types import MarketBar, RunMode
+from strategies.mean_reversion import MeanReversionStrategy
+
+
+def test_profiler_counts_and_merges():
+    t0 = datetime.fromisoformat("2026-02-17T09:15:00")
+    bars = [MarketBar("X", t0 + timedelta(minutes=5 * i), 100, 101, 99, 100, 1000) for i in range(30)]
+
+    prof = Profiler()
+    Engine(MeanReversionStrategy("X"), RunMode.BACKTEST, profiler=prof).run(bars)
+    calls = prof.totals("stage")
+    assert calls[("on_bar",)][0] == 30
+    assert calls[("equity_curve",)][0] == 30
+
+    merged = Profiler.from_dict(prof.to_dict()).merge(prof.to_dict())
+    assert merged.totals("stage", "strategy", "symbol")[("on_bar", "mr", "X")][0] == 60
@@ -0,0 +1,90 @@
+from dataclasses import replace
+
+from benchmarks.synthetic import generate_bars, write_csv
+from core.engine import Engine
+from core.types import RunMode
+from data.ingestion import load_csv
+from data.resample import Resampler, resample
+from strategies.base import Strategy
+
+
+def test_resample_is_session_aligned():
+    bars = generate_bars("SYN000", days=2)
+    h1 = resample(bars, "1h")
+    # 09:15, 10:15, ... 15:15 (short last bucket) per session
+    assert [b.timestamp.strftime("%H:%M") for b in h1[:7]] == [
+        "09:15", "10:15", "11:15", "12:15", "13:15", "14:15", "15:15"
+    ]
+    assert len(h1) == 14
+    first = bars[:12]
+    assert h1[0].open == first[0].open and h1[0].close == first[-1].close
+    assert h1[0].high == max(b.high for b in first)
+    assert h1[0].volume == sum(b.volume for b in first)
+    assert h1[6].volume == sum(b.volume for b in bars[72:75])
+
+
+def test_resampler_updates_incrementally():
+    bars = generate_bars("SYN000", days=3)
+    r = Resampler()
+    r.get("SYN000", "15m", bars[:100])
+    assert r.get("SYN000", "15m", bars) == resample(bars, "15m")
+
+
+class _HTF(Strategy):
+    timeframes = ("15m",)
+
+    def generate_signal(self):
+        self.seen = len(self.htf["15m"])
+        return None
+
+
+def test_engine_exposes_higher_timeframes():
+    bars = generate_bars("SYN000", days=1)
+    strat = _HTF("SYN000")
+    Engine(strat, RunMode.SIGNAL).run(bars)
+    assert strat.seen == 25
+
+
+def test_resampler_is_bounded_and_skips_unchanged_files(tmp_path, monkeypatch):
+    r = Resampler(max_entries=2)
+    for sym in ("A", "B", "C"):
+        r.get(sym, "15m", generate_bars(sym, days=1))
+    assert [k[0] for k in r._aggs] == ["B", "C"]
+
+    parsed = []
+
+    def counting_load_csv(path, symbol):
+        parsed.append(path)
+        return load_csv(path, symbol)
+
+    monkeypatch.setattr("data.resample.load_csv", counting_load_csv)
+    path = str(tmp_path / "SYN000_5m.csv")
+    three = generate_bars("SYN000", days=3)
+    write_csv(three[:150], path)
+    assert r.load(path, "SYN000", "15m") == resample(three[:150], "15m")
+    assert r.load(path, "SYN000", "15m") == resample(three[:150], "15m")
+    assert len(parsed) == 1  # unchanged file: served from the memo
+
+    write_csv(three, path)  # a refreshed cache file
+    assert r.load(path, "SYN000", "15m") == resample(three, "15m")
+    assert len(parsed) == 2
+
+
+def test_revised_bars_are_refolded(tmp_path):
+    bars = generate_bars("SYN000", days=2)
+    revised = list(bars)
+    b = revised[-4]
+    revised[-4] = replace(b, high=b.high + 5.0, close=b.close + 1.0)
+    last = revised[-1]
+    revised[-1] = replace(last, close=last.close + 1.0)  # same timestamp, final values
+
+    path = str(tmp_path / "SYN000_5m.csv")
+    r = Resampler()
+    write_csv(bars, path)
+    assert r.load(path, "SYN000", "15m") == resample(bars, "15m")
+    write_csv(revised, path)  # re-fetched: same timestamps, revised values
+    assert r.load(path, "SYN000", "15m") == resample(revised, "15m")
+
+    r = Resampler()
+    r.get("SYN000", "15m", bars)
+    assert r.get("SYN000", "15m", revised) == resample(revised, "15m")
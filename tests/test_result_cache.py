@@ -0,0 +1,55 @@
+from dataclasses import replace
+
+from benchmarks.synthetic import generate_bars, write_csv
+from core.result_cache import ResultCache
+from core.scanner import ScanConfig, scan_symbol
+from core.types import RunMode
+from data.cache import cache_path
+from strategies import available
+
+PARAMS = {"lookback": 20, "threshold": 0.003, "orb_minutes": 15}
+
+
+def _cfg(tmp_path, **kw):
+    kw = {"strategies": tuple(available()), "params": PARAMS, **kw}
+    return ScanConfig(cache_dir=str(tmp_path / "cache"), fetch_missing=False,
+                      result_cache=str(tmp_path / "results"), **kw)
+
+
+def test_unchanged_symbols_are_served_from_cache(tmp_path):
+    (tmp_path / "cache").mkdir()
+    bars = generate_bars("SYN", days=3)
+    write_csv(bars, cache_path(str(tmp_path / "cache"), "SYN.NS", "5m"))
+    n = len(available())
+
+    for mode in (RunMode.BACKTEST, RunMode.SIGNAL):
+        cold = scan_symbol("SYN.NS", mode, _cfg(tmp_path))
+        warm = scan_symbol("SYN.NS", mode, _cfg(tmp_path))
+        assert (cold.cache_hits, cold.cache_misses) == (0, n)
+        assert (warm.cache_hits, warm.cache_misses) == (n, 0)
+        assert warm.results == cold.results
+        assert {k: [d.materialize() for d in v] for k, v in warm.signals.items()} == \
+               {k: [d.materialize() for d in v] for k, v in cold.signals.items()}
+
+    # Changed params touch only the strategy that uses them.
+    other = _cfg(tmp_path, strategies=("mr", "orb"), params=dict(PARAMS, lookback=10))
+    scan = scan_symbol("SYN.NS", RunMode.BACKTEST, other)
+    assert (scan.cache_hits, scan.cache_misses) == (1, 1)
+
+    # A corrected bar changes the data hash.
+    bars[10] = replace(bars[10], close=bars[10].close + 0.5)
+    write_csv(bars, cache_path(str(tmp_path / "cache"), "SYN.NS", "5m"))
+    assert scan_symbol("SYN.NS", RunMode.BACKTEST, _cfg(tmp_path)).cache_hits == 0
+
+
+def test_size_bounded_lru_eviction(tmp_path):
+    rc = ResultCache(str(tmp_path), max_bytes=5000)
+    blob = b"x" * 1000
+    for i in range(4):
+        rc.put(f"{i:02d}key", blob)
+    assert rc.get("00key") == blob  # refreshes 00, so 01 is now the oldest
+    rc.put("04key", blob)
+    rc.put("05key", blob)
+    assert rc.get("01key") is None and rc.get("00key") == blob
+    assert (rc.hits, rc.misses) == (2, 1)
+    assert sum(p.stat().st_size for p in tmp_path.glob("*/*.pkl")) <= 5000
@@ -0,0 +1,40 @@
+from benchmarks.synthetic import generate_bars
+from core.scanner import run_bars
+from core.types import RunMode
+from reporting.runstore import RunStore
+
+PARAMS = {"lookback": 20, "threshold": 0.003, "orb_minutes": 15}
+
+
+def _record(store, params, symbols=("SYN001", "SYN002")):
+    run_id = store.start_run("backtest", "test", params, 1e5)
+    for sym in symbols:
+        bars = generate_bars(sym, days=3)
+        for name in ("mr", "orb"):
+            eng = run_bars(bars, sym, name, RunMode.BACKTEST, 1e5, params)
+            store.add_result(run_id, sym, name, eng.summary())
+    store.finish_run(run_id)
+    return run_id
+
+
+def test_runs_are_stored_and_compared(tmp_path):
+    store = RunStore(str(tmp_path / "runs.sqlite"))
+    a = _record(store, PARAMS)
+    b = _record(store, dict(PARAMS, threshold=0.002), symbols=("SYN001",))
+
+    (run_b, _, _, _, pnl_b, trades_b, _), (run_a, _, _, _, pnl_a, trades_a, _) = store.runs()
+    assert (run_b, run_a) == (b, a) and trades_a > trades_b > 0
+
+    by_strategy = store.pnl_by_strategy(last=1)
+    assert {r[2] for r in by_strategy} == {"mr", "orb"} and all(r[0] == b for r in by_strategy)
+    assert abs(sum(r[3] for r in by_strategy) - pnl_b) < 1e-6
+
+    drift = store.symbol_drift(b, a)
+    assert {(r[0], r[1]) for r in drift} == {(s, n) for s in ("SYN001", "SYN002") for n in ("mr", "orb")}
+    assert all(abs(r[4] - (r[3] - r[2])) < 1e-9 for r in drift)
+    assert store.param_deltas(b, a) == {"threshold": (0.003, 0.002)}
+
+    n_trades, strategies = store.db.execute(
+        "SELECT COUNT(*), COUNT(DISTINCT strategy) FROM trades WHERE run_id = ?", (a,)).fetchone()
+    assert (n_trades, strategies) == (trades_a, 2)
+    assert store.db.execute("SELECT COUNT(*) FROM equity WHERE run_id = ?", (a,)).fetchone()[0] == 2 * 2 * 3
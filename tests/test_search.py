@@ -0,0 +1,45 @@
+import pytest
+
+from benchmarks.synthetic import generate_universe, write_csv
+from data.cache import cache_path
+from research.search import DEFAULT_GRIDS, BarSource, Search, expand_grid, parse_grid, schedule
+
+
+def _universe(tmp_path, n=9, days=9):
+    tickers = []
+    for bars in generate_universe(n, days, seed=5):
+        ticker = f"{bars[0].symbol}.NS"
+        write_csv(bars, cache_path(str(tmp_path), ticker, "5m"))
+        tickers.append(ticker)
+    return tickers, BarSource(str(tmp_path), "5m", None, None, None)
+
+
+def test_schedule_grows_to_the_full_universe():
+    rungs = schedule(16, 100, 60, eta=3)
+    assert len(rungs) == 3 and rungs[-1] == (100, 60)
+    assert [s * d for s, d in rungs] == sorted(s * d for s, d in rungs)
+    assert rungs[0][0] * rungs[0][1] < 100 * 60 / 6
+    assert schedule(1, 5, 5) == [(5, 5)]
+
+
+def test_grid_parsing():
+    assert parse_grid(["lookback=10,20", "threshold=0.01"], "mr") == {"lookback": [10, 20], "threshold": [0.01]}
+    assert len(expand_grid(DEFAULT_GRIDS["vwap"])) == 16
+    with pytest.raises(ValueError, match="lookback"):
+        parse_grid(["orb_minutes=5"], "mr")
+
+
+def test_search_matches_exhaustive_at_a_fraction_of_the_compute(tmp_path):
+    tickers, load = _universe(tmp_path)
+    configs = expand_grid({"lookback": [5, 10, 20], "threshold": [0.002, 0.004, 0.008]})
+    search = Search(tickers, "mr", configs, load, eta=3, seed=1, target_exits=True)
+    res = search.run(exhaustive=True)
+
+    ex = res["exhaustive"]
+    assert [r["configs"] for r in res["rungs"]] == [9, 3, 1]
+    assert res["symbol_days"] < res["exhaustive_symbol_days"] / 2
+    assert res["best_pnl"] == ex["best_pnl"] - ex["regret"]
+    assert ex["pick_rank"] <= 3
+    # The exhaustive pass reuses every full-universe backtest the search already ran.
+    assert search.backtests == len(configs) * len(tickers) + (res["backtests"] - len(tickers))
+    assert Search(tickers, "mr", configs, load, eta=3, seed=1, target_exits=True).run()["best"] == res["best"]
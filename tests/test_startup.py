@@ -0,0 +1,7 @@
+from benchmarks.startup import STARTUP_BUDGET_MS, best_of, heavy_imports
+
+
+def test_cli_startup_within_budget():
+    res = best_of("main", repeat=3)
+    assert heavy_imports(res) == []
+    assert res["total_us"] / 1000.0 < STARTUP_BUDGET_MS
@@ -0,0 +1,46 @@
+from datetime import date
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from benchmarks.synthetic import generate_bars
+from core.scanner import ScanConfig, load_symbol
+from data.ingestion import clip_range
+from data.store import load_range, partitions, write_bars
+
+
+def _history():
+    # A few sessions at the start of each month of 2025.
+    bars = []
+    for m in range(1, 13):
+        bars += generate_bars("SYN000", days=3, start=date(2025, m, 1))
+    return bars
+
+
+def test_range_load_opens_only_overlapping_months(tmp_path):
+    bars = _history()
+    assert write_bars(str(tmp_path), "SYN000.NS", "5m", bars) == 12
+
+    parts = partitions(str(tmp_path), "SYN000.NS", "5m", date(2025, 6, 1), date(2025, 6, 7))
+    assert [p.rsplit("/", 1)[-1] for p in parts] == ["2025-06.npz"]
+
+    got = load_range(str(tmp_path), "SYN000.NS", "SYN000", "5m", date(2025, 6, 1), date(2025, 6, 7))
+    want = clip_range(bars, date(2025, 6, 1), date(2025, 6, 7))
+    assert got == want and len(got) == 3 * 75
+    assert load_range(str(tmp_path), "SYN000.NS", "SYN000") == bars
+
+
+def test_write_merges_and_newer_rows_win(tmp_path):
+    bars = _history()[:150]
+    write_bars(str(tmp_path), "SYN000.NS", "5m", bars[:100])
+    fixed = [b.__class__(b.symbol, b.timestamp, b.open, b.high, b.low, b.close, 1.0) for b in bars[90:]]
+    write_bars(str(tmp_path), "SYN000.NS", "5m", fixed)
+
+    got = load_range(str(tmp_path), "SYN000.NS", "SYN000")
+    assert len(got) == 150
+    assert got[:90] == bars[:90] and all(b.volume == 1.0 for b in got[90:])
+
+    cfg = ScanConfig(store_dir=str(tmp_path), start=got[80].timestamp.date(), end=got[80].timestamp.date())
+    day = load_symbol("SYN000.NS", cfg)
+    assert all(b.timestamp.date() == got[80].timestamp.date() for b in day)
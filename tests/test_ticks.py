@@ -0,0 +1,62 @@
+from datetime import datetime
+
+from benchmarks.synthetic import bar_ticks, generate_bars, generate_ticks
+from benchmarks.ticks import replay
+from core.engine import Engine
+from core.types import RunMode
+from data.ticks import TickAggregator
+from strategies import create_strategy
+
+
+def test_ticks_rebuild_bars_and_feed_engine():
+    bars = generate_bars("SYN000", days=2)
+    out = []
+    eng = Engine(create_strategy("vwap", "SYN000"), RunMode.SIGNAL)
+    agg = TickAggregator("5m", on_bar=lambda b: (out.append(b), eng.step(b)))
+    for b in bars:
+        for t in bar_ticks(b):
+            agg.on_tick(*t)
+    agg.flush()
+
+    assert out == bars
+    assert [b.slot for b in out] == [b.slot for b in bars]
+    ref = Engine(create_strategy("vwap", "SYN000"), RunMode.SIGNAL)
+    ref.run(bars)
+    assert eng.signals == ref.signals
+
+
+def test_advance_partial_and_dropped_ticks():
+    agg = TickAggregator("15m")
+    agg.on_tick("A", datetime(2026, 1, 5, 9, 0), 10.0, 1)    # pre-open
+    agg.on_tick("A", datetime(2026, 1, 5, 9, 16), 10.0, 5)
+    agg.on_tick("A", datetime(2026, 1, 5, 9, 29), 11.0, 5)
+    agg.on_tick("B", datetime(2026, 1, 5, 9, 20), 50.0, 1)
+    assert agg.partial("A").high == 11.0 and agg.partial("A").volume == 10
+    assert agg.dropped == 1
+
+    assert agg.advance(datetime(2026, 1, 5, 9, 29, 59)) == []
+    closed = agg.advance(datetime(2026, 1, 5, 9, 30))
+    assert [(b.symbol, b.timestamp.strftime("%H:%M"), b.close) for b in closed] == [
+        ("A", "09:15", 11.0), ("B", "09:15", 50.0)
+    ]
+
+    agg.on_tick("A", datetime(2026, 1, 5, 9, 45), 12.0, 1)
+    agg.on_tick("A", datetime(2026, 1, 5, 9, 40), 12.0, 1)  # older bucket
+    assert agg.late == 1
+
+
+def test_replay_counts():
+    ticks = list(generate_ticks(3, 1, per_bar=8))
+    res = replay(ticks, strategies=["mr"])
+    assert res["ticks"] == 3 * 75 * 8 and res["bars"] == 3 * 75
+
+
+def test_tick_after_advance_closed_its_bucket_is_late():
+    bars = []
+    agg = TickAggregator("5m", on_bar=bars.append)
+    agg.on_tick("A", datetime(2026, 1, 5, 9, 16), 10.0, 1)
+    agg.advance(datetime(2026, 1, 5, 9, 20))
+    agg.on_tick("A", datetime(2026, 1, 5, 9, 19, 59), 11.0, 1)
+    agg.flush()
+    assert [(b.timestamp.strftime("%H:%M"), b.close) for b in bars] == [("09:15", 10.0)]
+    assert agg.late == 1 and agg.ticks == 1
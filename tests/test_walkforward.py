@@ -0,0 +1,61 @@
+from benchmarks.synthetic import generate_bars, generate_universe, write_csv
+from core.scanner import run_bars
+from core.types import RunMode
+from data.cache import cache_path
+from research.search import BarSource, expand_grid, load_bars
+from research.walkforward import WalkForward, windows
+from risk.governor import RiskGovernor
+
+
+def test_windows_tile_the_test_span():
+    rolling = windows(30, 10, 8)
+    assert rolling == [(0, 10, 10, 18), (8, 18, 18, 26), (16, 26, 26, 30)]
+    assert [w[0] for w in windows(30, 10, 8, anchored=True)] == [0, 0, 0]
+    assert windows(10, 10, 5) == []
+
+
+def test_walkforward_stitches_out_of_sample_pnl(tmp_path):
+    tickers = []
+    for bars in generate_universe(4, 12, seed=8):
+        ticker = f"{bars[0].symbol}.NS"
+        write_csv(bars, cache_path(str(tmp_path), ticker, "5m"))
+        tickers.append(ticker)
+    source = BarSource(str(tmp_path), "5m", None, None, None)
+    configs = expand_grid({"lookback": [5, 20], "threshold": [0.002, 0.006]})
+    wf = WalkForward(tickers, "mr", configs, source, train_days=5, test_days=3).load()
+    res = wf.run()
+
+    assert len(wf.days) == 12 and len(res["windows"]) == 3
+    assert abs(res["oos_pnl"] - sum(w["test_pnl"] for w in res["windows"])) < 1e-6
+    assert [d for d, _ in res["oos_equity"]] == wf.days[5:]
+    assert res["in_sample"]["pnl"] >= res["oos_pnl"] - 1e-9
+    for w in res["windows"]:
+        assert w["train_pnl"] == max(
+            wf.pnl(c, wf.days.index(w["train"][0]), wf.days.index(w["train"][1]) + 1) for c in range(len(configs)))
+
+    # Per-session buckets add back up to each config's full-history backtests.
+    for c, params in enumerate(configs):
+        total = sum(run_bars(load_bars(t, source), t[:-3], "mr", RunMode.BACKTEST, 1e5, params,
+                             risk=RiskGovernor(fixed_capital=1e5)).portfolio.realized_pnl for t in tickers)
+        assert abs(wf.pnl(c, 0, len(wf.days)) - total) < 1e-6
+
+
+def _session_pnl(bars, strategy, params):
+    eng = run_bars(bars, "SYN", strategy, RunMode.BACKTEST, 1e5, params, risk=RiskGovernor(fixed_capital=1e5))
+    by_day = {}
+    for t in eng.trades:
+        by_day[t["exit_time"].date()] = by_day.get(t["exit_time"].date(), 0.0) + t["pnl_est"]
+    return by_day
+
+
+def test_session_pnl_does_not_depend_on_where_the_run_starts():
+    bars = generate_bars("SYN", days=40, seed=2)
+    days = sorted({b.timestamp.date() for b in bars})
+    for strategy, params, warmup in (("orb", {"orb_minutes": 15}, 0), ("mr", {"lookback": 10, "threshold": 0.002}, 1)):
+        full = _session_pnl(bars, strategy, params)
+        # Trading continues after early losing sessions (the daily stop resets).
+        assert max(full) >= days[-3]
+        for k in (5, 17, 30):
+            late = _session_pnl([b for b in bars if b.timestamp.date() >= days[k]], strategy, params)
+            check = days[k + warmup:]
+            assert {d: round(full.get(d, 0.0), 6) for d in check} == {d: round(late.get(d, 0.0), 6) for d in check}
@@ -0,0 +1,58 @@
+import random
+from datetime import datetime, time
+
+from benchmarks.synthetic import generate_bars
+from core.engine import Engine
+from core.types import RunMode, Side, Signal
+from reporting.watchlist import WatchlistBuilder, compile_filter, rank_key
+from strategies import create_strategy
+
+
+def _sig(i, rng):
+    return Signal(
+        symbol=f"S{i % 7}", timestamp=datetime(2026, 1, 5, 9, 15 + i % 40), side=Side.BUY,
+        entry=100.0, stop=99.0, targets=[101.0], confidence=round(rng.random(), 1),
+        reasoning=f"r{i}", meta={"avg_volume": float(rng.randint(0, 3)), "atr": rng.random()},
+    )
+
+
+def test_top_k_matches_full_sort_with_filters():
+    rng = random.Random(0)
+    stream = [("mr" if i % 3 else "vwap", _sig(i, rng)) for i in range(500)]
+    keep = compile_filter(min_avg_volume=1, time_start=time(9, 20))
+
+    wl = WatchlistBuilder(k=25, keep=keep)
+    for strat, s in stream:
+        wl.add(strat, s)
+
+    kept = [(strat, s) for strat, s in stream if keep(s)]
+    expected = sorted(kept, key=lambda x: rank_key(x[1]))[:25]  # stable: ties keep arrival order
+    assert [s.reasoning for s in wl.result()] == [f"[{st.upper()}] {s.reasoning}" for st, s in expected]
+    assert wl.seen == 500 and wl.kept == len(kept)
+    assert all(len(h) <= 25 for h in wl._heaps.values())
+
+
+def test_per_strategy_cap():
+    rng = random.Random(1)
+    wl = WatchlistBuilder(per_strategy_k=3)
+    for i in range(100):
+        wl.add("mr" if i % 2 else "orb", _sig(i, rng))
+    by = wl.by_strategy()
+    assert {k: len(v) for k, v in by.items()} == {"mr": 3, "orb": 3}
+    assert len(wl.result()) == 6
+    assert compile_filter()(_sig(0, rng))
+
+
+def test_engine_draft_cap_keeps_the_same_top_k():
+    bars = {f"SYN{i:03d}": generate_bars(f"SYN{i:03d}", days=3, seed=i) for i in range(5)}
+    results = []
+    for cap in (0, 4):
+        wl = WatchlistBuilder(k=4)
+        for sym, b in bars.items():
+            eng = Engine(create_strategy("mr", sym, lookback=5, threshold=0.001), RunMode.SIGNAL, max_drafts=cap)
+            eng.run(b)
+            assert eng.summary()["num_signals"] > 2 * 4
+            assert not cap or len(eng.drafts) <= cap
+            wl.extend("mr", eng.drafts)
+        results.append([(s.symbol, s.timestamp) for s in wl.result()])
+    assert results[0] == results[1]